@@ -1,9 +1,16 @@
 # api_client.py
+import asyncio
+import threading
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 import twitter_config as config
+from http_session import get_http_client
+from response_cache import get_api_response_cache, make_cache_key
+from rate_limiter import QuotaExhaustedError, get_rate_limiter
+from traffic_cassette import get_active_cassette
 
 # Helper function for safe nested access
 def get_nested_value(data, path_string):
@@ -36,101 +43,112 @@ def get_nested_value(data, path_string):
     return current_val
 
 
-def execute_api_step(step_plan, previous_results, rapidapi_key):
-    """Executes a single API call step, handling pagination and basic errors."""
-    endpoint_suffix = step_plan.get('endpoint')
-    params = step_plan.get('params', {})
-    max_pages = step_plan.get('max_pages', config.DEFAULT_MAX_PAGES_FALLBACK) # Default to 1 page if not specified by LLM
-    reason = step_plan.get('reason', 'No reason provided') # For logging
-
-    print(f"\nExecuting Step: Call {endpoint_suffix} (Reason: {reason})")
+def has_step_dependencies(step_plan):
+    """True if any param references output of an earlier step ($stepN... or source_step)."""
+    for value in step_plan.get('params', {}).values():
+        if isinstance(value, dict) and 'source_step' in value:
+            return True
+        if isinstance(value, str) and value.startswith("$step"):
+            return True
+    return False
 
-    if not endpoint_suffix:
-        return {"error": "Missing endpoint in plan step.", "endpoint": endpoint_suffix}
 
-    # --- Resolve Parameter Dependencies ---
+def _resolve_step_params(params, previous_results):
+    """Resolves $stepN.path and source_step list dependencies. Raises ValueError on failure."""
     resolved_params = {}
-    try:
-        for key, value in params.items():
-            param_error = None # Store potential errors for clarity
-            resolved_value = None
-
-            # --- NEW: Handle Dictionary-based List Dependency ---
-            if isinstance(value, dict) and 'source_step' in value:
-                print(f"  Resolving list dependency for param '{key}'...")
-                source_step_idx = value.get('source_step') - 1
-                source_list_path = value.get('source_list_path')
-                extract_field = value.get('extract_field')
-                join_with = value.get('join_with') # Optional
-
-                if source_step_idx < 0 or source_step_idx >= len(previous_results):
-                    param_error = f"Invalid source_step {value.get('source_step')}"
-                elif not source_list_path or not extract_field:
-                    param_error = "Missing source_list_path or extract_field"
+    for key, value in params.items():
+        param_error = None # Store potential errors for clarity
+        resolved_value = None
+
+        # --- NEW: Handle Dictionary-based List Dependency ---
+        if isinstance(value, dict) and 'source_step' in value:
+            print(f"  Resolving list dependency for param '{key}'...")
+            source_step_idx = value.get('source_step') - 1
+            source_list_path = value.get('source_list_path')
+            extract_field = value.get('extract_field')
+            join_with = value.get('join_with') # Optional
+
+            if source_step_idx < 0 or source_step_idx >= len(previous_results):
+                param_error = f"Invalid source_step {value.get('source_step')}"
+            elif not source_list_path or not extract_field:
+                param_error = "Missing source_list_path or extract_field"
+            else:
+                source_data = previous_results[source_step_idx].get('data')
+                if not source_data:
+                    param_error = f"No data found from step {value.get('source_step')}"
                 else:
-                    source_data = previous_results[source_step_idx].get('data')
-                    if not source_data:
-                        param_error = f"No data found from step {value.get('source_step')}"
+                    # Get the source list
+                    source_list = get_nested_value(source_data, source_list_path)
+                    if not isinstance(source_list, list):
+                         param_error = f"Source path '{source_list_path}' did not resolve to a list in step {value.get('source_step')}"
                     else:
-                        # Get the source list
-                        source_list = get_nested_value(source_data, source_list_path)
-                        if not isinstance(source_list, list):
-                             param_error = f"Source path '{source_list_path}' did not resolve to a list in step {value.get('source_step')}"
-                        else:
-                            # Extract values from each item
-                            extracted_values = []
-                            for item in source_list:
-                                extracted = get_nested_value(item, extract_field)
-                                if extracted is not None: # Only add if value was found
-                                     extracted_values.append(str(extracted)) # Convert to string for joining
-                                else:
-                                     print(f"    Warning: Field '{extract_field}' not found in one item of list '{source_list_path}'.")
-
-                            if not extracted_values:
-                                 print(f"    Warning: No values extracted for field '{extract_field}' from list '{source_list_path}'.")
-                                 # Decide how to handle: error, empty string, skip param? Let's use empty string for now.
-                                 resolved_value = ""
-                            elif join_with is not None:
-                                resolved_value = join_with.join(extracted_values)
+                        # Extract values from each item
+                        extracted_values = []
+                        for item in source_list:
+                            extracted = get_nested_value(item, extract_field)
+                            if extracted is not None: # Only add if value was found
+                                 extracted_values.append(str(extracted)) # Convert to string for joining
                             else:
-                                resolved_value = extracted_values # Return as list if no join specified
+                                 print(f"    Warning: Field '{extract_field}' not found in one item of list '{source_list_path}'.")
+
+                        if not extracted_values:
+                             print(f"    Warning: No values extracted for field '{extract_field}' from list '{source_list_path}'.")
+                             # Decide how to handle: error, empty string, skip param? Let's use empty string for now.
+                             resolved_value = ""
+                        elif join_with is not None:
+                            resolved_value = join_with.join(extracted_values)
+                        else:
+                            resolved_value = extracted_values # Return as list if no join specified
 
-            # --- Handle Simple String Dependency ---
-            elif isinstance(value, str) and value.startswith("$step"):
-                print(f"  Resolving simple dependency for param '{key}'...")
-                parts = value[1:].split('.')
-                step_index = int(parts[0].replace("step", "")) - 1 # 0-based index
-                keys_to_access = '.'.join(parts[1:]) # Re-join keys for nested access helper
+        # --- Handle Simple String Dependency ---
+        elif isinstance(value, str) and value.startswith("$step"):
+            print(f"  Resolving simple dependency for param '{key}'...")
+            parts = value[1:].split('.')
+            step_index = int(parts[0].replace("step", "")) - 1 # 0-based index
+            keys_to_access = '.'.join(parts[1:]) # Re-join keys for nested access helper
 
-                if step_index < 0 or step_index >= len(previous_results):
-                    param_error = f"Invalid step index {step_index+1} referenced in '{value}'"
+            if step_index < 0 or step_index >= len(previous_results):
+                param_error = f"Invalid step index {step_index+1} referenced in '{value}'"
+            else:
+                target_data = previous_results[step_index].get('data')
+                if not target_data:
+                    param_error = f"No data found from step {step_index+1} to resolve '{value}'"
                 else:
-                    target_data = previous_results[step_index].get('data')
-                    if not target_data:
-                        param_error = f"No data found from step {step_index+1} to resolve '{value}'"
-                    else:
-                        resolved_value = get_nested_value(target_data, keys_to_access)
-                        if resolved_value is None:
-                             param_error = f"Path '{keys_to_access}' not found in data from step {step_index+1} for '{value}'"
+                    resolved_value = get_nested_value(target_data, keys_to_access)
+                    if resolved_value is None:
+                         param_error = f"Path '{keys_to_access}' not found in data from step {step_index+1} for '{value}'"
 
-            # --- No Dependency ---
-            else:
-                resolved_value = value
+        # --- No Dependency ---
+        else:
+            resolved_value = value
 
-            # --- Assign or Raise Error ---
-            if param_error:
-                print(f"    Error resolving parameter '{key}': {param_error}")
-                raise ValueError(param_error) # Raise error to stop execution
-            else:
-                resolved_params[key] = resolved_value
-                if value != resolved_value: # Only print if resolution happened
-                     print(f"    Resolved param '{key}': '{value}' -> '{resolved_value}'")
+        # --- Assign or Raise Error ---
+        if param_error:
+            print(f"    Error resolving parameter '{key}': {param_error}")
+            raise ValueError(param_error) # Raise error to stop execution
+        else:
+            resolved_params[key] = resolved_value
+            if value != resolved_value: # Only print if resolution happened
+                 print(f"    Resolved param '{key}': '{value}' -> '{resolved_value}'")
+    return resolved_params
 
+
+def _prepare_step(step_plan, previous_results, rapidapi_key):
+    """Validates the plan and resolves params. Returns (request_info, None) or (None, error_result)."""
+    endpoint_suffix = step_plan.get('endpoint')
+    params = step_plan.get('params', {})
+    reason = step_plan.get('reason', 'No reason provided') # For logging
+
+    print(f"\nExecuting Step: Call {endpoint_suffix} (Reason: {reason})")
+
+    if not endpoint_suffix:
+        return None, {"error": "Missing endpoint in plan step.", "endpoint": endpoint_suffix}
+
+    try:
+        resolved_params = _resolve_step_params(params, previous_results)
     except ValueError as e: # Catch resolution errors
          print(f"  Error resolving parameters: {e}")
-         return {"error": f"Failed to resolve parameter: {e}", "endpoint": endpoint_suffix, "params": params}
-    # --- End Parameter Resolution ---
-
+         return None, {"error": f"Failed to resolve parameter: {e}", "endpoint": endpoint_suffix, "params": params}
 
     headers = {
         "X-RapidAPI-Key": rapidapi_key,
@@ -141,129 +159,176 @@ def execute_api_step(step_plan, previous_results, rapidapi_key):
     print(f"  Requesting URL: {full_url}")
     print(f"  With Params: {resolved_params}")
 
-    # ... (Rest of the function remains the same: pagination, error handling, data extraction) ...
-    all_results = []
-    current_page = 0
-    next_cursor = None
-    retry_count = 0
-    max_retries = 3 # For transient server errors and network timeouts
-    page_data = None # Keep track of last page data for structure merging
-    data_key_found = None # Keep track of key where list data was found
+    return {
+        'endpoint': endpoint_suffix,
+        'full_url': full_url,
+        'headers': headers,
+        'resolved_params': resolved_params,
+        'max_pages': step_plan.get('max_pages', config.DEFAULT_MAX_PAGES_FALLBACK) # Default to 1 page if not specified by LLM
+    }, None
 
-    while current_page < max_pages:
-        current_params = resolved_params.copy()
-        if next_cursor:
-            current_params['cursor'] = next_cursor
-            print(f"  Fetching page {current_page + 1} with cursor {str(next_cursor)[:10]}...")
-        else:
-             print(f"  Fetching page {current_page + 1}...")
 
-        try:
-            response = requests.get(full_url, headers=headers, params=current_params, timeout=config.API_TIMEOUT_SECONDS)
-            response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
-
-            page_data = response.json() # Store last page data
-            # --- Data Extraction Logic (Improved slightly) ---
-            extracted_list_data = None
-            data_key_found = None # Reset for each page? No, keep from first successful extraction
-
-            if isinstance(page_data, list): # If the response *is* the list
-                extracted_list_data = page_data
-                print(f"  Response is a list.")
-            elif isinstance(page_data, dict):
-                if data_key_found and data_key_found in page_data and isinstance(page_data[data_key_found], list):
-                     extracted_list_data = page_data[data_key_found] # Use previously found key if still valid
-                else:
-                    list_keys_to_try = ['timeline', 'followers', 'following', 'users', 'trends', 'retweets', 'affilates', 'members', 'sharings', 'results', 'data'] # Added common keys
-                    for key in list_keys_to_try:
-                        if key in page_data and isinstance(page_data[key], list):
-                            extracted_list_data = page_data[key]
-                            data_key_found = key # Store the key where list was found
-                            print(f"  Extracted list data from key: '{data_key_found}'")
-                            break
-
-                # If no list found, but it's a dict, maybe the dict *is* the result (e.g., single tweet)
-                # Only treat as single item if it's the first page and no list key was ever found
-                if extracted_list_data is None and current_page == 0 and not data_key_found:
-                    extracted_list_data = [page_data] # Wrap single item in list for consistency
-                    print(f"  Treating full dictionary response as single item list.")
-                elif extracted_list_data is None:
-                     # If not first page, or a key was expected but missing, maybe just skip? Or log warning.
-                     print(f"  Warning: Expected list data (key: {data_key_found}) not found on page {current_page+1}.")
-
-
-            else: # Unexpected format
-                 print(f"  Warning: Unexpected response root type: {type(page_data)}")
-                 # Only treat as single item if first page
-                 if current_page == 0:
-                      extracted_list_data = [page_data]
-                 else:
-                      print(f"  Ignoring unexpected data format on page {current_page+1}.")
-
-
-            if extracted_list_data: # Check if we got any data items
-                all_results.extend(extracted_list_data)
-            # --- End Data Extraction ---
-
-            current_page += 1
-
-            # --- Cursor Handling ---
-            next_cursor = None
-            if isinstance(page_data, dict):
-                 # Prioritize 'next_cursor', common in pagination
-                 if 'next_cursor' in page_data and page_data['next_cursor']:
-                      next_cursor = page_data['next_cursor']
-                 # Fallback to 'cursor' if 'next_cursor' isn't present or empty
-                 elif 'cursor' in page_data and page_data['cursor'] and isinstance(page_data.get('cursor'), str):
-                      next_cursor = page_data['cursor']
-
-            if not next_cursor or current_page >= max_pages:
-                print(f"  Finished fetching for {endpoint_suffix}. Total pages: {current_page}. Has next cursor: {bool(next_cursor)}")
-                break # Exit pagination loop
-
-            # Reset retry count on success
-            retry_count = 0
-            time.sleep(0.5) # Small delay between pages
+def _page_cache_key(endpoint_suffix, params):
+    """Content address for one page: normalized endpoint + request params (incl. cursor)."""
+    normalized_params = {str(k): v if isinstance(v, list) else str(v) for k, v in params.items()}
+    return make_cache_key('rapidapi', endpoint_suffix.strip('/'), normalized_params)
 
-        # ... (Keep the existing except blocks for HTTPError, RequestException, JSONDecodeError) ...
-        except requests.exceptions.HTTPError as e:
-            status_code = e.response.status_code
-            print(f"  HTTP Error {status_code}: {e.response.text}")
-            if status_code == 429: # Rate Limit
-                wait_time = (2 ** retry_count) # Exponential backoff
-                print(f"  Rate limit hit. Waiting {wait_time} seconds...")
-                time.sleep(wait_time)
-                retry_count += 1
-                if retry_count > 4: # Give up after ~15s total wait
-                     return {"error": f"Rate limit exceeded after multiple retries.", "endpoint": endpoint_suffix, "status_code": status_code}
-                continue # Retry the current page request without incrementing page count
-            elif status_code >= 500 and retry_count < max_retries: # Server error, retry
-                 print(f"  Server error ({status_code}). Retrying ({retry_count+1}/{max_retries})...")
-                 time.sleep(1 * (retry_count + 1))
-                 retry_count += 1
-                 continue # Retry current page
-            else: # 4xx errors or persistent 5xx
-                return {"error": f"HTTP Error {status_code}: {e.response.text}", "endpoint": endpoint_suffix, "status_code": status_code}
-
-        except requests.exceptions.RequestException as e:
-            print(f"  Request failed: {e}")
-            # Retry transient network errors (timeout, connection errors)
-            if retry_count < max_retries:
-                wait_time = (2 ** retry_count) + 1  # Exponential backoff: 2s, 4s, 8s, 16s
-                print(f"  Network error. Retrying in {wait_time}s ({retry_count+1}/{max_retries})...")
-                time.sleep(wait_time)
-                retry_count += 1
-                continue  # Retry the current page request
-            else:
-                return {"error": f"Request failed after {max_retries} retries: {e}", "endpoint": endpoint_suffix}
-        except json.JSONDecodeError as e:
-             print(f"  Failed to decode JSON response: {e}")
-             # Add response text to error if possible
-             response_text_for_error = ""
-             if 'response' in locals() and hasattr(response, 'text'):
-                  response_text_for_error = response.text[:500] # Limit length
-             return {"error": f"Invalid JSON response from API: {e}. Response text: {response_text_for_error}", "endpoint": endpoint_suffix}
 
+def _page_cache_ttl(endpoint_suffix, params):
+    """Per-endpoint TTL; 'Latest' searches get their own (short) entry."""
+    endpoint = endpoint_suffix.strip('/')
+    ttls = config.API_CACHE_TTL_SECONDS
+    if endpoint == 'search.php' and params.get('search_type') == 'Latest':
+        return ttls.get('search.php:Latest', config.API_CACHE_DEFAULT_TTL_SECONDS)
+    return ttls.get(endpoint, config.API_CACHE_DEFAULT_TTL_SECONDS)
+
+
+def _api_cache_enabled():
+    # A record/replay cassette must see every page, so the cache stays out of its way
+    return config.API_CACHE_ENABLED and get_active_cassette() is None
+
+
+def _cached_page(cache_key):
+    """Returns cached page data or None. Cache failures never break the API call."""
+    if not _api_cache_enabled():
+        return None
+    try:
+        return get_api_response_cache().get(cache_key)
+    except Exception as e:
+        print(f"  Warning: response cache lookup failed: {e}")
+        return None
+
+
+def _store_page(cache_key, page_data, endpoint_suffix, params):
+    if not _api_cache_enabled() or page_data is None:
+        return
+    try:
+        get_api_response_cache().set(cache_key, page_data, ttl=_page_cache_ttl(endpoint_suffix, params))
+    except Exception as e:
+        print(f"  Warning: response cache write failed: {e}")
+
+
+def _acquire_rate_limit():
+    """Queue on the shared token bucket before a billed request."""
+    if config.RATE_LIMITER_ENABLED:
+        waited = get_rate_limiter().acquire()
+        if waited > 0.05:
+            print(f"  Rate limiter: waited {waited:.2f}s for a request slot.")
+
+
+async def _acquire_rate_limit_async():
+    if config.RATE_LIMITER_ENABLED:
+        waited = await get_rate_limiter().acquire_async()
+        if waited > 0.05:
+            print(f"  Rate limiter: waited {waited:.2f}s for a request slot.")
+
+
+def _observe_rate_limit_headers(response):
+    """Feed X-RateLimit-* headers back into the shared bucket."""
+    if config.RATE_LIMITER_ENABLED:
+        get_rate_limiter().update_from_headers(getattr(response, 'headers', None))
+
+
+def _extract_page_items(page_data, current_page):
+    """Pulls the list of items out of one page. Returns (items or None, data_key_found)."""
+    extracted_list_data = None
+    data_key_found = None
+
+    if isinstance(page_data, list): # If the response *is* the list
+        extracted_list_data = page_data
+        print(f"  Response is a list.")
+    elif isinstance(page_data, dict):
+        list_keys_to_try = ['timeline', 'followers', 'following', 'users', 'trends', 'retweets', 'affilates', 'members', 'sharings', 'results', 'data'] # Added common keys
+        for key in list_keys_to_try:
+            if key in page_data and isinstance(page_data[key], list):
+                extracted_list_data = page_data[key]
+                data_key_found = key # Store the key where list was found
+                print(f"  Extracted list data from key: '{data_key_found}'")
+                break
+
+        # If no list found, but it's a dict, maybe the dict *is* the result (e.g., single tweet)
+        # Only treat as single item if it's the first page
+        if extracted_list_data is None and current_page == 0:
+            extracted_list_data = [page_data] # Wrap single item in list for consistency
+            print(f"  Treating full dictionary response as single item list.")
+        elif extracted_list_data is None:
+             print(f"  Warning: Expected list data not found on page {current_page+1}.")
+
+    else: # Unexpected format
+         print(f"  Warning: Unexpected response root type: {type(page_data)}")
+         # Only treat as single item if first page
+         if current_page == 0:
+              extracted_list_data = [page_data]
+         else:
+              print(f"  Ignoring unexpected data format on page {current_page+1}.")
+
+    return extracted_list_data, data_key_found
+
+
+def _next_cursor(page_data):
+    """Returns the pagination cursor from a page, or None."""
+    if isinstance(page_data, dict):
+         # Prioritize 'next_cursor', common in pagination
+         if 'next_cursor' in page_data and page_data['next_cursor']:
+              return page_data['next_cursor']
+         # Fallback to 'cursor' if 'next_cursor' isn't present or empty
+         elif 'cursor' in page_data and page_data['cursor'] and isinstance(page_data.get('cursor'), str):
+              return page_data['cursor']
+    return None
+
+
+def _handle_fetch_error(e, retry_count, max_retries, endpoint_suffix, response=None):
+    """
+    Decides what to do after a failed page fetch.
+    Returns (wait_seconds, None) to retry the same page, or (None, error_result) to give up.
+    """
+    if isinstance(e, QuotaExhaustedError):
+        print(f"  {e}")
+        return None, {"error": str(e), "endpoint": endpoint_suffix, "status_code": 429,
+                      "retry_after": round(e.retry_after)}
+
+    if isinstance(e, requests.exceptions.HTTPError):
+        status_code = e.response.status_code
+        print(f"  HTTP Error {status_code}: {e.response.text}")
+        if status_code == 429: # Rate Limit
+            wait_time = (2 ** retry_count) # Exponential backoff
+            retry_after = e.response.headers.get('Retry-After') if e.response.headers else None
+            if retry_after and str(retry_after).isdigit():
+                wait_time = max(wait_time, int(retry_after))
+            print(f"  Rate limit hit. Waiting {wait_time} seconds...")
+            if retry_count + 1 > 4: # Give up after ~15s total wait
+                 return wait_time, {"error": f"Rate limit exceeded after multiple retries.", "endpoint": endpoint_suffix, "status_code": status_code}
+            if config.RATE_LIMITER_ENABLED:
+                # Pause every caller sharing the bucket; this caller waits in its next acquire
+                get_rate_limiter().penalize(wait_time)
+                return 0, None
+            return wait_time, None
+        elif status_code >= 500 and retry_count < max_retries: # Server error, retry
+             print(f"  Server error ({status_code}). Retrying ({retry_count+1}/{max_retries})...")
+             return 1 * (retry_count + 1), None
+        else: # 4xx errors or persistent 5xx
+            return None, {"error": f"HTTP Error {status_code}: {e.response.text}", "endpoint": endpoint_suffix, "status_code": status_code}
+
+    if isinstance(e, requests.exceptions.RequestException):
+        print(f"  Request failed: {e}")
+        # Retry transient network errors (timeout, connection errors)
+        if retry_count < max_retries:
+            wait_time = (2 ** retry_count) + 1  # Exponential backoff: 2s, 4s, 8s, 16s
+            print(f"  Network error. Retrying in {wait_time}s ({retry_count+1}/{max_retries})...")
+            return wait_time, None
+        return None, {"error": f"Request failed after {max_retries} retries: {e}", "endpoint": endpoint_suffix}
+
+    # json.JSONDecodeError
+    print(f"  Failed to decode JSON response: {e}")
+    response_text_for_error = ""
+    if response is not None and hasattr(response, 'text'):
+         response_text_for_error = response.text[:500] # Limit length
+    return None, {"error": f"Invalid JSON response from API: {e}. Response text: {response_text_for_error}", "endpoint": endpoint_suffix}
+
+
+def _build_step_result(step_plan, request_info, all_results, page_data, data_key_found):
+    """Combines paginated items into the step result returned to callers."""
+    endpoint_suffix = request_info['endpoint']
 
     # --- Post-processing: Combine results intelligently ---
     # Try to reconstruct a meaningful structure, especially if pagination occurred.
@@ -292,7 +357,6 @@ def execute_api_step(step_plan, previous_results, rapidapi_key):
     elif not final_data_structure and not data_key_found and len(all_results) == 0:
          final_data_structure = {} # Truly no data
 
-    # --- MODIFICATION START ---
     # Prepare the final result dictionary
     step_result_data = {"data": final_data_structure} if "error" not in final_data_structure else final_data_structure
 
@@ -300,10 +364,284 @@ def execute_api_step(step_plan, previous_results, rapidapi_key):
     step_info_to_return = {
         'endpoint': endpoint_suffix,
         'step_executed': step_plan.get('step', -1), # Carry over step number if present
-        'executed_params': resolved_params, # Include the parameters used!
+        'executed_params': request_info['resolved_params'], # Include the parameters used!
         'reason': step_plan.get('reason') # Carry over reason
     }
     step_info_to_return.update(step_result_data) # Add data or error
 
     return step_info_to_return
-    # --- MODIFICATION END ---
\ No newline at end of file
+
+
+_prefetch_executor = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def _get_prefetch_executor():
+    """Thread pool used to fetch the next page while the current one is processed."""
+    global _prefetch_executor
+    if _prefetch_executor is None:
+        with _prefetch_executor_lock:
+            if _prefetch_executor is None:
+                _prefetch_executor = ThreadPoolExecutor(max_workers=config.HTTP_POOL_MAXSIZE,
+                                                        thread_name_prefix="api-prefetch")
+    return _prefetch_executor
+
+
+def _fetch_page(http_client, request_info, params):
+    """One billed GET for a page. Raises requests/JSON errors for the retry logic."""
+    cassette = get_active_cassette()
+    if cassette is not None:
+        return cassette.fetch_rapidapi_page(request_info['endpoint'], params,
+                                            lambda: _fetch_page_live(http_client, request_info, params))
+    return _fetch_page_live(http_client, request_info, params)
+
+
+def _fetch_page_live(http_client, request_info, params):
+    response = http_client.get(request_info['full_url'], headers=request_info['headers'],
+                               params=params, timeout=config.API_TIMEOUT_SECONDS)
+    _observe_rate_limit_headers(response)
+    response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
+    try:
+        return response.json()
+    except json.JSONDecodeError as e:
+        # requests raises a RequestException subclass here; re-raise a plain decode error
+        # carrying the response, so _handle_fetch_error reports it with the body text
+        error = json.JSONDecodeError(e.msg, e.doc, e.pos)
+        error.response = response
+        raise error from e
+
+
+def _fetch_page_limited(http_client, request_info, params):
+    _acquire_rate_limit()
+    return _fetch_page(http_client, request_info, params)
+
+
+async def _fetch_page_async(http_client, request_info, params):
+    await _acquire_rate_limit_async()
+    return await asyncio.to_thread(_fetch_page, http_client, request_info, params)
+
+
+def _fetch_and_store_page(http_client, request_info, params):
+    """Fetch a page and cache it, so a prefetch abandoned by an early stop is not wasted."""
+    page_data = _fetch_page(http_client, request_info, params)
+    _store_page(_page_cache_key(request_info['endpoint'], params), page_data, request_info['endpoint'], params)
+    return page_data
+
+
+def _prefetch_page(http_client, request_info, params):
+    _acquire_rate_limit()
+    return _fetch_and_store_page(http_client, request_info, params)
+
+
+async def _prefetch_page_async(http_client, request_info, params):
+    await _acquire_rate_limit_async()
+    return await asyncio.to_thread(_fetch_and_store_page, http_client, request_info, params)
+
+
+def _page_params(request_info, cursor):
+    params = request_info['resolved_params'].copy()
+    if cursor:
+        params['cursor'] = cursor
+    return params
+
+
+def _should_prefetch(request_info, cursor, current_page, max_pages, prefetch):
+    """Prefetch only when another page will be requested and it isn't cached already."""
+    if not prefetch or not cursor or current_page + 1 >= max_pages:
+        return False
+    if not _api_cache_enabled():
+        return True
+    cache_key = _page_cache_key(request_info['endpoint'], _page_params(request_info, cursor))
+    try:
+        return not get_api_response_cache().contains(cache_key)
+    except Exception:
+        return True
+
+
+def _should_stop(stop_when, page_items, all_results, endpoint_suffix, current_page):
+    """Run the caller's early-stop predicate; a failing predicate never stops pagination."""
+    if stop_when is None:
+        return False
+    try:
+        stop = bool(stop_when(page_items or [], all_results))
+    except Exception as e:
+        print(f"  Warning: stop_when predicate failed: {e}")
+        return False
+    if stop:
+        print(f"  Early stop requested for {endpoint_suffix} after page {current_page}.")
+    return stop
+
+
+def _pace_between_pages(from_cache):
+    """Fixed delay only when the shared limiter isn't pacing requests for us."""
+    return not from_cache and not config.RATE_LIMITER_ENABLED
+
+
+def execute_api_step(step_plan, previous_results, rapidapi_key, stop_when=None, prefetch=None):
+    """
+    Executes a single API call step, handling pagination and basic errors.
+
+    stop_when(page_items, all_results) -> bool lets callers abandon pagination early
+    (e.g. when results stop being relevant). With prefetch (default
+    config.API_PREFETCH_NEXT_PAGE) the next page request is issued as soon as the
+    cursor is known, overlapping it with processing of the current page.
+    """
+    request_info, error_result = _prepare_step(step_plan, previous_results, rapidapi_key)
+    if error_result:
+        return error_result
+
+    endpoint_suffix = request_info['endpoint']
+    max_pages = request_info['max_pages']
+    prefetch = config.API_PREFETCH_NEXT_PAGE if prefetch is None else prefetch
+    all_results = []
+    current_page = 0
+    next_cursor = None
+    retry_count = 0
+    max_retries = 3 # For transient server errors and network timeouts
+    page_data = None # Keep track of last page data for structure merging
+    data_key_found = None # Keep track of key where list data was found
+    http_client = get_http_client() # Shared keep-alive pool across all callers
+    pending = None # (cursor, Future) of a speculatively fetched next page
+
+    while current_page < max_pages:
+        current_params = _page_params(request_info, next_cursor)
+        if next_cursor:
+            print(f"  Fetching page {current_page + 1} with cursor {str(next_cursor)[:10]}...")
+        else:
+             print(f"  Fetching page {current_page + 1}...")
+
+        cache_key = _page_cache_key(endpoint_suffix, current_params)
+        prefetched = pending if pending and pending[0] == next_cursor else None
+        pending = None
+        page_data = None if prefetched else _cached_page(cache_key)
+        from_cache = page_data is not None
+        if from_cache:
+            print(f"  Served page {current_page + 1} from response cache.")
+        else:
+            response = None
+            try:
+                if prefetched:
+                    page_data = prefetched[1].result()
+                else:
+                    page_data = _fetch_page_limited(http_client, request_info, current_params)
+            except (requests.exceptions.RequestException, json.JSONDecodeError, QuotaExhaustedError) as e:
+                response = getattr(e, 'response', None)
+                wait_time, error_result = _handle_fetch_error(e, retry_count, max_retries, endpoint_suffix, response)
+                if wait_time:
+                    time.sleep(wait_time)
+                if error_result:
+                    return error_result
+                retry_count += 1
+                continue # Retry the current page request without incrementing page count
+            if not prefetched: # Prefetched pages were cached by the prefetch itself
+                _store_page(cache_key, page_data, endpoint_suffix, current_params)
+
+        # Kick off the next page as soon as its cursor is known
+        next_cursor = _next_cursor(page_data)
+        if _should_prefetch(request_info, next_cursor, current_page, max_pages, prefetch):
+            pending = (next_cursor, _get_prefetch_executor().submit(
+                _prefetch_page, http_client, request_info, _page_params(request_info, next_cursor)))
+
+        extracted_list_data, data_key_found = _extract_page_items(page_data, current_page)
+        if extracted_list_data: # Check if we got any data items
+            all_results.extend(extracted_list_data)
+        current_page += 1
+
+        if _should_stop(stop_when, extracted_list_data, all_results, endpoint_suffix, current_page):
+            if pending:
+                pending[1].cancel() # Skips a queued prefetch; one already in flight caches its page
+            break
+
+        if not next_cursor or current_page >= max_pages:
+            print(f"  Finished fetching for {endpoint_suffix}. Total pages: {current_page}. Has next cursor: {bool(next_cursor)}")
+            break # Exit pagination loop
+
+        # Reset retry count on success
+        retry_count = 0
+        if _pace_between_pages(from_cache):
+            time.sleep(0.5) # Small delay between pages
+
+    return _build_step_result(step_plan, request_info, all_results, page_data, data_key_found)
+
+
+async def execute_api_step_async(step_plan, previous_results, rapidapi_key, stop_when=None, prefetch=None):
+    """
+    Async twin of execute_api_step with identical dependency resolution, pagination,
+    retry semantics and return shape. Page fetches run on worker threads through the
+    shared pooled client so many steps can be awaited concurrently.
+    """
+    request_info, error_result = _prepare_step(step_plan, previous_results, rapidapi_key)
+    if error_result:
+        return error_result
+
+    endpoint_suffix = request_info['endpoint']
+    max_pages = request_info['max_pages']
+    prefetch = config.API_PREFETCH_NEXT_PAGE if prefetch is None else prefetch
+    all_results = []
+    current_page = 0
+    next_cursor = None
+    retry_count = 0
+    max_retries = 3 # For transient server errors and network timeouts
+    page_data = None # Keep track of last page data for structure merging
+    data_key_found = None # Keep track of key where list data was found
+    http_client = get_http_client() # Shared keep-alive pool across all callers
+    pending = None # (cursor, Task) of a speculatively fetched next page
+
+    while current_page < max_pages:
+        current_params = _page_params(request_info, next_cursor)
+        if next_cursor:
+            print(f"  Fetching page {current_page + 1} with cursor {str(next_cursor)[:10]}...")
+        else:
+             print(f"  Fetching page {current_page + 1}...")
+
+        cache_key = _page_cache_key(endpoint_suffix, current_params)
+        prefetched = pending if pending and pending[0] == next_cursor else None
+        pending = None
+        page_data = None if prefetched else _cached_page(cache_key)
+        from_cache = page_data is not None
+        if from_cache:
+            print(f"  Served page {current_page + 1} from response cache.")
+        else:
+            try:
+                if prefetched:
+                    page_data = await prefetched[1]
+                else:
+                    page_data = await _fetch_page_async(http_client, request_info, current_params)
+            except (requests.exceptions.RequestException, json.JSONDecodeError, QuotaExhaustedError) as e:
+                response = getattr(e, 'response', None)
+                wait_time, error_result = _handle_fetch_error(e, retry_count, max_retries, endpoint_suffix, response)
+                if wait_time:
+                    await asyncio.sleep(wait_time)
+                if error_result:
+                    return error_result
+                retry_count += 1
+                continue # Retry the current page request without incrementing page count
+            if not prefetched: # Prefetched pages were cached by the prefetch itself
+                _store_page(cache_key, page_data, endpoint_suffix, current_params)
+
+        # Kick off the next page as soon as its cursor is known
+        next_cursor = _next_cursor(page_data)
+        if _should_prefetch(request_info, next_cursor, current_page, max_pages, prefetch):
+            pending = (next_cursor, asyncio.create_task(
+                _prefetch_page_async(http_client, request_info, _page_params(request_info, next_cursor))))
+
+        extracted_list_data, data_key_found = _extract_page_items(page_data, current_page)
+        if extracted_list_data: # Check if we got any data items
+            all_results.extend(extracted_list_data)
+        current_page += 1
+
+        if _should_stop(stop_when, extracted_list_data, all_results, endpoint_suffix, current_page):
+            if pending:
+                pending[1].cancel() # Stops a prefetch still waiting on the limiter; a sent one caches its page
+            break
+
+        if not next_cursor or current_page >= max_pages:
+            print(f"  Finished fetching for {endpoint_suffix}. Total pages: {current_page}. Has next cursor: {bool(next_cursor)}")
+            break # Exit pagination loop
+
+        # Reset retry count on success
+        retry_count = 0
+        if _pace_between_pages(from_cache):
+            await asyncio.sleep(0.5) # Small delay between pages
+
+    return _build_step_result(step_plan, request_info, all_results, page_data, data_key_found)
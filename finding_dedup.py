@@ -0,0 +1,191 @@
+# finding_dedup.py
+"""
+Finding Deduplication - Exact and Near-Duplicate Detection Ahead of Evaluation
+
+The same tweet comes back from search.php, timeline.php, latest_replies.php and
+tweet_thread.php within one investigation, often as a retweet or with a
+different t.co link. FindingDeduplicator gives every extracted result a
+canonical finding_key - its tweet id (the original's for retweets), an exact
+hash of its normalized text, or the key of an earlier result whose 64-bit
+SimHash lies within a few bits of it - so that evaluation verdicts and
+DataPoints can be shared between copies.
+
+Near-duplicate lookup uses banded locality-sensitive hashing: with a maximum
+Hamming distance of k the fingerprint is split into k+1 bands, and any two
+fingerprints within distance k agree exactly on at least one band, so only
+fingerprints sharing a band are compared.
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import twitter_config
+
+SIMHASH_BITS = 64
+SHINGLE_CHARS = 4  # Character shingles keep a one-word edit from flipping many bits in a short tweet
+
+_RETWEET_PREFIX = re.compile(r'^rt\s+@\w+:?\s*')
+_URL = re.compile(r'https?://\S+')
+_MENTION = re.compile(r'@\w+')
+_TOKEN = re.compile(r'\w+')
+
+# Where the tweet id lives in the API payloads; retweets point at the original
+_ID_FIELDS = ('tweet_id', 'id_str', 'rest_id')
+_ORIGINAL_FIELDS = ('retweeted_tweet', 'retweeted_status', 'retweeted')
+
+
+def normalize_finding_text(text: str) -> str:
+    """Lowercase text with retweet prefix, links, mentions and extra whitespace removed"""
+    text = _RETWEET_PREFIX.sub('', str(text or '').lower().strip())
+    text = _MENTION.sub('', _URL.sub('', text))
+    return " ".join(text.split())
+
+
+def content_hash(normalized_text: str) -> str:
+    return hashlib.sha1(normalized_text.encode('utf-8')).hexdigest()
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(normalized_text: str) -> int:
+    """64-bit SimHash over the text's character shingles"""
+    weights = [0] * SIMHASH_BITS
+    shingles = max(1, len(normalized_text) - SHINGLE_CHARS + 1)
+    for start in range(shingles):
+        value = _token_hash(normalized_text[start:start + SHINGLE_CHARS])
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def tweet_id_for(result: Dict[str, Any]) -> Optional[str]:
+    """Id of the tweet behind an extracted result; the original tweet's id for retweets"""
+    metadata = result.get('metadata') if isinstance(result, dict) else None
+    if not isinstance(metadata, dict):
+        return None
+    for field in _ORIGINAL_FIELDS:
+        original = metadata.get(field)
+        if isinstance(original, dict):
+            original_id = tweet_id_for({'metadata': original})
+            if original_id:
+                return original_id
+    for field in _ID_FIELDS:
+        value = metadata.get(field)
+        if value not in (None, '') and str(value).strip():
+            return str(value).strip()
+    return None
+
+
+class FindingDeduplicator:
+    """Assigns canonical finding keys for one investigation"""
+
+    def __init__(self, max_distance: Optional[int] = None, min_tokens: Optional[int] = None):
+        self.max_distance = (twitter_config.FINDING_DEDUP_SIMHASH_DISTANCE
+                             if max_distance is None else max_distance)
+        # Very short texts make unreliable fingerprints; they only dedupe exactly
+        self.min_tokens = twitter_config.FINDING_DEDUP_MIN_TOKENS if min_tokens is None else min_tokens
+        self._band_count = self.max_distance + 1
+        self._band_bits = SIMHASH_BITS // self._band_count
+        self._aliases: Dict[str, str] = {}  # "id:<tweet id>" / "hash:<sha1>" -> canonical key
+        self._fingerprints: List[Tuple[int, str]] = []
+        self._bands: Dict[Tuple[int, int], List[int]] = {}
+        self.stats = {'seen': 0, 'exact': 0, 'near': 0}
+
+    def _bands_of(self, fingerprint: int) -> List[Tuple[int, int]]:
+        mask = (1 << self._band_bits) - 1
+        return [(band, fingerprint >> (band * self._band_bits) & mask) for band in range(self._band_count)]
+
+    def _find_near(self, fingerprint: int) -> Optional[str]:
+        checked = set()
+        for band_key in self._bands_of(fingerprint):
+            for index in self._bands.get(band_key, ()):
+                if index in checked:
+                    continue
+                checked.add(index)
+                other, key = self._fingerprints[index]
+                if hamming_distance(fingerprint, other) <= self.max_distance:
+                    return key
+        return None
+
+    def _index(self, fingerprint: int, key: str):
+        index = len(self._fingerprints)
+        self._fingerprints.append((fingerprint, key))
+        for band_key in self._bands_of(fingerprint):
+            self._bands.setdefault(band_key, []).append(index)
+
+    def key_for(self, result: Dict[str, Any]) -> Tuple[str, bool]:
+        """(canonical finding key, whether an earlier result already had it)"""
+        self.stats['seen'] += 1
+        tweet_id = tweet_id_for(result)
+        id_alias = f"id:{tweet_id}" if tweet_id else None
+        if id_alias in self._aliases:
+            self.stats['exact'] += 1
+            return self._aliases[id_alias], True
+
+        text = result.get('text', '') if isinstance(result, dict) else str(result)
+        normalized = normalize_finding_text(text)
+        if not normalized:
+            # Nothing to compare (e.g. a bare link) - only the tweet id can match it later
+            key = f"tweet:{tweet_id}" if tweet_id else f"item:{self.stats['seen']}"
+            if id_alias:
+                self._aliases[id_alias] = key
+            return key, False
+        hash_alias = f"hash:{content_hash(normalized)}"
+        key, duplicate = self._aliases.get(hash_alias), True
+        if key is not None:
+            self.stats['exact'] += 1
+        else:
+            fingerprint = None
+            if len(_TOKEN.findall(normalized)) >= self.min_tokens:
+                fingerprint = simhash(normalized)
+                key = self._find_near(fingerprint)
+            if key is not None:
+                self.stats['near'] += 1
+            else:
+                key, duplicate = (f"tweet:{tweet_id}" if tweet_id else f"text:{hash_alias[5:]}"), False
+                if fingerprint is not None:
+                    self._index(fingerprint, key)
+
+        self._aliases.setdefault(hash_alias, key)
+        if id_alias:
+            self._aliases[id_alias] = key
+        return key, duplicate
+
+    def get_checkpoint_state(self) -> Dict[str, Any]:
+        """Keys assigned so far, for investigation_checkpoint"""
+        return {'aliases': dict(self._aliases), 'fingerprints': [list(f) for f in self._fingerprints],
+                'stats': dict(self.stats)}
+    
+    def restore_checkpoint_state(self, state: Dict[str, Any]):
+        self._aliases = dict(state.get('aliases', {}))
+        self._fingerprints, self._bands = [], {}
+        for fingerprint, key in state.get('fingerprints', []):
+            self._index(fingerprint, key)
+        self.stats.update(state.get('stats', {}))
+    
+    def annotate(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Tag each result with its finding_key and drop repeats within this batch
+
+        Copies of findings seen in earlier batches are kept (tagged with the
+        earlier key) so their search still records them; the evaluator's
+        verdict cache answers them without an LLM call.
+        """
+        unique, batch_keys = [], set()
+        for result in results:
+            if not isinstance(result, dict):
+                unique.append(result)
+                continue
+            key, _ = self.key_for(result)
+            if key in batch_keys:
+                continue
+            batch_keys.add(key)
+            result['finding_key'] = key
+            unique.append(result)
+        return unique
@@ -1,9 +1,15 @@
 """LLM-based evaluator to identify DataPoint-worthy findings from search results"""
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from dataclasses import asdict, dataclass
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 import json
 from datetime import datetime
-# litellm imported via llm_client
+import twitter_config
+# litellm imported via llm_client; only its model map is used here, to size whole-round chunks
+try:
+    from litellm import get_model_info
+    LITELLM_AVAILABLE = True
+except ImportError:
+    LITELLM_AVAILABLE = False
 
 @dataclass
 class FindingAssessment:
@@ -16,6 +22,8 @@ class FindingAssessment:
     suggested_followup: Optional[str]
     reasoning: str
 
+NOT_EVALUATED = "Not evaluated"
+
 class LLMFindingEvaluator:
     """Uses LLM to evaluate search results and identify significant findings"""
     
@@ -33,6 +41,73 @@ class LLMFindingEvaluator:
         else:
             self.model_manager = model_manager
         
+        # Findings already accepted in past investigations (add_known_findings) skip the LLM
+        self.known_findings: Dict[str, FindingAssessment] = {}
+        
+        # Verdicts from this investigation, keyed by finding_key (finding_dedup) so repeats cost nothing
+        self.verdicts: Dict[str, FindingAssessment] = {}
+        
+        # Optional local tier (finding_prefilter.FindingPrefilter) that settles clear cases without the LLM
+        self.prefilter = None
+    
+    @staticmethod
+    def _finding_key(result: Any) -> str:
+        text = result.get('text', '') if isinstance(result, dict) else str(result)
+        return " ".join(str(text).lower().split())
+    
+    @classmethod
+    def _verdict_key(cls, result: Any) -> str:
+        if isinstance(result, dict) and result.get('finding_key'):
+            return result['finding_key']
+        return cls._finding_key(result)
+    
+    def clear_verdicts(self):
+        """Forget this investigation's verdicts (call when a new investigation starts)"""
+        self.verdicts = {}
+    
+    def get_checkpoint_state(self) -> Dict[str, Any]:
+        """Verdicts and known findings, for investigation_checkpoint"""
+        return {
+            'verdicts': {key: asdict(a) for key, a in self.verdicts.items()},
+            'known_findings': {key: asdict(a) for key, a in self.known_findings.items()}
+        }
+    
+    def restore_checkpoint_state(self, state: Dict[str, Any]):
+        self.verdicts = {key: FindingAssessment(**a) for key, a in state.get('verdicts', {}).items()}
+        self.known_findings = {key: FindingAssessment(**a) for key, a in state.get('known_findings', {}).items()}
+    
+    def add_known_findings(self, findings: Iterable[Tuple[str, float]],
+                           reasoning: str = "Accepted as a DataPoint in a prior investigation"):
+        """Register (text, relevance_score) pairs whose assessment is already known"""
+        for text, relevance_score in findings:
+            key = self._finding_key(text)
+            if key:
+                self.known_findings[key] = FindingAssessment(
+                    is_significant=True,
+                    relevance_score=relevance_score,
+                    specificity_score=0.5,
+                    entities={},
+                    key_claims=[],
+                    suggested_followup=None,
+                    reasoning=reasoning
+                )
+    
+    def _split_known(self, results: List[Dict[str, Any]]) -> Tuple[List[Optional[FindingAssessment]], List[int]]:
+        """Known assessments (None where unknown) and the indices that still need the LLM"""
+        if not self.known_findings and not self.verdicts:
+            return [None] * len(results), list(range(len(results)))
+        known = [self.verdicts.get(self._verdict_key(r)) or self.known_findings.get(self._finding_key(r))
+                 for r in results]
+        return known, [i for i, assessment in enumerate(known) if assessment is None]
+    
+    @staticmethod
+    def _merge_known(known: List[Optional[FindingAssessment]], pending: List[int],
+                     evaluated: List[FindingAssessment]) -> List[FindingAssessment]:
+        merged = list(known)
+        for i, assessment in zip(pending, evaluated):
+            merged[i] = assessment
+        return merged
+        
     def evaluate_finding(self, result: Dict[str, Any], investigation_goal: str) -> FindingAssessment:
         """
         Use LLM to assess if a search result contains significant information worth preserving
@@ -106,16 +181,18 @@ class LLMFindingEvaluator:
             # FAIL-FAST: Surface errors immediately per CLAUDE.md principles
             raise RuntimeError(f"LLM evaluation failed - investigation cannot continue: {str(e)}") from e
     
-    def evaluate_batch(self, results: List[Dict[str, Any]], investigation_goal: str) -> List[FindingAssessment]:
+    def evaluate_batch(self, results: List[Dict[str, Any]], investigation_goal: str,
+                       max_concurrency: Optional[int] = None) -> List[FindingAssessment]:
         """
-        Evaluate multiple findings in a single LLM call for efficiency
+        Evaluate any number of findings in token-budgeted chunks, one LLM call per chunk
         
         Args:
             results: List of raw search results
             investigation_goal: The original investigation query
+            max_concurrency: Cap on in-flight chunk calls (LLM_DEFAULT_MAX_CONCURRENCY if None)
             
         Returns:
-            List of FindingAssessments
+            One FindingAssessment per result, in input order
         """
         
         if not results:
@@ -125,12 +202,175 @@ class LLMFindingEvaluator:
         if not self.llm_client:
             raise RuntimeError("No LLM client available - investigation cannot continue")
         
+        known, pending = self._split_known(results)
+        if not pending:
+            return known
+        pending_results = [results[i] for i in pending]
+        
+        try:
+            evaluated = self._evaluate_groups([pending_results], investigation_goal, max_concurrency)[0]
+            return self._merge_known(known, pending, evaluated)
+            
+        except Exception as e:
+            # FAIL-FAST: Surface errors immediately per CLAUDE.md principles
+            raise RuntimeError(f"LLM batch evaluation failed - investigation cannot continue: {str(e)}") from e
+    
+    def evaluate_batches(self, result_lists: List[List[Dict[str, Any]]], investigation_goal: str,
+                         max_concurrency: Optional[int] = None,
+                         whole_round: bool = False) -> List[List[FindingAssessment]]:
+        """
+        Evaluate several independent result batches with concurrent LLM calls
+        
+        Args:
+            result_lists: One list of raw search results per batch (e.g. per search)
+            investigation_goal: The original investigation query
+            max_concurrency: Cap on in-flight calls (LLM_DEFAULT_MAX_CONCURRENCY if None)
+            whole_round: Pack results from all batches into as few calls as the
+                         evaluator model's context window allows
+            
+        Returns:
+            One list of FindingAssessments per input batch, in input order
+        """
+        
+        if not self.llm_client:
+            raise RuntimeError("No LLM client available - investigation cannot continue")
+        
+        splits = [self._split_known(results) for results in result_lists]
+        assessments: List[List[FindingAssessment]] = [known for known, _ in splits]
+        pending = [i for i, (_, unknown) in enumerate(splits) if unknown]
+        if not pending:
+            return assessments
+        
+        try:
+            pending_results = [[result_lists[i][j] for j in splits[i][1]] for i in pending]
+            evaluated = self._evaluate_groups(pending_results, investigation_goal, max_concurrency, whole_round)
+            for i, group_assessments in zip(pending, evaluated):
+                known, unknown = splits[i]
+                assessments[i] = self._merge_known(known, unknown, group_assessments)
+            return assessments
+            
+        except Exception as e:
+            # FAIL-FAST: Surface errors immediately per CLAUDE.md principles
+            raise RuntimeError(f"LLM batch evaluation failed - investigation cannot continue: {str(e)}") from e
+    
+    def _evaluate_groups(self, groups: List[List[Dict[str, Any]]], investigation_goal: str,
+                         max_concurrency: Optional[int] = None,
+                         whole_round: bool = False) -> List[List[FindingAssessment]]:
+        """Chunk every group, run all chunk calls in one fan-out and reassemble by index
+        
+        Results sharing a verdict key are sent once; the copies get the same
+        assessment and every verdict is remembered for later batches. With a
+        prefilter attached, only results it cannot settle locally (plus its
+        audit sample) reach the LLM.
+        """
+        
+        model = self.model_manager.get_model_for_operation("finding_evaluator")
+        token_budget, max_results = self._chunk_limits(model, whole_round)
+        
+        assessments: List[List[Optional[FindingAssessment]]] = [[None] * len(group) for group in groups]
+        first_position: Dict[str, Tuple[int, int]] = {}
+        copies: List[Tuple[Tuple[int, int], Tuple[int, int]]] = []
+        audits: Dict[Tuple[int, int], FindingAssessment] = {}
+        units = []
+        for g, group in enumerate(groups):
+            unit = []
+            for j, result in enumerate(group):
+                key = self._verdict_key(result)
+                if key in first_position:
+                    copies.append(((g, j), first_position[key]))
+                    continue
+                first_position[key] = (g, j)
+                local = self.prefilter.triage(result, investigation_goal) if self.prefilter else None
+                if local is not None and not self.prefilter.should_audit():
+                    assessments[g][j] = local
+                    self.prefilter.record_tokens_saved(self._estimated_tokens(result))
+                    continue
+                if local is not None:
+                    audits[(g, j)] = local
+                unit.append((g, j))
+            units.append(unit)
+        # Chunks never mix groups unless the whole round is packed together
+        if whole_round:
+            units = [[position for unit in units for position in unit]]
+        chunks = []
+        for unit in units:
+            previews = [self._result_preview(groups[g][j]) for g, j in unit]
+            chunks.extend([unit[k] for k in chunk] for chunk in self._chunk_indices(previews, token_budget, max_results))
+        
+        chunk_results = [[groups[g][j] for g, j in chunk] for chunk in chunks]
+        requests = [self._build_batch_request(results, investigation_goal, model) for results in chunk_results]
+        if len(requests) > 1 and callable(getattr(type(self.llm_client), 'completion_many', None)):
+            responses = self.llm_client.completion_many(requests, max_concurrency=max_concurrency)
+        else:
+            responses = [self.llm_client.completion(**request) for request in requests]
+        
+        for chunk, results, response in zip(chunks, chunk_results, responses):
+            for (g, j), assessment in zip(chunk, self._parse_batch_response(response, results)):
+                assessments[g][j] = assessment
+        for (g, j), local in audits.items():
+            if assessments[g][j].reasoning != NOT_EVALUATED:
+                self.prefilter.record_audit(local, assessments[g][j])
+        for (g, j), (first_g, first_j) in copies:
+            assessments[g][j] = assessments[first_g][first_j]
+        for key, (g, j) in first_position.items():
+            if assessments[g][j].reasoning != NOT_EVALUATED:  # Unanswered results get another chance
+                self.verdicts[key] = assessments[g][j]
+        return assessments
+    
+    def _chunk_limits(self, model: str, whole_round: bool) -> Tuple[int, int]:
+        """(result-token budget, max results) for one evaluation call"""
+        token_budget = twitter_config.FINDING_EVAL_CHUNK_TOKENS
+        max_results = twitter_config.FINDING_EVAL_MAX_CHUNK_RESULTS
+        if not whole_round:
+            return token_budget, max_results
+        
+        model_info = {}
+        if LITELLM_AVAILABLE:
+            try:
+                model_info = get_model_info(model) or {}
+            except Exception:
+                model_info = {}  # Model not in litellm's map - fall back to per-search sizes
+        if model_info.get('max_input_tokens'):
+            token_budget = max(token_budget, int(model_info['max_input_tokens'] * twitter_config.FINDING_EVAL_CONTEXT_FRACTION))
+            max_results = twitter_config.FINDING_EVAL_MAX_ROUND_CHUNK_RESULTS
+        if model_info.get('max_output_tokens'):
+            max_results = min(max_results, max(1, model_info['max_output_tokens']
+                                               // twitter_config.FINDING_EVAL_OUTPUT_TOKENS_PER_RESULT))
+        return token_budget, max_results
+    
+    @staticmethod
+    def _chunk_indices(previews: List[str], token_budget: int, max_results: int) -> List[List[int]]:
+        """Greedily pack previews into consecutive chunks under the token and count limits"""
+        chunks, current, used = [], [], 0
+        for i, preview in enumerate(previews):
+            tokens = len(preview) // twitter_config.FINDING_EVAL_CHARS_PER_TOKEN + 1
+            if current and (used + tokens > token_budget or len(current) >= max_results):
+                chunks.append(current)
+                current, used = [], 0
+            current.append(i)
+            used += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    @classmethod
+    def _estimated_tokens(cls, result: Any) -> int:
+        """Prompt plus answer tokens one result adds to an evaluation call"""
+        return (len(cls._result_preview(result)) // twitter_config.FINDING_EVAL_CHARS_PER_TOKEN + 1
+                + twitter_config.FINDING_EVAL_OUTPUT_TOKENS_PER_RESULT)
+    
+    @staticmethod
+    def _result_preview(result: Any) -> str:
+        text = result.get('text', '') if isinstance(result, dict) else str(result)
+        limit = twitter_config.FINDING_EVAL_PREVIEW_CHARS
+        return text[:limit] + "..." if len(text) > limit else text
+    
+    def _build_batch_request(self, results: List[Dict[str, Any]], investigation_goal: str,
+                             model: Optional[str] = None) -> Dict[str, Any]:
+        """Build the completion request for one chunk of results"""
+        
         # Simplified prompt to avoid JSON formatting issues
-        results_summary = []
-        for i, r in enumerate(results[:10]):  # Limit to prevent token overflow
-            text = r.get('text', '') if isinstance(r, dict) else str(r)
-            text_preview = text[:200] + "..." if len(text) > 200 else text
-            results_summary.append(f"Result {i}: {text_preview}")
+        results_summary = [f"Result {i}: {self._result_preview(r)}" for i, r in enumerate(results)]
         
         batch_prompt = f"""Investigation: {investigation_goal}
 
@@ -138,65 +378,72 @@ Evaluate these {len(results_summary)} Twitter results. For each, determine if it
 
 {chr(10).join(results_summary)}
 
-Return JSON array with {len(results_summary)} evaluations:
+Return JSON array with {len(results_summary)} evaluations, one per result, where index is the result number:
 [
-  {{"is_significant": true/false, "relevance_score": 0.0-1.0, "reasoning": "brief explanation"}},
-  {{"is_significant": true/false, "relevance_score": 0.0-1.0, "reasoning": "brief explanation"}}
+  {{"index": 0, "is_significant": true/false, "relevance_score": 0.0-1.0, "reasoning": "brief explanation"}},
+  {{"index": 1, "is_significant": true/false, "relevance_score": 0.0-1.0, "reasoning": "brief explanation"}}
 ]
 
 Only mark as significant if directly relevant to: {investigation_goal}"""
         
-        try:
-            # Use configured model instead of hardcoded
+        # Use configured model instead of hardcoded
+        if model is None:
             model = self.model_manager.get_model_for_operation("finding_evaluator")
-            response = self.llm_client.completion(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "You are an expert investigation analyst evaluating evidence."},
-                    {"role": "user", "content": batch_prompt}
-                ]
+        return {
+            'model': model,
+            'messages': [
+                {"role": "system", "content": "You are an expert investigation analyst evaluating evidence."},
+                {"role": "user", "content": batch_prompt}
+            ]
+        }
+    
+    def _parse_batch_response(self, response, results: List[Dict[str, Any]]) -> List[FindingAssessment]:
+        """Turn a batch completion into one FindingAssessment per result"""
+        
+        # Parse batch response - strip markdown formatting if present
+        content = response.choices[0].message.content.strip()
+        if content.startswith('```') and content.endswith('```'):
+            content = content[3:-3]
+        if content.startswith('json'):
+            content = content[4:]
+        batch_evaluation = json.loads(content.strip())
+        
+        # Handle both formats: direct list or dict with 'evaluations' key
+        if isinstance(batch_evaluation, list):
+            evaluations = batch_evaluation
+        else:
+            evaluations = batch_evaluation.get('evaluations', [])
+        
+        evaluations = [e for e in evaluations if isinstance(e, dict)]
+        
+        # Place by the echoed index when the model returned a clean permutation, else by position
+        indices = [e.get('index') for e in evaluations]
+        if not (all(isinstance(i, int) and 0 <= i < len(results) for i in indices) and len(set(indices)) == len(indices)):
+            indices = range(min(len(evaluations), len(results)))
+        
+        assessments: List[Optional[FindingAssessment]] = [None] * len(results)
+        for i, eval_data in zip(indices, evaluations):
+            assessments[i] = FindingAssessment(
+                is_significant=eval_data.get('is_significant', False),
+                relevance_score=float(eval_data.get('relevance_score', 0.0)),
+                specificity_score=0.5,  # Default value since not in simplified format
+                entities={},  # Simplified - no entities extraction
+                key_claims=[],  # Simplified - no key claims extraction
+                suggested_followup=None,  # Simplified - no followup suggestions
+                reasoning=eval_data.get('reasoning', 'No reasoning provided')
             )
-            
-            # Parse batch response - strip markdown formatting if present
-            content = response.choices[0].message.content.strip()
-            if content.startswith('```') and content.endswith('```'):
-                content = content[3:-3]
-            if content.startswith('json'):
-                content = content[4:]
-            batch_evaluation = json.loads(content.strip())
-            
-            # Handle both formats: direct list or dict with 'evaluations' key
-            if isinstance(batch_evaluation, list):
-                evaluations = batch_evaluation
-            else:
-                evaluations = batch_evaluation.get('evaluations', [])
-            
-            assessments = []
-            for i, eval_data in enumerate(evaluations):
-                assessments.append(FindingAssessment(
-                    is_significant=eval_data.get('is_significant', False),
-                    relevance_score=float(eval_data.get('relevance_score', 0.0)),
-                    specificity_score=0.5,  # Default value since not in simplified format
-                    entities={},  # Simplified - no entities extraction
-                    key_claims=[],  # Simplified - no key claims extraction
-                    suggested_followup=None,  # Simplified - no followup suggestions
-                    reasoning=eval_data.get('reasoning', 'No reasoning provided')
-                ))
-            
-            # Fill in any missing evaluations
-            while len(assessments) < len(results):
-                assessments.append(FindingAssessment(
+        
+        # Fill in any missing evaluations
+        for i, assessment in enumerate(assessments):
+            if assessment is None:
+                assessments[i] = FindingAssessment(
                     is_significant=False,
                     relevance_score=0.0,
                     specificity_score=0.0,
                     entities={},
                     key_claims=[],
                     suggested_followup=None,
-                    reasoning="Not evaluated"
-                ))
-            
-            return assessments
-            
-        except Exception as e:
-            # FAIL-FAST: Surface errors immediately per CLAUDE.md principles
-            raise RuntimeError(f"LLM batch evaluation failed - investigation cannot continue: {str(e)}") from e
\ No newline at end of file
+                    reasoning=NOT_EVALUATED
+                )
+        
+        return assessments
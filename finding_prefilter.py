@@ -0,0 +1,162 @@
+# finding_prefilter.py
+"""
+Finding Pre-filter - Cheap Local Tier Ahead of LLM Finding Evaluation
+
+Scores each result with the regex heuristics of FindingEvaluator (entities,
+specificity) and InvestigationContext goal-keyword relevance. Clear negatives
+(empty text, promotional or generic content, another language, low scores)
+are rejected and clear positives accepted without an LLM call; only the
+uncertain band in between goes to LLMFindingEvaluator.
+
+A sample of locally decided results is still sent to the LLM so the metrics
+can report how often the two tiers agree alongside the tokens saved. Local
+rejections are kept (text and reason) so they can be audited afterwards.
+"""
+
+import re
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import twitter_config
+from finding_evaluator import FindingEvaluator
+from finding_evaluator_llm import FindingAssessment
+
+# Promotional phrasing on top of FindingEvaluator.GENERIC_INDICATORS
+PROMOTIONAL_INDICATORS = [
+    'giveaway', 'promo code', 'use code', 'discount code', '% off', 'buy now', 'shop now',
+    'limited time offer', 'link in bio', 'dm for', 'free shipping', 'sign up now', 'airdrop'
+]
+
+_LETTER = re.compile(r'[^\W\d_]')
+_LATIN_LETTER = re.compile(r'[a-zA-ZÀ-ɏ]')
+
+
+def _indicator_pattern(indicators: List[str]):
+    """Whole-word/phrase matcher, so 'subscribe' does not match 'subscribers'"""
+    parts = []
+    for indicator in indicators:
+        escaped = re.escape(indicator)
+        if indicator[:1].isalnum():
+            escaped = r'\b' + escaped
+        if indicator[-1:].isalnum():
+            escaped += r'\b'
+        parts.append(escaped)
+    return re.compile('|'.join(parts))
+
+
+def _latin_share(text: str) -> float:
+    letters = _LETTER.findall(text)
+    if not letters:
+        return 1.0
+    return sum(1 for ch in letters if _LATIN_LETTER.match(ch)) / len(letters)
+
+
+class FindingPrefilter:
+    """Local accept/reject tier for search results, with agreement metrics"""
+
+    def __init__(self, context=None, reject_below: Optional[float] = None, accept_above: Optional[float] = None,
+                 audit_rate: Optional[float] = None, languages=None):
+        self.context = context
+        self.heuristics = FindingEvaluator()
+        self.reject_below = twitter_config.FINDING_PREFILTER_REJECT_BELOW if reject_below is None else reject_below
+        self.accept_above = twitter_config.FINDING_PREFILTER_ACCEPT_ABOVE if accept_above is None else accept_above
+        self.audit_rate = twitter_config.FINDING_PREFILTER_AUDIT_RATE if audit_rate is None else audit_rate
+        self.languages = set(twitter_config.FINDING_PREFILTER_LANGUAGES if languages is None else languages)
+        self.indicator_pattern = _indicator_pattern(self.heuristics.GENERIC_INDICATORS + PROMOTIONAL_INDICATORS)
+        self.reset_metrics()
+
+    def reset_metrics(self):
+        self.metrics = {
+            'triaged': 0, 'rejected': 0, 'accepted': 0, 'uncertain': 0,
+            'audited': 0, 'agreements': 0, 'estimated_tokens_saved': 0
+        }
+        self._decided_count = 0
+        # Most recent local rejections, for auditing what never reached the LLM
+        self.rejections = deque(maxlen=twitter_config.FINDING_PREFILTER_REJECTION_LOG_SIZE)
+
+    def _language_mismatch(self, result: Dict[str, Any], text: str, investigation_goal: str) -> bool:
+        metadata = result.get('metadata') if isinstance(result, dict) else None
+        lang = metadata.get('lang') if isinstance(metadata, dict) else None
+        if lang and self.languages:
+            return lang not in self.languages and lang not in ('und', 'zxx', 'qme', 'qht')
+        # No language tag: compare scripts with the investigation question
+        return _latin_share(investigation_goal) > 0.5 and _latin_share(text) < 0.3
+
+    def score(self, result: Dict[str, Any], investigation_goal: str) -> Tuple[float, float, float, Dict[str, list]]:
+        """(combined score, goal relevance, specificity, entities) for one result"""
+        text = result.get('text', '') if isinstance(result, dict) else str(result)
+        entities = self.heuristics._extract_entities(text)
+        specificity = self.heuristics._calculate_specificity(text, entities)
+        if self.context is not None:
+            relevance = self.context.calculate_goal_relevance_score(text)
+        else:
+            relevance = self.heuristics._calculate_relevance(text, investigation_goal)
+        combined = (twitter_config.FINDING_PREFILTER_RELEVANCE_WEIGHT * relevance
+                    + (1 - twitter_config.FINDING_PREFILTER_RELEVANCE_WEIGHT) * specificity)
+        return combined, relevance, specificity, entities
+
+    def triage(self, result: Dict[str, Any], investigation_goal: str) -> Optional[FindingAssessment]:
+        """Local verdict for a clear case, or None when the LLM should decide"""
+        self.metrics['triaged'] += 1
+        text = (result.get('text', '') if isinstance(result, dict) else str(result)) or ''
+        lowered = text.lower()
+
+        reason = None
+        if not text.strip():
+            reason = "Empty text"
+        elif (match := self.indicator_pattern.search(lowered)):
+            reason = f"Promotional or generic content ('{match.group(0)}')"
+        elif self._language_mismatch(result, text, investigation_goal):
+            reason = "Not in the investigation's language"
+        if reason:
+            return self._decided(False, 0.0, 0.0, {}, reason, text)
+
+        combined, relevance, specificity, entities = self.score(result, investigation_goal)
+        if combined < self.reject_below:
+            return self._decided(False, relevance, specificity, entities,
+                                 f"Low local score {combined:.2f} (relevance {relevance:.2f}, specificity {specificity:.2f})",
+                                 text)
+        if combined >= self.accept_above:
+            return self._decided(True, relevance, specificity, entities,
+                                 f"High local score {combined:.2f} (relevance {relevance:.2f}, specificity {specificity:.2f})")
+        self.metrics['uncertain'] += 1
+        return None
+
+    def _decided(self, significant: bool, relevance: float, specificity: float,
+                 entities: Dict[str, list], reason: str, text: str = '') -> FindingAssessment:
+        self.metrics['accepted' if significant else 'rejected'] += 1
+        self._decided_count += 1
+        if not significant:
+            self.rejections.append({'text': text[:200], 'reason': reason})
+        return FindingAssessment(
+            is_significant=significant,
+            relevance_score=relevance,
+            specificity_score=specificity,
+            entities=entities,
+            key_claims=[],
+            suggested_followup=None,
+            reasoning=f"Local pre-filter: {reason}"
+        )
+
+    def should_audit(self) -> bool:
+        """Whether the verdict just returned by triage should also go to the LLM"""
+        if self.audit_rate <= 0:
+            return False
+        every = max(1, round(1 / min(self.audit_rate, 1.0)))
+        return self._decided_count % every == 0
+
+    def record_audit(self, local: FindingAssessment, llm: FindingAssessment):
+        self.metrics['audited'] += 1
+        if local.is_significant == llm.is_significant:
+            self.metrics['agreements'] += 1
+
+    def record_tokens_saved(self, tokens: int):
+        self.metrics['estimated_tokens_saved'] += tokens
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = dict(self.metrics)
+        decided = metrics['accepted'] + metrics['rejected']
+        metrics['decided_locally_rate'] = decided / metrics['triaged'] if metrics['triaged'] else 0.0
+        metrics['agreement_rate'] = metrics['agreements'] / metrics['audited'] if metrics['audited'] else None
+        metrics['recent_rejections'] = list(self.rejections)
+        return metrics
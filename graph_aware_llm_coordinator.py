@@ -352,6 +352,24 @@ class GraphAwareLLMCoordinator:
         else:
             self.emergent_questions = []
     
+    def get_checkpoint_state(self) -> Dict[str, Any]:
+        """Adaptation state saved with investigation checkpoints (the graph is saved separately)"""
+        return {
+            'search_history': self.search_history,
+            'endpoint_usage': dict(self.diversity_tracker.endpoint_usage),
+            'emergent_questions': self.emergent_questions,
+            'rejection_context': getattr(self, 'rejection_context', ''),
+            'total_results_found': getattr(self, 'total_results_found', 0)
+        }
+    
+    def restore_checkpoint_state(self, state: Dict[str, Any]):
+        """Restore state from get_checkpoint_state() when resuming an investigation"""
+        self.search_history = list(state.get('search_history', []))
+        self.diversity_tracker.endpoint_usage = dict(state.get('endpoint_usage', {}))
+        self.emergent_questions = list(state.get('emergent_questions', []))
+        self.rejection_context = state.get('rejection_context', '')
+        self.total_results_found = state.get('total_results_found', 0)
+    
     def check_and_adapt_strategy(self, goal: str) -> Optional[StrategicDecision]:
         """
         Check if strategy adaptation is needed and generate pivot if necessary
@@ -1300,7 +1318,7 @@ Focus on building a coherent narrative from the evidence while acknowledging unc
         """Update graph with evaluation results - maintains connectivity"""
         
         # Find the most recent search query node to connect data points to
-        search_nodes = self.graph.get_nodes_by_type("SearchQuery")
+        search_nodes = self.graph.get_search_query_nodes()
         recent_search = search_nodes[-1] if search_nodes else None
         
         # Add high-value results as data points
@@ -1338,6 +1356,7 @@ Focus on building a coherent narrative from the evidence while acknowledging unc
             insight.properties['confidence'] = 0.7  # Reasonable default for evaluation-derived insights
             insight.properties['investigation_relevance'] = evaluation.relevance_score / 10.0  # Convert 0-10 to 0-1
             insight.properties['key_evidence'] = [insight_text[:200]]  # First 200 chars as evidence
+            self.graph.record_node_update(insight)
             
             # Connect insights to data points that support them
             for data_point in created_data_points:
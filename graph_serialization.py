@@ -0,0 +1,151 @@
+# graph_serialization.py
+"""
+Streaming JSON Lines Format for InvestigationGraph
+
+InvestigationGraph.to_json() builds one indented document holding every node
+and edge. This module writes and reads the same node and edge documents as
+JSON Lines instead, one record per line, so neither side has to hold the
+whole graph as a single string:
+
+    {"format": "investigation_graph.jsonl", "version": 1, "analytic_question": "<id>", "created_at": "..."}
+    {"section": "nodes", "count": 2}
+    {"id": "<id>", "node_type": "AnalyticQuestion", "properties": {...}, "created_at": "..."}
+    {"id": "<id>", "node_type": "SearchQuery", "properties": {...}, "created_at": "..."}
+    {"section": "edges", "count": 1}
+    {"id": "<id>", "source_id": "<id>", "target_id": "<id>", "edge_type": "OPERATIONALIZES", ...}
+
+Section counts let a reader detect truncated files. Paths ending in .zst
+are zstd-compressed (needs the optional zstandard package), paths ending in
+.gz are gzip-compressed.
+
+Usage:
+    write_graph(graph, "investigation_graph_<id>.jsonl.zst")
+    graph = read_graph("investigation_graph_<id>.jsonl.zst")
+"""
+
+import gzip
+import io
+import json
+from typing import Any, Dict, IO, Iterable, Iterator, Optional
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+GRAPH_JSONL_FORMAT = "investigation_graph.jsonl"
+GRAPH_JSONL_VERSION = 1
+
+
+def _dumps(record: Dict[str, Any]) -> str:
+    return json.dumps(record, separators=(',', ':'), default=str)
+
+
+def open_graph_file(path: str, mode: str) -> IO[str]:
+    """Open a graph file as text, compressed according to its extension ('r' or 'w')"""
+    if path.endswith('.zst'):
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstd-compressed graph files need zstandard. Install with: pip install zstandard")
+        raw = open(path, mode + 'b')
+        if mode == 'w':
+            stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding='utf-8')
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def is_graph_jsonl(text: str) -> bool:
+    """Whether a string holds this module's format rather than a to_json() document"""
+    first_line = text.lstrip()[:200].split('\n', 1)[0]
+    return first_line.startswith('{"format"') and GRAPH_JSONL_FORMAT in first_line
+
+
+def iter_graph_lines(graph, header: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """Serialized lines for a graph, produced one node/edge at a time (header adds extra metadata)"""
+    header_record = {
+        "format": GRAPH_JSONL_FORMAT,
+        "version": GRAPH_JSONL_VERSION,
+        "analytic_question": graph.serialized_node_id(graph.analytic_question),
+        "created_at": graph.serialization_timestamp()
+    }
+    header_record.update(header or {})
+    yield _dumps(header_record)
+    yield _dumps({"section": "nodes", "count": len(graph.nodes)})
+    for node in list(graph.nodes.values()):
+        yield _dumps(graph.serialize_node(node))
+    yield _dumps({"section": "edges", "count": len(graph.edges)})
+    for edge in list(graph.edges):
+        yield _dumps(graph.serialize_edge(edge))
+
+
+def write_graph(graph, path: str, header: Optional[Dict[str, Any]] = None) -> int:
+    """Stream a graph to path; returns the number of records written"""
+    written = 0
+    with open_graph_file(path, 'w') as f:
+        for line in iter_graph_lines(graph, header):
+            f.write(line)
+            f.write('\n')
+            written += 1
+    return written
+
+
+class GraphRecordReader:
+    """
+    Reads a graph stream section by section without loading it whole.
+
+    Consume nodes() fully before edges(); both are lazy generators.
+    """
+
+    def __init__(self, lines: Iterable[str]):
+        self._lines = (line for line in lines if line.strip())
+        self.header = self._next_record()
+        if self.header.get("format") != GRAPH_JSONL_FORMAT:
+            raise ValueError("Not an investigation graph JSON Lines stream")
+        if self.header.get("version", 0) > GRAPH_JSONL_VERSION:
+            raise ValueError(f"Unsupported graph format version {self.header.get('version')}")
+
+    @property
+    def analytic_question(self) -> Optional[str]:
+        return self.header.get("analytic_question")
+
+    def _next_record(self) -> Dict[str, Any]:
+        try:
+            return json.loads(next(self._lines))
+        except StopIteration:
+            raise ValueError("Graph stream ended unexpectedly") from None
+
+    def _section(self, name: str) -> Iterator[Dict[str, Any]]:
+        marker = self._next_record()
+        if marker.get("section") != name:
+            raise ValueError(f"Expected '{name}' section, found {marker}")
+        for _ in range(marker.get("count", 0)):
+            yield self._next_record()
+
+    def nodes(self) -> Iterator[Dict[str, Any]]:
+        return self._section("nodes")
+
+    def edges(self) -> Iterator[Dict[str, Any]]:
+        return self._section("edges")
+
+
+def read_graph(path: str, compact: Optional[bool] = None):
+    """Load a graph written by write_graph() (or a to_json() document) from path"""
+    from investigation_graph import InvestigationGraph
+
+    graph = InvestigationGraph(compact=compact)
+    with open_graph_file(path, 'r') as f:
+        first = f.readline()
+        if is_graph_jsonl(first):
+            graph.load_records(GraphRecordReader(_chain_first(first, f)))
+        else:
+            graph.from_json(first + f.read())
+    return graph
+
+
+def _chain_first(first: str, rest: IO[str]) -> Iterator[str]:
+    yield first
+    yield from rest
@@ -0,0 +1,146 @@
+# graph_wal.py
+"""
+Append-Only Write-Ahead Log for Live InvestigationGraph Persistence
+
+Exporting the graph at the end of an investigation rewrites every node and
+edge, and a crash mid-investigation loses everything. With a WAL attached,
+each node and edge creation appends one small JSON line to a per-session log
+instead, so persisting a mutation costs O(delta):
+
+    {"seq": 1, "op": "node", "data": {<serialize_node() document>}}
+    {"seq": 2, "op": "edge", "data": {<serialize_edge() document>}}
+    {"seq": 3, "op": "update", "id": "<node id>", "properties": {...}}
+
+Every compact_every records the log is compacted: the full graph is written
+as a graph_serialization snapshot (atomically, via os.replace) whose header
+records the last sequence number it contains, and the log is truncated.
+Recovery loads the snapshot and replays only log records with a higher
+sequence number, so a crash between the two steps replays nothing twice.
+A torn final line (crash mid-write) is dropped.
+
+Usage:
+    graph.enable_wal("logs/graph_wal/<session>.wal.jsonl")
+    ...
+    graph = recover_graph("logs/graph_wal/<session>.wal.jsonl")  # resume
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, Iterator, Optional
+
+import twitter_config
+from graph_serialization import GraphRecordReader, open_graph_file, write_graph
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_path_for(wal_path: str) -> str:
+    """Snapshot file that goes with a WAL file"""
+    base = wal_path[:-len('.jsonl')] if wal_path.endswith('.jsonl') else wal_path
+    return base + '.snapshot.jsonl'
+
+
+class GraphWriteAheadLog:
+    """
+    Buffered append-only log of graph mutations.
+
+    Records are buffered in memory and written every flush_every records (and
+    on flush/compact/close); the graph calls append() from its create methods.
+    """
+
+    def __init__(self, path: str, graph, sequence: int = 0,
+                 flush_every: Optional[int] = None, compact_every: Optional[int] = None):
+        self.path = path
+        self.snapshot_path = snapshot_path_for(path)
+        self.graph = graph
+        self.sequence = sequence
+        self.flush_every = flush_every or twitter_config.GRAPH_WAL_FLUSH_EVERY
+        self.compact_every = compact_every or twitter_config.GRAPH_WAL_COMPACT_EVERY
+        self._buffer = []
+        self._records_since_compaction = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def append(self, op: str, **fields) -> None:
+        self.sequence += 1
+        record = {"seq": self.sequence, "op": op}
+        record.update(fields)
+        self._buffer.append(json.dumps(record, separators=(',', ':'), default=str))
+        self._records_since_compaction += 1
+
+        if self._records_since_compaction >= self.compact_every:
+            self.compact()
+        elif len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file.write('\n'.join(self._buffer) + '\n')
+            self._buffer.clear()
+        self._file.flush()
+
+    def compact(self) -> None:
+        """Snapshot the whole graph and truncate the log"""
+        self.flush()
+        temp_path = self.snapshot_path + '.tmp'
+        write_graph(self.graph, temp_path, header={"wal_sequence": self.sequence})
+        os.replace(temp_path, self.snapshot_path)
+
+        # Records up to self.sequence are in the snapshot now
+        self._file.close()
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._records_since_compaction = 0
+        logger.info(f"Compacted graph WAL {self.path} at sequence {self.sequence}")
+
+    def close(self, compact: bool = True) -> None:
+        if self._file.closed:
+            return
+        if compact:
+            self.compact()
+        else:
+            self.flush()
+        self._file.close()
+
+
+def iter_wal_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Records of a WAL file in order; a torn final line is skipped"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line for line in f if line.strip()]
+    for position, line in enumerate(lines):
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            if position == len(lines) - 1:
+                logger.warning(f"Dropping torn final record in graph WAL {path}")
+                return
+            raise ValueError(f"Corrupt record {position + 1} in graph WAL {path}") from None
+
+
+def recover_graph(path: str, compact: Optional[bool] = None, attach: bool = True):
+    """
+    Rebuild a graph from a WAL file and its snapshot.
+
+    With attach=True the WAL is re-attached (after an immediate compaction) so
+    the resumed investigation keeps logging to the same file.
+    """
+    from investigation_graph import InvestigationGraph
+
+    graph = InvestigationGraph(compact=compact)
+    sequence = 0
+    snapshot_path = snapshot_path_for(path)
+    if os.path.exists(snapshot_path):
+        with open_graph_file(snapshot_path, 'r') as f:
+            reader = GraphRecordReader(f)
+            graph.load_records(reader)
+            sequence = reader.header.get("wal_sequence", 0)
+
+    sequence = graph.replay_wal(iter_wal_records(path), after_sequence=sequence)
+    if attach:
+        graph.enable_wal(path, sequence=sequence)
+    return graph
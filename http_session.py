@@ -0,0 +1,215 @@
+# http_session.py
+"""
+Pooled HTTP Client for RapidAPI Calls
+
+Provides a single process-wide, thread-safe HTTP client with keep-alive
+connection pooling so repeated calls to twitter-api45.p.rapidapi.com reuse
+TCP+TLS connections instead of paying a fresh handshake per page fetch.
+
+HTTP/2 is used when enabled in twitter_config and the optional httpx[http2]
+extra is installed; otherwise the client falls back to a pooled
+requests.Session. Both backends raise requests exceptions so callers only
+need to handle one error family.
+"""
+
+import threading
+import logging
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+import twitter_config as config
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionStats:
+    """Thread-safe counters for connection reuse vs. new connections"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_new_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.new_connections = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            reused = max(0, self.requests - self.new_connections)
+            return {
+                'requests': self.requests,
+                'new_connections': self.new_connections,
+                'reused_connections': reused,
+                'reuse_rate': reused / self.requests if self.requests else 0.0
+            }
+
+
+def _counting_pool_class(base_cls, stats: ConnectionStats):
+    """Build a urllib3 pool class that counts every new socket it opens"""
+
+    class CountingConnectionPool(base_cls):
+        def _new_conn(self):
+            stats.record_new_connection()
+            return super()._new_conn()
+
+    return CountingConnectionPool
+
+
+class _CountingHTTPAdapter(HTTPAdapter):
+    """requests adapter whose pools report new connections to ConnectionStats"""
+
+    def __init__(self, stats: ConnectionStats, **kwargs):
+        self._stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool_class(HTTPConnectionPool, self._stats),
+            'https': _counting_pool_class(HTTPSConnectionPool, self._stats),
+        }
+
+
+class _HttpxResponse:
+    """Adapts an httpx response to the subset of the requests.Response API we use"""
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.text = response.text
+
+    def json(self):
+        return self._response.json()
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} Error for url: {self._response.url}", response=self
+            )
+
+
+class PooledHTTPClient:
+    """
+    Shared connection-pooled HTTP client
+
+    Wraps either a requests.Session mounted with a pooled adapter or an
+    httpx.Client with HTTP/2, exposing a requests-compatible get().
+    """
+
+    def __init__(self, pool_connections: int = None, pool_maxsize: int = None,
+                 http2: bool = None):
+        self.pool_connections = pool_connections or config.HTTP_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or config.HTTP_POOL_MAXSIZE
+        self.stats = ConnectionStats()
+
+        want_http2 = config.HTTP_ENABLE_HTTP2 if http2 is None else http2
+        self._httpx_client = self._create_httpx_client() if want_http2 else None
+        self.backend = 'httpx-http2' if self._httpx_client is not None else 'requests'
+
+        self._session = None
+        if self._httpx_client is None:
+            self._session = requests.Session()
+            adapter = _CountingHTTPAdapter(
+                self.stats,
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                pool_block=False
+            )
+            self._session.mount('https://', adapter)
+            self._session.mount('http://', adapter)
+
+        logger.info(f"HTTP client initialized: backend={self.backend}, "
+                    f"pool_maxsize={self.pool_maxsize}")
+
+    def _create_httpx_client(self):
+        """Create an HTTP/2 httpx client if httpx and h2 are installed"""
+        try:
+            import httpx
+            import h2  # noqa: F401 - required by httpx for http2=True
+        except ImportError:
+            logger.info("HTTP/2 requested but httpx[http2] not installed - using requests pool")
+            return None
+
+        limits = httpx.Limits(max_connections=self.pool_maxsize * self.pool_connections,
+                              max_keepalive_connections=self.pool_maxsize)
+        return httpx.Client(http2=True, limits=limits)
+
+    def get(self, url: str, headers: Dict[str, str] = None, params: Dict[str, Any] = None,
+            timeout: float = None):
+        """Issue a GET request over a pooled connection"""
+        self.stats.record_request()
+        if self._httpx_client is not None:
+            return self._httpx_get(url, headers, params, timeout)
+        return self._session.get(url, headers=headers, params=params, timeout=timeout)
+
+    def _httpx_get(self, url, headers, params, timeout):
+        import httpx
+        try:
+            # httpcore reports a TCP connect in the request's trace only when the pool opens a new connection
+            response = self._httpx_client.get(url, headers=headers, params=params, timeout=timeout,
+                                              extensions={'trace': self._trace_connections})
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        return _HttpxResponse(response)
+
+    def _trace_connections(self, event_name: str, info: Dict[str, Any]):
+        if event_name in ('connection.connect_tcp.complete', 'connection.connect_unix_socket.complete'):
+            self.stats.record_new_connection()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection reuse statistics"""
+        stats = self.stats.to_dict()
+        stats['backend'] = self.backend
+        stats['pool_maxsize'] = self.pool_maxsize
+        return stats
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+        if self._httpx_client is not None:
+            self._httpx_client.close()
+
+
+# Global client instance
+_global_client: Optional[PooledHTTPClient] = None
+_global_client_lock = threading.Lock()
+
+
+def get_http_client() -> PooledHTTPClient:
+    """Get the process-wide pooled HTTP client"""
+    global _global_client
+    if _global_client is None:
+        with _global_client_lock:
+            if _global_client is None:
+                _global_client = PooledHTTPClient()
+    return _global_client
+
+
+def get_connection_stats() -> Dict[str, Any]:
+    """Get connection reuse statistics for the global client"""
+    return get_http_client().get_stats()
+
+
+def reset_http_client():
+    """Close and discard the global client (e.g. after changing pool settings)"""
+    global _global_client
+    with _global_client_lock:
+        if _global_client is not None:
+            _global_client.close()
+        _global_client = None
@@ -0,0 +1,120 @@
+# investigation_checkpoint.py
+"""
+Per-Round Investigation Checkpoints
+
+After each completed round the engine saves the session state, the
+coordinator's adaptation state and the investigation graph, so a long run
+that crashes or is stopped can continue from its last completed round with
+InvestigationEngine.resume_investigation(session_id) instead of repeating
+paid searches and LLM calls.
+
+Layout, one directory per session under CHECKPOINT_DIR:
+
+    <session_id>/state.json              session + coordinator state, written last
+    <session_id>/graph_round_<n>.jsonl   graph after round n (graph_serialization format)
+
+Both files are replaced atomically and state.json names the graph file it
+belongs to, so a crash mid-save leaves the previous checkpoint intact. The
+directory is deleted once the investigation completes.
+"""
+
+import dataclasses
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import twitter_config
+from graph_serialization import GraphRecordReader, open_graph_file, write_graph
+
+CHECKPOINT_VERSION = 1
+STATE_FILENAME = 'state.json'
+
+
+def _json_default(value: Any) -> Any:
+    """Encode pydantic models, dataclasses and datetimes held in session state"""
+    if hasattr(value, 'model_dump'):
+        return value.model_dump()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def checkpoint_dir(session_id: str, base_dir: Optional[str] = None) -> str:
+    return os.path.join(base_dir or twitter_config.CHECKPOINT_DIR, session_id)
+
+
+def has_checkpoint(session_id: str, base_dir: Optional[str] = None) -> bool:
+    return os.path.exists(os.path.join(checkpoint_dir(session_id, base_dir), STATE_FILENAME))
+
+
+def save_checkpoint(session_id: str, state: Dict[str, Any], graph=None, base_dir: Optional[str] = None) -> str:
+    """Write state (and graph) for the session's latest completed round; returns the state file path"""
+    directory = checkpoint_dir(session_id, base_dir)
+    os.makedirs(directory, exist_ok=True)
+    state_path = os.path.join(directory, STATE_FILENAME)
+
+    previous_graph_file = None
+    if os.path.exists(state_path):
+        with open(state_path, 'r', encoding='utf-8') as f:
+            previous_graph_file = json.load(f).get('graph_file')
+
+    record = {
+        'version': CHECKPOINT_VERSION,
+        'session_id': session_id,
+        'saved_at': datetime.now().isoformat(),
+        'graph_file': None,
+        **state
+    }
+    if graph is not None:
+        record['graph_file'] = f"graph_round_{state.get('session', {}).get('round_count', 0)}.jsonl"
+        graph_path = os.path.join(directory, record['graph_file'])
+        write_graph(graph, graph_path + '.tmp')
+        os.replace(graph_path + '.tmp', graph_path)
+
+    with open(state_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(record, f, default=_json_default, ensure_ascii=False)
+    os.replace(state_path + '.tmp', state_path)
+
+    if previous_graph_file and previous_graph_file != record['graph_file']:
+        try:
+            os.remove(os.path.join(directory, previous_graph_file))
+        except OSError:
+            pass
+    return state_path
+
+
+def delete_checkpoint(session_id: str, base_dir: Optional[str] = None):
+    """Remove a session's checkpoint directory (e.g. once the investigation has completed)"""
+    shutil.rmtree(checkpoint_dir(session_id, base_dir), ignore_errors=True)
+
+
+def load_checkpoint(session_id: str, graph=None, base_dir: Optional[str] = None) -> Tuple[Dict[str, Any], Any]:
+    """
+    Read a session's checkpoint.
+
+    Returns (state, graph). The saved graph is loaded into graph when one is
+    given (keeping existing references to it valid), otherwise into a new
+    InvestigationGraph; graph is None if the checkpoint has no graph.
+    """
+    directory = checkpoint_dir(session_id, base_dir)
+    state_path = os.path.join(directory, STATE_FILENAME)
+    if not os.path.exists(state_path):
+        raise FileNotFoundError(f"No checkpoint for session {session_id} in {directory}")
+
+    with open(state_path, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('version', 0) > CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {state.get('version')}")
+
+    if not state.get('graph_file'):
+        return state, None
+    if graph is None:
+        from investigation_graph import InvestigationGraph
+        graph = InvestigationGraph()
+    with open_graph_file(os.path.join(directory, state['graph_file']), 'r') as f:
+        graph.load_records(GraphRecordReader(f))
+    return state, graph
@@ -7,8 +7,9 @@ processing chain to ensure all operations stay relevant to the investigation obj
 """
 
 from dataclasses import dataclass
-from typing import List, Dict, Any, Callable
+from typing import List, Dict, Any, Callable, Iterable, Optional, Pattern, Tuple
 from datetime import datetime
+import math
 import re
 
 
@@ -28,6 +29,14 @@ class InvestigationContext:
         # Extract goal keywords from analytic question
         if not self.goal_keywords:
             self.goal_keywords = self._extract_goal_keywords()
+
+        # Compiled keyword matcher, rebuilt whenever goal_keywords is reassigned
+        self._keyword_pattern: Optional[Pattern] = None
+        self._pattern_keywords: Tuple[str, ...] = ()
+
+        # Session corpus statistics for IDF weighting (see observe_corpus)
+        self._corpus_documents = 0
+        self._keyword_document_counts: Dict[str, int] = {}
             
     def _extract_goal_keywords(self) -> List[str]:
         """Extract key terms from analytic question for relevance filtering"""
@@ -58,34 +67,75 @@ class InvestigationContext:
         # Return top 5 keywords, prioritizing proper nouns
         return final_keywords[:5] if len(final_keywords) >= 5 else final_keywords
         
+    def _get_keyword_pattern(self) -> Optional[Pattern]:
+        """Single word-boundary regex matching any goal keyword (plus plural/possessive suffix)"""
+        keywords = tuple(k.lower() for k in (self.goal_keywords or []) if k)
+        if keywords != self._pattern_keywords or (keywords and self._keyword_pattern is None):
+            self._pattern_keywords = keywords
+            # Longest first so a keyword never loses to one of its own prefixes
+            alternation = '|'.join(re.escape(k) for k in sorted(set(keywords), key=len, reverse=True))
+            self._keyword_pattern = re.compile(rf"\b({alternation})(?:'s|s|es)?\b") if keywords else None
+        return self._keyword_pattern
+
+    def matched_goal_keywords(self, content: str) -> set:
+        """Distinct goal keywords that appear in content as whole words"""
+        pattern = self._get_keyword_pattern()
+        if not content or pattern is None:
+            return set()
+        return set(pattern.findall(content.lower()))
+
+    def observe_corpus(self, contents: Iterable[str]) -> None:
+        """Add documents to the session corpus used for IDF keyword weights"""
+        for content in contents:
+            if not content:
+                continue
+            self._corpus_documents += 1
+            for keyword in self.matched_goal_keywords(content):
+                self._keyword_document_counts[keyword] = self._keyword_document_counts.get(keyword, 0) + 1
+
+    def keyword_weights(self) -> Dict[str, float]:
+        """Smoothed IDF weight per goal keyword against the observed session corpus"""
+        self._get_keyword_pattern()
+        documents = self._corpus_documents
+        return {
+            keyword: math.log((1 + documents) / (1 + self._keyword_document_counts.get(keyword, 0))) + 1.0
+            for keyword in self._pattern_keywords
+        }
+
     def is_relevant_to_goal(self, content: str) -> bool:
         """Check if content is relevant to investigation goal"""
-        if not content:
-            return False
-            
-        content_lower = content.lower()
-        
-        # Check if any goal keywords appear in content
-        keyword_matches = sum(1 for keyword in self.goal_keywords if keyword in content_lower)
-        
         # Content relevant if contains at least 1 goal keyword
-        return keyword_matches > 0
+        return bool(self.matched_goal_keywords(content))
         
     def calculate_goal_relevance_score(self, content: str) -> float:
         """Calculate 0-1 relevance score based on goal alignment"""
-        if not content:
-            return 0.0
-            
-        content_lower = content.lower()
-        
-        # Count keyword matches
-        matches = sum(1 for keyword in self.goal_keywords if keyword in content_lower)
-        
-        # Calculate score based on keyword density
-        if len(self.goal_keywords) == 0:
-            return 0.5  # Neutral if no keywords
-            
-        return min(matches / len(self.goal_keywords), 1.0)
+        return self.calculate_goal_relevance_scores([content])[0]
+
+    def calculate_goal_relevance_scores(self, contents: List[str], use_idf: bool = False) -> List[float]:
+        """Score a batch of contents in one pass over the compiled keyword pattern
+
+        Plain scores are the fraction of goal keywords present. With use_idf the
+        batch is first added to the session corpus and each keyword counts by
+        its IDF weight, so keywords that appear in nearly every result (usually
+        the search term itself) count for less than rarer goal terms.
+        """
+        if use_idf:
+            self.observe_corpus(contents)
+        pattern = self._get_keyword_pattern()
+        keywords = self._pattern_keywords
+        weights = self.keyword_weights() if use_idf else dict.fromkeys(keywords, 1.0)
+        total_weight = sum(weights[k] for k in set(keywords))
+
+        scores = []
+        for content in contents:
+            if not content:
+                scores.append(0.0)
+            elif pattern is None:
+                scores.append(0.5)  # Neutral if no keywords
+            else:
+                matched = set(pattern.findall(content.lower()))
+                scores.append(min(sum(weights[k] for k in matched) / total_weight, 1.0))
+        return scores
         
     def get_context_summary(self) -> str:
         """Get human-readable context summary"""
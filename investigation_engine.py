@@ -1,10 +1,13 @@
 # investigation_engine.py
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
+import os
 import time
 import math
+import shutil
+import asyncio
 
 # Lazy import of streamlit for complete CLI isolation
 # Streamlit will only be imported when actually needed by UI functions
@@ -103,7 +106,14 @@ from cross_reference_analyzer import CrossReferenceAnalyzer
 from temporal_timeline_analyzer import TemporalTimelineAnalyzer
 from rejection_feedback import RejectionFeedback, analyze_rejections
 from investigation_context import InvestigationContext
+from finding_dedup import FindingDeduplicator
+from finding_prefilter import FindingPrefilter
 from realtime_insight_synthesizer import RealTimeInsightSynthesizer
+from utils.stage_timer import get_stage_timer
+from graph_serialization import write_graph
+from investigation_checkpoint import delete_checkpoint, load_checkpoint, save_checkpoint
+from investigation_store import get_investigation_store
+import twitter_config
 
 # Import bridge for architectural integration (will only be used in graph mode)
 try:
@@ -147,6 +157,20 @@ class InvestigationConfig:
     enforce_endpoint_diversity: bool = False
     max_endpoint_repeats: int = 5
     diversity_threshold: float = 0.3
+    
+    # Concurrent search execution
+    concurrent_searches: bool = False  # Run a round's independent searches in parallel
+    max_concurrent_searches: int = 5
+    
+    # Cross-session knowledge reuse (see investigation_store.py)
+    reuse_prior_investigations: bool = False  # Seed the graph from past investigations of a similar question
+    
+    # Goal-relevance filtering (see InvestigationContext.calculate_goal_relevance_scores)
+    idf_goal_relevance: bool = False  # Weight goal keywords by IDF over the session's results
+    
+    # Finding evaluation (see LLMFindingEvaluator.evaluate_batches)
+    whole_round_evaluation: bool = False  # Evaluate all of a round's results in as few LLM calls as possible
+    local_prefilter: bool = False  # Opt-in: settle clear accepts/rejects locally; only uncertain results go to the LLM
 
 @dataclass
 class SearchAttempt:
@@ -244,6 +268,12 @@ class InvestigationSession:
         # Real-time insight tracking
         self.insights_generated: List[Dict[str, Any]] = []
         
+        # Past investigations this one was seeded from (InvestigationConfig.reuse_prior_investigations)
+        self.prior_investigations: List[str] = []
+        
+        # Local pre-filter tier counts (finding_prefilter.FindingPrefilter.get_metrics)
+        self.prefilter_metrics: Dict[str, Any] = {}
+        
         # Status
         self.is_active = True
         self.completion_reason: Optional[str] = None
@@ -316,6 +346,65 @@ class InvestigationSession:
         
         # Track satisfaction history
         self.satisfaction_history.append(self.satisfaction_metrics.overall_satisfaction())
+    
+    def to_checkpoint(self) -> Dict[str, Any]:
+        """Round-boundary state for investigation_checkpoint (context and end-of-run analyses are rebuilt)"""
+        return {
+            'original_query': self.original_query,
+            'config': asdict(self.config),
+            'elapsed_seconds': (datetime.now() - self.start_time).total_seconds(),
+            'session_id': getattr(self, 'session_id', None),
+            'search_count': self.search_count,
+            'round_count': self.round_count,
+            'total_results_found': self.total_results_found,
+            'search_history': [asdict(attempt) for attempt in self.search_history],
+            'rounds': [
+                {**asdict(round_obj), 'searches': [attempt.search_id for attempt in round_obj.searches]}
+                for round_obj in self.rounds
+            ],
+            'accumulated_findings': [asdict(finding) for finding in self.accumulated_findings],
+            'knowledge_graph': self.knowledge_graph,
+            'dead_ends': self.dead_ends,
+            'promising_leads': self.promising_leads,
+            'effective_search_patterns': self.effective_search_patterns,
+            'satisfaction_metrics': asdict(self.satisfaction_metrics),
+            'satisfaction_history': self.satisfaction_history,
+            'rejection_feedback_history': [asdict(feedback) for feedback in self.rejection_feedback_history],
+            'insights_generated': self.insights_generated,
+            'prior_investigations': self.prior_investigations
+        }
+    
+    @classmethod
+    def from_checkpoint(cls, data: Dict[str, Any], config: InvestigationConfig = None) -> 'InvestigationSession':
+        """Rebuild a session saved by to_checkpoint(); config overrides the saved one (e.g. to raise limits)"""
+        session = cls(data['original_query'], config or InvestigationConfig(**data['config']))
+        # Time limits count active investigation time only
+        session.start_time = datetime.now() - timedelta(seconds=data.get('elapsed_seconds', 0))
+        if data.get('session_id'):
+            session.session_id = data['session_id']
+        
+        session.search_count = data['search_count']
+        session.round_count = data['round_count']
+        session.total_results_found = data['total_results_found']
+        session.search_history = [SearchAttempt(**attempt) for attempt in data['search_history']]
+        attempts_by_id = {attempt.search_id: attempt for attempt in session.search_history}
+        for round_data in data['rounds']:
+            search_ids = round_data.pop('searches')
+            round_obj = InvestigationRound(**round_data)
+            round_obj.searches = [attempts_by_id[search_id] for search_id in search_ids if search_id in attempts_by_id]
+            session.rounds.append(round_obj)
+        session.accumulated_findings = [Finding(**finding) for finding in data['accumulated_findings']]
+        session.knowledge_graph = data.get('knowledge_graph', {})
+        session.dead_ends = data.get('dead_ends', [])
+        session.promising_leads = data.get('promising_leads', [])
+        session.effective_search_patterns = data.get('effective_search_patterns', {})
+        session.satisfaction_metrics = SatisfactionMetrics(**data.get('satisfaction_metrics', {}))
+        session.satisfaction_history = data.get('satisfaction_history', [])
+        session.rejection_feedback_history = [RejectionFeedback(**feedback)
+                                              for feedback in data.get('rejection_feedback_history', [])]
+        session.insights_generated = data.get('insights_generated', [])
+        session.prior_investigations = data.get('prior_investigations', [])
+        return session
 
 class InvestigationEngine:
     """Core engine for conducting iterative investigations"""
@@ -462,13 +551,22 @@ class InvestigationEngine:
                 message += " - 🟢 High"
             self.progress_container.markdown(message)
         
-    def conduct_investigation(self, query: str, config: InvestigationConfig = None) -> 'InvestigationSession':
-        """Conduct a complete iterative investigation with context-aware processing"""
+    def conduct_investigation(self, query: str, config: InvestigationConfig = None,
+                              resumed_session: 'InvestigationSession' = None) -> 'InvestigationSession':
+        """Conduct a complete iterative investigation with context-aware processing
         
-        if config is None:
-            config = InvestigationConfig()
-            
-        session = InvestigationSession(query, config)
+        resumed_session continues a checkpointed session (see resume_investigation) after its last round.
+        """
+        
+        if resumed_session is not None:
+            session = resumed_session
+            config = session.config
+        else:
+            if config is None:
+                config = InvestigationConfig()
+            session = InvestigationSession(query, config)
+        stage_timer = get_stage_timer()
+        stage_timer.start_round(0)
         
         # Initialize LLM call tracking and periodic summaries
         try:
@@ -489,6 +587,17 @@ class InvestigationEngine:
         )
         session.context = investigation_context
         
+        # Repeated tweets share one evaluation verdict and one DataPoint per investigation
+        self.finding_dedup = FindingDeduplicator() if twitter_config.FINDING_DEDUP_ENABLED else None
+        self.finding_datapoints = {}  # finding_key -> DataPoint node (None outside graph mode)
+        if hasattr(getattr(self, 'finding_evaluator', None), 'clear_verdicts'):
+            self.finding_evaluator.clear_verdicts()
+            # Cheap local tier settles clear cases before the LLM evaluator sees them
+            self.finding_evaluator.prefilter = FindingPrefilter(investigation_context) if config.local_prefilter else None
+        if resumed_session is not None:
+            self._restore_finding_state(getattr(self, '_resumed_finding_state', None))
+            self._resumed_finding_state = None
+        
         # Pass context to LLM coordinator
         if hasattr(self.llm_coordinator, 'set_context'):
             self.llm_coordinator.set_context(investigation_context)
@@ -517,19 +626,35 @@ class InvestigationEngine:
                 self.integration_bridge = None
                 self.logger.warning("Bridge not available - architectural integration disabled")
         
-        # Create AnalyticQuestion root node if in graph mode
-        if self.graph_mode and hasattr(self.llm_coordinator, 'graph'):
+        # Create AnalyticQuestion root node if in graph mode (a resumed graph already has it)
+        if resumed_session is not None:
+            graph = getattr(self.llm_coordinator, 'graph', None)
+            if graph is not None and graph.analytic_question is not None:
+                session.root_node_id = graph.analytic_question.id
+        elif self.graph_mode and hasattr(self.llm_coordinator, 'graph'):
             root_node = self.llm_coordinator.graph.create_analytic_question_node(
                 text=query,
                 is_root=True,
                 investigation_goal=query
             )
             session.root_node_id = root_node.id  # Track for connecting questions
+            
+            if config.reuse_prior_investigations:
+                self._seed_from_prior_investigations(session)
         
-        # Start logging session
-        session_id = investigation_logger.start_session(query, config)
+        # Start logging session (or pick the resumed one back up)
+        if resumed_session is not None and getattr(session, 'session_id', None):
+            session_id = investigation_logger.resume_session(session.session_id, query)
+        else:
+            session_id = investigation_logger.start_session(query, config)
         session.session_id = session_id  # Store session ID on session object
         
+        # Persist graph mutations as they happen so a crashed session can be recovered (graph_wal.recover_graph)
+        if twitter_config.GRAPH_WAL_ENABLED and self.graph_mode and hasattr(self.llm_coordinator, 'graph'):
+            wal_path = os.path.join(twitter_config.GRAPH_WAL_DIR, f"{session_id}.wal.jsonl")
+            self.llm_coordinator.graph.enable_wal(wal_path)
+            print(f"[GRAPH] Write-ahead log: {wal_path}")
+        
         # Create containers for real-time updates only if in Streamlit context
         # Detect CLI mode by checking command line arguments or environment
         import sys
@@ -558,7 +683,10 @@ class InvestigationEngine:
                 self.send_progress_update("🧠 Generating next strategy...", "info")
                 
                 # Generate next strategy
-                strategy = self._generate_strategy(session)
+                stage_timer.start_round(session.round_count + 1)
+                with stage_timer.stage('strategy_generation'):
+                    strategy = self._generate_strategy(session)
+                strategy['searches'] = self._skip_prior_searches(strategy['searches'])
                 current_round = session.start_new_round(strategy['description'])
                 
                 # Send strategy update
@@ -583,6 +711,10 @@ class InvestigationEngine:
                 
                 # Execute searches for this round
                 round_results = []
+                with stage_timer.stage('search_execution'):
+                    prefetched_attempts = self._prefetch_round_searches(
+                        strategy['searches'], session, current_round.round_number
+                    )
                 for i, search_plan in enumerate(strategy['searches']):
                     search_id = session.search_count + 1
                     
@@ -598,8 +730,11 @@ class InvestigationEngine:
                         search_placeholder = get_streamlit_empty()
                         self._display_search_attempt(search_placeholder, search_plan, search_id)
                     
-                    # Execute the search
-                    attempt = self._execute_search(search_plan, search_id, current_round.round_number)
+                    # Execute the search (or pick up the result already fetched concurrently)
+                    attempt = prefetched_attempts.get(i)
+                    if attempt is None:
+                        with stage_timer.stage('search_execution'):
+                            attempt = self._execute_search(search_plan, search_id, current_round.round_number)
                     session.add_search_attempt(attempt)
                     round_results.append(attempt)
                     
@@ -672,18 +807,26 @@ class InvestigationEngine:
                         self._display_investigation_progress(session)
                 else:
                     self._display_investigation_progress(session)
+                
+                # Checkpoint the completed round so the investigation can be resumed from here
+                if twitter_config.CHECKPOINT_ENABLED:
+                    with stage_timer.stage('checkpoint'):
+                        self._save_checkpoint(session)
                     
             # Investigation complete
             session.is_active = False
             session.completion_reason = session.should_continue()[1]
             
             # === NEW: Generate final summary from all insights ===
-            self._generate_final_summary(session)
+            stage_timer.start_round(0)
+            with stage_timer.stage('final_summary'):
+                self._generate_final_summary(session)
             
             # Send completion update
             final_satisfaction = session.satisfaction_metrics.overall_satisfaction()
             self.send_progress_update(f"✅ Investigation complete! Final satisfaction: {final_satisfaction:.1%}", "success")
             self.send_progress_update(f"📈 Total searches: {session.search_count}, Total results: {session.total_results_found}", "info")
+            self._report_prefilter_metrics(session)
             
             # Task 1.1: Perform cross-reference analysis on accumulated findings
             if session.accumulated_findings and len(session.accumulated_findings) >= 2:
@@ -697,10 +840,11 @@ class InvestigationEngine:
                         llm_client = self.llm_coordinator.llm_client
                         
                     analyzer = CrossReferenceAnalyzer(llm_client)
-                    session.cross_reference_analysis = analyzer.analyze_findings(
-                        session.accumulated_findings,
-                        session.original_query
-                    )
+                    with stage_timer.stage('cross_reference'):
+                        session.cross_reference_analysis = analyzer.analyze_findings(
+                            session.accumulated_findings,
+                            session.original_query
+                        )
                     
                     # Report cross-reference results
                     analysis = session.cross_reference_analysis
@@ -724,10 +868,11 @@ class InvestigationEngine:
                         llm_client = self.llm_coordinator.llm_client
                         
                     timeline_analyzer = TemporalTimelineAnalyzer(llm_client)
-                    session.temporal_timeline = timeline_analyzer.analyze_timeline(
-                        session.accumulated_findings,
-                        session.original_query
-                    )
+                    with stage_timer.stage('timeline'):
+                        session.temporal_timeline = timeline_analyzer.analyze_timeline(
+                            session.accumulated_findings,
+                            session.original_query
+                        )
                     
                     # Report temporal timeline results
                     timeline = session.temporal_timeline
@@ -747,7 +892,12 @@ class InvestigationEngine:
                 summary_logger.print_final_summary()
             
             # Automatically export graph after every investigation
-            self._export_investigation_graph(session)
+            with stage_timer.stage('graph_export'):
+                self._export_investigation_graph(session)
+            
+            # A completed investigation has nothing left to resume
+            if twitter_config.CHECKPOINT_ENABLED and getattr(session, 'session_id', None):
+                delete_checkpoint(session.session_id)
             
             return session
             
@@ -803,6 +953,101 @@ class InvestigationEngine:
             safe_streamlit("error", f"Investigation error: {e}")
             return session
     
+    def _seed_from_prior_investigations(self, session: InvestigationSession):
+        """Import DataPoints, Insights and failed searches from past investigations of a similar question"""
+        try:
+            store = get_investigation_store()
+            store.ingest_paths()  # Picks up newly exported graphs; unchanged files are skipped
+            similar = store.find_similar_investigations(session.original_query,
+                                                        limit=twitter_config.PRIOR_INVESTIGATION_MAX_MATCHES)
+        except Exception as e:
+            print(f"Warning: Could not search prior investigations: {e}")
+            return
+        
+        graph = self.llm_coordinator.graph
+        for investigation in similar:
+            knowledge = store.get_prior_knowledge(investigation['investigation_id'])
+            imported = graph.import_prior_knowledge(knowledge)
+            self.finding_evaluator.add_known_findings(
+                (dp['properties'].get('content', ''), dp['properties'].get('relevance_score', 0.8))
+                for dp in knowledge['datapoints']
+            )
+            session.prior_investigations.append(investigation['investigation_id'])
+            self.send_progress_update(
+                f"📚 Reusing prior investigation ({investigation['similarity']:.0%} similar): "
+                f"{imported['insights']} insights, {imported['datapoints']} data points", "info")
+    
+    def _skip_prior_searches(self, searches: List[Dict]) -> List[Dict]:
+        """Drop planned searches an imported past investigation already ran (unless that drops them all)"""
+        graph = getattr(self.llm_coordinator, 'graph', None)
+        if not self.graph_mode or graph is None:
+            return searches
+        remaining = [s for s in searches if not graph.is_prior_search(s.get('endpoint'), s.get('params') or {})]
+        if not remaining:
+            return searches
+        if len(remaining) < len(searches):
+            print(f"Skipping {len(searches) - len(remaining)} search(es) already run by a prior investigation")
+        return remaining
+    
+    def _save_checkpoint(self, session: InvestigationSession):
+        """Persist session, coordinator and graph state after a completed round (never fails the round)"""
+        try:
+            state = {'session': session.to_checkpoint()}
+            if hasattr(self.llm_coordinator, 'get_checkpoint_state'):
+                state['coordinator'] = self.llm_coordinator.get_checkpoint_state()
+            graph = self.llm_coordinator.graph if self.graph_mode and hasattr(self.llm_coordinator, 'graph') else None
+            state['findings'] = self._finding_checkpoint_state(graph)
+            save_checkpoint(session.session_id, state, graph)
+        except Exception as e:
+            print(f"Warning: Could not checkpoint round {session.round_count}: {e}")
+    
+    def _finding_checkpoint_state(self, graph) -> Dict[str, Any]:
+        """Dedup keys, evaluation verdicts and finding_key -> DataPoint links of this investigation"""
+        state = {}
+        if getattr(self, 'finding_dedup', None) is not None:
+            state['dedup'] = self.finding_dedup.get_checkpoint_state()
+        evaluator = getattr(self, 'finding_evaluator', None)
+        if callable(getattr(type(evaluator), 'get_checkpoint_state', None)):
+            state['evaluator'] = evaluator.get_checkpoint_state()
+        state['datapoints'] = {
+            key: graph.serialized_node_id(dp) if graph is not None and dp is not None else None
+            for key, dp in (getattr(self, 'finding_datapoints', None) or {}).items()
+        }
+        return state
+    
+    def _restore_finding_state(self, state: Optional[Dict[str, Any]]):
+        """Reinstate _finding_checkpoint_state() so a resumed run skips findings it already processed"""
+        if not state:
+            return
+        if state.get('dedup') and getattr(self, 'finding_dedup', None) is not None:
+            self.finding_dedup.restore_checkpoint_state(state['dedup'])
+        evaluator = getattr(self, 'finding_evaluator', None)
+        if state.get('evaluator') and callable(getattr(type(evaluator), 'restore_checkpoint_state', None)):
+            evaluator.restore_checkpoint_state(state['evaluator'])
+        graph = self.llm_coordinator.graph if self.graph_mode and hasattr(self.llm_coordinator, 'graph') else None
+        for key, node_id in state.get('datapoints', {}).items():
+            self.finding_datapoints[key] = graph.nodes.get(node_id) if graph is not None and node_id else None
+    
+    def resume_investigation(self, session_id: str, config: InvestigationConfig = None) -> 'InvestigationSession':
+        """Continue a checkpointed investigation after its last completed round
+        
+        Restores the session, the coordinator's search history and endpoint usage, the graph, and
+        the finding dedup keys and evaluation verdicts, so searches and findings from completed
+        rounds are not repeated. config replaces the saved configuration.
+        """
+        graph = self.llm_coordinator.graph if self.graph_mode and hasattr(self.llm_coordinator, 'graph') else None
+        state, graph = load_checkpoint(session_id, graph=graph)
+        
+        session = InvestigationSession.from_checkpoint(state['session'], config)
+        session.session_id = session_id
+        if state.get('coordinator') and hasattr(self.llm_coordinator, 'restore_checkpoint_state'):
+            self.llm_coordinator.restore_checkpoint_state(state['coordinator'])
+        self._resumed_finding_state = state.get('findings')  # Applied once conduct_investigation resets them
+        
+        print(f"Resuming investigation {session_id} after round {session.round_count} "
+              f"({session.search_count} searches already done)")
+        return self.conduct_investigation(session.original_query, resumed_session=session)
+    
     def _export_investigation_graph(self, session: InvestigationSession):
         """Automatically export investigation graph as JSON and HTML after every investigation"""
         if not self.graph_mode or not hasattr(self.llm_coordinator, 'graph'):
@@ -811,12 +1056,20 @@ class InvestigationEngine:
         try:
             graph = self.llm_coordinator.graph
             session_id = session.session_id if hasattr(session, 'session_id') else 'unknown'
+            graph.close_wal()  # Final snapshot, before the slower exports below
             
-            # 1. Export JSON
+            # 1. Export JSON, which current_investigation_graph.json readers expect
             json_filename = f"investigation_graph_{session_id}.json"
-            graph_json = graph.to_json()
             with open(json_filename, 'w', encoding='utf-8') as f:
-                f.write(graph_json)
+                f.write(graph.to_json())
+            exported = [json_filename]
+            
+            # ...plus streamed JSON Lines when configured (see graph_serialization.py)
+            export_format = twitter_config.GRAPH_EXPORT_FORMAT
+            if export_format != 'json':
+                stream_filename = f"investigation_graph_{session_id}.{export_format}"
+                write_graph(graph, stream_filename)
+                exported.append(stream_filename)
             
             # 2. Export HTML Visualization
             visualizer = InvestigationGraphVisualizer()
@@ -873,11 +1126,10 @@ class InvestigationEngine:
             html_filename = f"investigation_graph_{session_id}.html"  
             visualizer.save_visualization(html_filename)
             
-            # Also save as current_investigation_graph.json for easy access
-            with open("current_investigation_graph.json", 'w', encoding='utf-8') as f:
-                f.write(graph_json)
+            # Also save as current_investigation_graph.json for easy access (copy, don't re-serialize)
+            shutil.copyfile(json_filename, "current_investigation_graph.json")
             
-            print(f"Graph exported: {json_filename} and {html_filename}")
+            print(f"Graph exported: {', '.join(exported)} and {html_filename}")
             
         except Exception as e:
             print(f"Warning: Failed to export investigation graph: {e}")
@@ -1289,16 +1541,7 @@ Design 2-4 strategic searches for this round that build on previous learnings.
         """Execute a single search and return attempt record"""
         
         start_time = time.time()
-        attempt = SearchAttempt(
-            search_id=search_id,
-            round_number=round_number,
-            endpoint=search_plan['endpoint'],
-            params=search_plan['params'],
-            query_description=search_plan.get('reason', 'Search'),
-            results_count=0,
-            effectiveness_score=0.0,
-            execution_time=0.0
-        )
+        attempt = self._new_search_attempt(search_plan, search_id, round_number)
         
         try:
             # Execute the API call
@@ -1307,49 +1550,136 @@ Design 2-4 strategic searches for this round that build on previous learnings.
                 [],  # No dependencies for now
                 self.rapidapi_key
             )
-            
+            self._record_search_result(attempt, result, start_time)
+        except Exception as e:
+            attempt.error = str(e)
             attempt.execution_time = time.time() - start_time
+            attempt.effectiveness_score = 0.0
             
-            if 'error' in result:
-                attempt.error = result['error']
-                attempt.effectiveness_score = 0.0
-            else:
-                # Count results - check all possible keys where data might be
-                data = result.get('data', {})
-                
-                # List of all possible keys where results might be stored
-                possible_keys = [
-                    'timeline', 'followers', 'following', 'users', 
-                    'trends', 'retweets', 'affilates', 'members', 
-                    'sharings', 'results', 'data'
-                ]
-                
-                # Try to find results in any of these keys
-                for key in possible_keys:
-                    if isinstance(data, dict) and key in data and isinstance(data[key], list):
-                        attempt.results_count = len(data[key])
-                        break
-                else:
-                    # Check if data itself is a list
-                    if isinstance(data, list):
-                        attempt.results_count = len(data)
-                    # Check if it's a single item (non-empty dict)
-                    elif isinstance(data, dict) and data:
-                        attempt.results_count = 1
-                        
-                # Extract results for evaluation and store for batch processing
-                raw_results = self._extract_results_for_evaluation(result)
-                attempt._raw_results = raw_results  # Store for batch evaluation
-                
-                # For now, use simple scoring - will be overridden by batch evaluation
-                attempt.effectiveness_score = self._calculate_simple_effectiveness_score(attempt)
-                
+        return attempt
+    
+    async def _execute_search_async(self, search_plan: Dict, search_id: int, round_number: int) -> SearchAttempt:
+        """Async twin of _execute_search using api_client.execute_api_step_async"""
+        
+        start_time = time.time()
+        attempt = self._new_search_attempt(search_plan, search_id, round_number)
+        
+        try:
+            result = await api_client.execute_api_step_async(search_plan, [], self.rapidapi_key)
+            self._record_search_result(attempt, result, start_time)
         except Exception as e:
             attempt.error = str(e)
             attempt.execution_time = time.time() - start_time
             attempt.effectiveness_score = 0.0
             
         return attempt
+    
+    def _execute_searches_concurrently(self, search_plans: List[Dict], search_ids: List[int],
+                                       round_number: int, max_concurrency: int) -> List[SearchAttempt]:
+        """
+        Execute independent searches of a round concurrently.
+        
+        At most max_concurrency searches are in flight at once. Attempts are returned
+        in the same order as search_plans so downstream logging stays deterministic.
+        """
+        
+        async def run_all():
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+            
+            async def run_one(search_plan: Dict, search_id: int) -> SearchAttempt:
+                async with semaphore:
+                    return await self._execute_search_async(search_plan, search_id, round_number)
+            
+            return await asyncio.gather(*(run_one(plan, sid) for plan, sid in zip(search_plans, search_ids)))
+        
+        return list(asyncio.run(run_all()))
+    
+    def _prefetch_round_searches(self, searches: List[Dict], session: InvestigationSession,
+                                 round_number: int) -> Dict[int, SearchAttempt]:
+        """
+        Run a round's independent searches concurrently ahead of the display loop.
+        
+        Returns {search index: attempt}. Searches with step dependencies, searches beyond
+        the remaining search budget, and calls made from inside a running event loop are
+        left out and executed sequentially as before.
+        """
+        config = session.config
+        if not config.concurrent_searches or len(searches) < 2:
+            return {}
+        
+        try:
+            asyncio.get_running_loop()
+            return {}  # Can't nest asyncio.run(); fall back to sequential execution
+        except RuntimeError:
+            pass
+        
+        remaining = max(0, config.max_searches - session.search_count)
+        independent = [i for i, plan in enumerate(searches[:remaining])
+                       if not api_client.has_step_dependencies(plan)]
+        if len(independent) < 2:
+            return {}
+        
+        # Search IDs are assigned in round order, matching the sequential loop
+        attempts = self._execute_searches_concurrently(
+            [searches[i] for i in independent],
+            [session.search_count + 1 + i for i in independent],
+            round_number, config.max_concurrent_searches
+        )
+        return dict(zip(independent, attempts))
+    
+    def _new_search_attempt(self, search_plan: Dict, search_id: int, round_number: int) -> SearchAttempt:
+        return SearchAttempt(
+            search_id=search_id,
+            round_number=round_number,
+            endpoint=search_plan['endpoint'],
+            params=search_plan['params'],
+            query_description=search_plan.get('reason', 'Search'),
+            results_count=0,
+            effectiveness_score=0.0,
+            execution_time=0.0
+        )
+    
+    def _record_search_result(self, attempt: SearchAttempt, result: Dict, start_time: float):
+        """Fill in an attempt from an execute_api_step result"""
+        
+        attempt.execution_time = time.time() - start_time
+        
+        if 'error' in result:
+            attempt.error = result['error']
+            attempt.effectiveness_score = 0.0
+        else:
+            # Count results - check all possible keys where data might be
+            data = result.get('data', {})
+            
+            # List of all possible keys where results might be stored
+            possible_keys = [
+                'timeline', 'followers', 'following', 'users', 
+                'trends', 'retweets', 'affilates', 'members', 
+                'sharings', 'results', 'data'
+            ]
+            
+            # Try to find results in any of these keys
+            for key in possible_keys:
+                if isinstance(data, dict) and key in data and isinstance(data[key], list):
+                    attempt.results_count = len(data[key])
+                    break
+            else:
+                # Check if data itself is a list
+                if isinstance(data, list):
+                    attempt.results_count = len(data)
+                # Check if it's a single item (non-empty dict)
+                elif isinstance(data, dict) and data:
+                    attempt.results_count = 1
+                    
+            # Extract results for evaluation and store for batch processing
+            raw_results = self._extract_results_for_evaluation(result)
+            finding_dedup = getattr(self, 'finding_dedup', None)
+            if finding_dedup is not None:
+                raw_results = finding_dedup.annotate(raw_results)
+            attempt._raw_results = raw_results  # Store for batch evaluation
+            
+            # For now, use simple scoring - will be overridden by batch evaluation
+            attempt.effectiveness_score = self._calculate_simple_effectiveness_score(attempt)
         
     def _calculate_effectiveness_score(self, attempt: SearchAttempt, raw_results: List[Dict] = None) -> float:
         """Calculate 0-10 effectiveness score for a search attempt using LLM evaluation"""
@@ -1486,6 +1816,69 @@ Design 2-4 strategic searches for this round that build on previous learnings.
         
         return results
     
+    def _report_prefilter_metrics(self, session: InvestigationSession):
+        """Copy the local pre-filter's counts onto the session and report its savings"""
+        prefilter = getattr(getattr(self, 'finding_evaluator', None), 'prefilter', None)
+        if prefilter is None or not prefilter.metrics['triaged']:
+            return
+        metrics = session.prefilter_metrics = prefilter.get_metrics()
+        agreement = (f", {metrics['agreement_rate']:.0%} agreement with the LLM on {metrics['audited']} audited"
+                     if metrics['agreement_rate'] is not None else "")
+        self.send_progress_update(
+            f"🧮 Pre-filter settled {metrics['accepted'] + metrics['rejected']}/{metrics['triaged']} results locally "
+            f"(~{metrics['estimated_tokens_saved']} tokens saved{agreement})",
+            "info"
+        )
+    
+    def _record_synthesized_insights(self, session: InvestigationSession, insights_created: Optional[List[str]]):
+        """Notify about and record insights returned by the real-time synthesizer"""
+        if not insights_created:
+            return
+        self.send_progress_update(
+            f"🧠 Synthesized {len(insights_created)} insights from recent findings",
+            "info"
+        )
+        for insight_id in insights_created:
+            insight_node = self.llm_coordinator.graph.nodes.get(insight_id)
+            if insight_node:
+                session.insights_generated.append({
+                    "id": insight_id,
+                    "content": insight_node.properties.get("content", ""),
+                    "confidence": insight_node.properties.get("confidence", 0.0),
+                    "round_number": session.current_round_number if hasattr(session, 'current_round_number') else session.round_count
+                })
+    
+    def _evaluate_round_findings_concurrently(self, results: List[SearchAttempt], investigation_goal: str,
+                                             whole_round: bool = False) -> Dict[int, list]:
+        """Batch-evaluate each attempt's raw results in one concurrent fan-out, keyed by id(attempt)
+        
+        With whole_round the evaluator packs every attempt's results into as few
+        calls as its model's context allows instead of chunking per attempt.
+        """
+        attempts = [a for a in results if a.results_count > 0 and hasattr(a, '_raw_results')]
+        evaluator_client = getattr(self.finding_evaluator, 'llm_client', None)
+        if not attempts or not callable(getattr(type(self.finding_evaluator), 'evaluate_batches', None)):
+            return {}
+        if not whole_round and (len(attempts) < 2 or not callable(getattr(type(evaluator_client), 'completion_many', None))):
+            return {}
+        
+        with get_stage_timer().stage('finding_evaluation'):
+            batches = self.finding_evaluator.evaluate_batches(
+                [self._results_to_evaluate(a, whole_round) for a in attempts],
+                investigation_goal,
+                whole_round=whole_round
+            )
+        return {id(a): assessments for a, assessments in zip(attempts, batches)}
+    
+    @staticmethod
+    def _results_to_evaluate(attempt: SearchAttempt, whole_round: bool = False) -> list:
+        """An attempt's results to evaluate: all of them for whole-round evaluation, else the top 20
+        
+        Whole-round chunks are sized by the evaluator (token budget and result
+        cap per call), so the full list never produces an oversized request.
+        """
+        return attempt._raw_results if whole_round else attempt._raw_results[:20]
+    
     def _analyze_round_results_with_llm(self, session: InvestigationSession, current_round: InvestigationRound, results: List[SearchAttempt]):
         """Analyze round results using LLM batch evaluation - MORE EFFICIENT"""
         
@@ -1495,11 +1888,18 @@ Design 2-4 strategic searches for this round that build on previous learnings.
         # === NEW SECTION: Use instance's finding evaluator ===
         # The finding evaluator is already initialized in __init__ with the correct LLM client
         round_datapoints = []  # Track DataPoints created this round
+        synthesis_submitted = 0  # round_datapoints already handed to the insight synthesizer
         
         # Collect all results for batch evaluation
         all_results = []
         search_contexts = []
         
+        # Evaluate every search's results concurrently up front when the client supports fan-out
+        precomputed_assessments = {}
+        if self.graph_mode and hasattr(self.llm_coordinator, 'graph'):
+            precomputed_assessments = self._evaluate_round_findings_concurrently(
+                results, session.original_query, whole_round=session.config.whole_round_evaluation)
+        
         for attempt in results:
             # === NEW: Find existing search node for this attempt ===
             search_node = None
@@ -1519,11 +1919,14 @@ Design 2-4 strategic searches for this round that build on previous learnings.
                 # === NEW: Batch evaluate findings and create DataPoints ===
                 if attempt.results_count > 0 and hasattr(attempt, '_raw_results'):
                     # Use batch evaluation for efficiency
-                    results_to_eval = attempt._raw_results[:20]  # Limit to top 20
-                    assessments = self.finding_evaluator.evaluate_batch(
-                        results_to_eval,
-                        session.original_query
-                    )
+                    results_to_eval = self._results_to_evaluate(attempt, session.config.whole_round_evaluation)
+                    assessments = precomputed_assessments.get(id(attempt))
+                    if assessments is None:
+                        with get_stage_timer().stage('finding_evaluation'):
+                            assessments = self.finding_evaluator.evaluate_batch(
+                                results_to_eval,
+                                session.original_query
+                            )
                     
                     # Track rejections for feedback
                     rejection_feedback = analyze_rejections(
@@ -1547,79 +1950,85 @@ Design 2-4 strategic searches for this round that build on previous learnings.
                             "warning"
                         )
                     
+                    # Additional goal-relevance filter using context, scored for the whole batch at once
+                    significant = [(raw_result, assessment) for raw_result, assessment in zip(results_to_eval, assessments)
+                                   if assessment.is_significant]
+                    significant_contents = [raw_result.get('text', '') for raw_result, _ in significant]
+                    if session.context:
+                        goal_scores = session.context.calculate_goal_relevance_scores(
+                            significant_contents, use_idf=session.config.idf_goal_relevance)
+                    else:
+                        goal_scores = [0.5] * len(significant)
+                    
                     # Create DataPoints for significant findings
-                    for raw_result, assessment in zip(results_to_eval, assessments):
-                        if assessment.is_significant:
-                            # Additional goal-relevance filter using context
-                            content = raw_result.get('text', '')
-                            goal_relevance = session.context.calculate_goal_relevance_score(content) if session.context else 0.5
-                            
-                            # Only create DataPoint if relevant to investigation goal
-                            if goal_relevance > 0.3:  # Context-aware threshold
-                                # Try to create DataPoint node if in graph mode
-                                if self.graph_mode and hasattr(self.llm_coordinator, 'graph'):
-                                    try:
-                                        dp = self.llm_coordinator.graph.create_datapoint_node(
-                                            content=content,
-                                            source=attempt.endpoint,
-                                            timestamp=datetime.now().isoformat(),
-                                            entities=assessment.entities,
-                                            follow_up_needed=assessment.suggested_followup,
-                                            relevance_score=assessment.relevance_score,
-                                            goal_relevance_score=goal_relevance
-                                        )
-                                        round_datapoints.append(dp)
-                                        
-                                        # Connect search to DataPoint if search_node exists
-                                        if 'search_node' in locals():
-                                            self.llm_coordinator.graph.create_edge(
-                                                search_node, dp, "DISCOVERED",
-                                                properties={'relevance': assessment.relevance_score}
-                                            )
-                                    except Exception as e:
-                                        # self.logger.debug(f"Could not create graph node: {e}")
-                                        pass  # Silently continue
-                                
-                                # ALWAYS add to accumulated findings (regardless of graph mode)
-                                finding = Finding(
-                                    content=content,
-                                    source=attempt.endpoint,
-                                    credibility_score=assessment.relevance_score if assessment else 0.5,
-                                    category='tweet',
-                                    search_id=attempt.search_id,
-                                    evidence_strength='high' if assessment and assessment.relevance_score > 0.7 else 
-                                                     'medium' if assessment and assessment.relevance_score > 0.5 else 'low'
-                                )
-                                session.accumulated_findings.append(finding)
-                                
-                                # Send progress update about finding
-                                self.send_progress_update(
-                                    f"Found significant: {content[:100]}...",
-                                    "info"
+                    finding_datapoints = getattr(self, 'finding_datapoints', {})
+                    for (raw_result, assessment), content, goal_relevance in zip(significant, significant_contents, goal_scores):
+                        # A copy of an earlier finding only links this search to its DataPoint
+                        finding_key = raw_result.get('finding_key')
+                        if finding_key in finding_datapoints:
+                            existing_dp = finding_datapoints[finding_key]
+                            if existing_dp is not None and search_node is not None:
+                                self.llm_coordinator.graph.create_edge(
+                                    search_node, existing_dp, "DISCOVERED",
+                                    properties={'relevance': assessment.relevance_score, 'duplicate': True}
                                 )
-                
-                # REAL-TIME INSIGHT SYNTHESIS
-                if self.insight_synthesizer and len(round_datapoints) > 0:
-                    for dp in round_datapoints:
-                        insights_created = self.insight_synthesizer.process_new_datapoint(dp.id)
+                            continue
                         
-                        if insights_created:
-                            # User notification
+                        # Only create DataPoint if relevant to investigation goal
+                        if goal_relevance > 0.3:  # Context-aware threshold
+                            if finding_key:
+                                finding_datapoints[finding_key] = None
+                            # Try to create DataPoint node if in graph mode
+                            if self.graph_mode and hasattr(self.llm_coordinator, 'graph'):
+                                try:
+                                    dp = self.llm_coordinator.graph.create_datapoint_node(
+                                        content=content,
+                                        source=attempt.endpoint,
+                                        timestamp=datetime.now().isoformat(),
+                                        entities=assessment.entities,
+                                        follow_up_needed=assessment.suggested_followup,
+                                        relevance_score=assessment.relevance_score,
+                                        goal_relevance_score=goal_relevance
+                                    )
+                                    round_datapoints.append(dp)
+                                    if finding_key:
+                                        finding_datapoints[finding_key] = dp
+                                    
+                                    # Connect search to DataPoint if search_node exists
+                                    if 'search_node' in locals():
+                                        self.llm_coordinator.graph.create_edge(
+                                            search_node, dp, "DISCOVERED",
+                                            properties={'relevance': assessment.relevance_score}
+                                        )
+                                except Exception as e:
+                                    # self.logger.debug(f"Could not create graph node: {e}")
+                                    pass  # Silently continue
+                            
+                            # ALWAYS add to accumulated findings (regardless of graph mode)
+                            finding = Finding(
+                                content=content,
+                                source=attempt.endpoint,
+                                credibility_score=assessment.relevance_score if assessment else 0.5,
+                                category='tweet',
+                                search_id=attempt.search_id,
+                                evidence_strength='high' if assessment and assessment.relevance_score > 0.7 else 
+                                                 'medium' if assessment and assessment.relevance_score > 0.5 else 'low'
+                            )
+                            session.accumulated_findings.append(finding)
+                            
+                            # Send progress update about finding
                             self.send_progress_update(
-                                f"🧠 Synthesized {len(insights_created)} insights from recent findings",
+                                f"Found significant: {content[:100]}...",
                                 "info"
                             )
-                            
-                            # Log insight creation
-                            for insight_id in insights_created:
-                                insight_node = self.llm_coordinator.graph.nodes.get(insight_id)
-                                if insight_node:
-                                    session.insights_generated.append({
-                                        "id": insight_id,
-                                        "content": insight_node.properties.get("content", ""),
-                                        "confidence": insight_node.properties.get("confidence", 0.0),
-                                        "round_number": session.current_round_number if hasattr(session, 'current_round_number') else session.round_count
-                                    })
+                
+                # REAL-TIME INSIGHT SYNTHESIS (debounced: this search's new DataPoints as one batch)
+                if self.insight_synthesizer and len(round_datapoints) > synthesis_submitted:
+                    new_ids = [dp.id for dp in round_datapoints[synthesis_submitted:]]
+                    synthesis_submitted = len(round_datapoints)
+                    with get_stage_timer().stage('insight_synthesis'):
+                        insights_created = self.insight_synthesizer.process_new_datapoints(new_ids)
+                    self._record_synthesized_insights(session, insights_created)
         
             # EXISTING CODE: Get the raw results that were used for individual scoring
             if hasattr(attempt, '_raw_results'):
@@ -1631,6 +2040,12 @@ Design 2-4 strategic searches for this round that build on previous learnings.
                     'results_count': attempt.results_count
                 })
         
+        # Round end: one decision on whatever the debounce still holds
+        if self.insight_synthesizer and synthesis_submitted:
+            with get_stage_timer().stage('insight_synthesis'):
+                insights_created = self.insight_synthesizer.flush_datapoints()
+            self._record_synthesized_insights(session, insights_created)
+        
         # === NEW SECTION: Generate Insights from DataPoints ===
         if self.graph_mode and len(round_datapoints) >= 3:
             try:
@@ -7,14 +7,21 @@ is retained and connected in a living investigation graph, enabling strategic
 coherence and full context awareness.
 """
 
+import io
 import json
+import sys
+import time
 import uuid
 from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 from datetime import datetime
 from collections import defaultdict
 from enum import Enum
 
+import twitter_config
+from graph_serialization import GraphRecordReader, is_graph_jsonl
+from graph_wal import GraphWriteAheadLog
+
 
 class NodeType(Enum):
     """Enumeration of node types in the investigation graph"""
@@ -73,6 +80,97 @@ class Edge:
         """Create edge from dictionary"""
         return cls(**data)
 
+class CompactNode:
+    """
+    Slotted node used by compact graphs.
+    
+    Same interface as Node, but the id is the node's insertion index as a
+    short string ("12", mapped to a UUID only when the graph is serialized),
+    node_type is interned and created_at is kept as an epoch float. Typed accessors (text, content, endpoint, ...)
+    read straight from properties, as the Node subclasses do.
+    """
+    __slots__ = ('id', 'node_type', 'properties', '_created_ts')
+    
+    def __init__(self, id: str, node_type: str, properties: Dict[str, Any], created_ts: float):
+        self.id = id
+        self.node_type = sys.intern(node_type)
+        self.properties = properties
+        self._created_ts = created_ts
+    
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self._created_ts)
+    
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for names that aren't slots, e.g. node.text / node.parameters
+        properties = object.__getattribute__(self, 'properties')
+        if name in properties:
+            return properties[name]
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert node to dictionary for serialization"""
+        return {'id': self.id, 'node_type': self.node_type, 'properties': self.properties,
+                'created_at': self.created_at.isoformat()}
+
+
+class CompactEdge:
+    """Slotted edge used by compact graphs; properties dict is only allocated when used"""
+    __slots__ = ('id', 'source_id', 'target_id', 'edge_type', '_properties', '_created_ts')
+    
+    def __init__(self, id: str, source_id: str, target_id: str, edge_type: str,
+                 properties: Optional[Dict[str, Any]], created_ts: float):
+        self.id = id
+        self.source_id = source_id
+        self.target_id = target_id
+        self.edge_type = sys.intern(edge_type)
+        self._properties = properties or None
+        self._created_ts = created_ts
+    
+    @property
+    def properties(self) -> Dict[str, Any]:
+        if self._properties is None:
+            self._properties = {}
+        return self._properties
+    
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self._created_ts)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert edge to dictionary for serialization"""
+        return {'id': self.id, 'source_id': self.source_id, 'target_id': self.target_id,
+                'edge_type': self.edge_type, 'properties': self._properties or {},
+                'created_at': self.created_at.isoformat()}
+
+
+class _CompactNodeTable(dict):
+    """
+    Node table for compact graphs, keyed by index strings ("12").
+    
+    Also accepts the index as an int and the UUIDs of nodes loaded from a
+    serialized graph.
+    """
+    
+    def __init__(self, index_by_uuid: Dict[str, int]):
+        super().__init__()
+        self._index_by_uuid = index_by_uuid
+    
+    def _key(self, key):
+        if isinstance(key, int):
+            return str(key)
+        return self._index_by_uuid.get(key, key)
+    
+    def __getitem__(self, key):
+        return super().__getitem__(self._key(key))
+    
+    def __contains__(self, key):
+        return super().__contains__(self._key(key))
+    
+    def get(self, key, default=None):
+        return super().get(self._key(key), default)
+
+
 @dataclass
 class AnalyticQuestionNode(Node):
     """Root question driving the investigation"""
@@ -183,14 +281,44 @@ class EmergentQuestionNode(Node):
     def emergence_reason(self) -> str:
         return self.properties["emergence_reason"]
 
+def _freeze(value: Any) -> Any:
+    """Hashable, order-independent form of a parameter value (dicts/lists nested any depth)"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return tuple(sorted(_freeze(v) for v in value))
+    return value
+
+
+def _normalize_query_text(text: str) -> str:
+    """Case- and whitespace-insensitive form of a search query"""
+    return " ".join(str(text).lower().split())
+
+
+def _failed_query_text(endpoint: Optional[str], parameters: Any) -> str:
+    """The query (or endpoint) a failed search is reported under"""
+    query = parameters.get("query") if isinstance(parameters, dict) else None
+    return (query or endpoint or '').lower()
+
+
 class InvestigationGraph:
     """
     Graph-based investigation system that retains all information and relationships
     for strategic coherence and full context awareness.
     """
     
-    def __init__(self):
-        self.nodes: Dict[str, Node] = {}
+    def __init__(self, compact: Optional[bool] = None):
+        # Compact mode stores slotted nodes/edges with short index ids (see CompactNode)
+        self.compact = twitter_config.GRAPH_COMPACT_STORAGE if compact is None else compact
+        self._uuid_by_index: Dict[str, str] = {}  # Compact mode: stable external ids, assigned on serialization
+        self._index_by_uuid: Dict[str, str] = {}
+        self._edge_uuid_by_index: Dict[str, str] = {}
+        self._next_node_index = 0
+        self._next_edge_index = 0
+        
+        self.nodes: Dict[str, Node] = _CompactNodeTable(self._index_by_uuid) if self.compact else {}
         self.edges: List[Edge] = []
         self.analytic_question: Optional[Node] = None
         
@@ -198,13 +326,45 @@ class InvestigationGraph:
         self._edges_by_source: Dict[str, List[Edge]] = defaultdict(list)
         self._edges_by_target: Dict[str, List[Edge]] = defaultdict(list) 
         self._nodes_by_type: Dict[str, List[Node]] = defaultdict(list)
+        self._search_by_key: Dict[tuple, Node] = {}  # (endpoint, frozen params) -> first matching node
+        self._searches_by_endpoint: Dict[str, List[Node]] = defaultdict(list)
+        self._searches_by_query: Dict[str, List[Node]] = defaultdict(list)
+        
+        # Connected components (union-find), maintained as nodes and edges are added
+        self._component_parent: Dict[str, str] = {}
+        self._component_members: Dict[str, List[Node]] = {}  # root id -> nodes in that component
+        
+        # Ids of nodes with a directed path to an Insight, kept closed under predecessors
+        self._reaches_insight: set = set()
+        self._reachability_synced_at = (0, 0)  # (node count, edge count) the set is valid for
+        
+        # Optional append-only mutation log (see graph_wal.py)
+        self.wal: Optional[GraphWriteAheadLog] = None
+        
+        # Knowledge imported from past investigations (import_prior_knowledge)
+        # Prior failures are kept on the imported SearchQuery nodes ('prior_failure') so they reload with the graph
+        self._prior_datapoint_keys: set = set()
+        self._prior_search_keys: Dict[tuple, Node] = {}  # Kept apart from the current run's search indexes
     
     # Node creation methods
+    def _add_node(self, node: Node) -> Node:
+        """Store a newly built node, as a CompactNode in compact mode, and index it by type"""
+        if self.compact:
+            node = CompactNode(str(self._next_node_index), node.node_type, node.properties, node.created_at.timestamp())
+            self._next_node_index += 1
+        reachability_in_sync = self._reachability_in_sync()
+        self.nodes[node.id] = node
+        if reachability_in_sync:
+            self._mark_reachability_synced()  # A new node has no edges yet
+        self._nodes_by_type[node.node_type].append(node)
+        self._add_to_components(node)
+        if self.wal is not None:
+            self.wal.append("node", data=self.serialize_node(node))
+        return node
+    
     def create_analytic_question_node(self, text: str, **kwargs) -> AnalyticQuestionNode:
         """Create the root analytic question for this investigation"""
-        node = AnalyticQuestionNode(text, **kwargs)
-        self.nodes[node.id] = node
-        self._nodes_by_type["AnalyticQuestion"].append(node)
+        node = self._add_node(AnalyticQuestionNode(text, **kwargs))
         
         # Set as the primary analytic question
         if self.analytic_question is None:
@@ -217,39 +377,114 @@ class InvestigationGraph:
         if parent_id is None and self.analytic_question:
             parent_id = self.analytic_question.id
             
-        node = InvestigationQuestionNode(text, parent_id)
-        self.nodes[node.id] = node
-        self._nodes_by_type["InvestigationQuestion"].append(node)
-        
-        return node
+        return self._add_node(InvestigationQuestionNode(text, parent_id))
     
     def create_search_query_node(self, endpoint: str, parameters: Dict[str, Any]) -> SearchQueryNode:
         """Create a search query node representing an API call"""
-        node = SearchQueryNode(endpoint, parameters)
-        self.nodes[node.id] = node
-        self._nodes_by_type["SearchQuery"].append(node)
+        node = self._add_node(SearchQueryNode(endpoint, parameters))
+        self._index_search_query_node(node)
         return node
     
+    def _index_search_query_node(self, node: Node):
+        endpoint = node.properties.get("endpoint")
+        parameters = node.properties.get("parameters") or {}
+        if node.properties.get("prior"):
+            self._prior_search_keys.setdefault((endpoint, _freeze(parameters)), node)
+            return
+        self._search_by_key.setdefault((endpoint, _freeze(parameters)), node)
+        self._searches_by_endpoint[endpoint].append(node)
+        query = parameters.get("query") if isinstance(parameters, dict) else None
+        if query:
+            self._searches_by_query[_normalize_query_text(query)].append(node)
+    
     def create_data_point_node(self, content: str, source_info: Dict[str, Any]) -> DataPointNode:
         """Create a data point from search results"""
-        node = DataPointNode(content, source_info)
-        self.nodes[node.id] = node
-        self._nodes_by_type["DataPoint"].append(node)
-        return node
+        return self._add_node(DataPointNode(content, source_info))
     
     def create_insight_node(self, content: str, insight_type: str) -> InsightNode:
         """Create an insight derived from analysis"""
-        node = InsightNode(content, insight_type)
-        self.nodes[node.id] = node
-        self._nodes_by_type["Insight"].append(node)
-        return node
+        return self._add_node(InsightNode(content, insight_type))
     
     def create_emergent_question_node(self, text: str, emergence_reason: str) -> EmergentQuestionNode:
         """Create an emergent question that arose during investigation"""
-        node = EmergentQuestionNode(text, emergence_reason)
-        self.nodes[node.id] = node
-        self._nodes_by_type["EmergentQuestion"].append(node)
-        return node
+        return self._add_node(EmergentQuestionNode(text, emergence_reason))
+    
+    # Knowledge from past investigations
+    def import_prior_knowledge(self, knowledge: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Pre-seed the graph from a past investigation (investigation_store.get_prior_knowledge).
+        
+        Insights and DataPoints are copied with prior=True and prior_investigation set and
+        linked to the analytic question; SearchQuery nodes are copied so repeated searches
+        can be recognised (is_prior_search), and those that found nothing feed
+        get_failed_patterns(). Prior searches stay out of find_search_query_node and the
+        search counts, which describe the current run only.
+        """
+        investigation_id = knowledge["investigation_id"]
+        marker = {"prior": True, "prior_investigation": investigation_id}
+        root = self.analytic_question
+        imported = {"insights": 0, "datapoints": 0, "searches": 0}
+        new_ids = {}
+        
+        for record in knowledge.get("insights", []):
+            properties = record["properties"]
+            node = InsightNode(properties.get("content", ""), properties.get("insight_type", "derived"))
+            node.properties = {**properties, **marker}
+            node = self._add_node(node)
+            new_ids[record["node_id"]] = node
+            if root is not None:
+                self.create_edge(root, node, "PRIOR_KNOWLEDGE")
+            imported["insights"] += 1
+        
+        for record in knowledge.get("datapoints", []):
+            properties = record["properties"]
+            key = _normalize_query_text(properties.get("content", ""))
+            if key in self._prior_datapoint_keys:
+                continue
+            self._prior_datapoint_keys.add(key)
+            node = DataPointNode(properties.get("content", ""), properties.get("source_info") or {})
+            node.properties = {**properties, **marker}
+            new_ids[record["node_id"]] = self._add_node(node)
+            imported["datapoints"] += 1
+        
+        linked = set()
+        for source_id, target_id in knowledge.get("supports", []):
+            if source_id in new_ids and target_id in new_ids:
+                self.create_edge(new_ids[source_id], new_ids[target_id], "SUPPORTS", {"prior": True})
+                linked.add(source_id)
+        if root is not None:
+            for record_id, node in new_ids.items():
+                if node.node_type == "DataPoint" and record_id not in linked:
+                    self.create_edge(root, node, "PRIOR_KNOWLEDGE")
+        
+        for record in knowledge.get("searches", []):
+            properties = record["properties"]
+            endpoint, parameters = properties.get("endpoint"), properties.get("parameters") or {}
+            failure = None
+            if record.get("datapoint_count", 0) == 0:
+                failure = (f"'{_failed_query_text(endpoint, parameters)}': "
+                           f"no findings in prior investigation {investigation_id[:8]}")
+            existing = self._prior_search_keys.get((endpoint, _freeze(parameters)))
+            if existing is not None:
+                if failure and not existing.properties.get("prior_failure"):
+                    existing.properties["prior_failure"] = failure
+                    self.record_node_update(existing)
+                continue
+            node = SearchQueryNode(endpoint, parameters)
+            node.properties = {**properties, **marker}
+            if failure:
+                node.properties["prior_failure"] = failure
+            node = self._add_node(node)
+            self._index_search_query_node(node)
+            if root is not None:
+                self.create_edge(root, node, "PRIOR_KNOWLEDGE")
+            imported["searches"] += 1
+        
+        return imported
+    
+    def is_prior_search(self, endpoint: str, parameters: Dict[str, Any]) -> bool:
+        """Whether this exact search was already run by an imported past investigation"""
+        return (endpoint, _freeze(parameters or {})) in self._prior_search_keys
     
     # Enhanced DataPoint and Insight methods for tests
     def create_datapoint_node(self, content: str, source: str, timestamp: str = None, **kwargs) -> 'DataPointNodeWrapper':
@@ -275,6 +510,7 @@ class InvestigationGraph:
         # CRITICAL FIX: Set title if provided to prevent "Untitled" insights
         if title and title.strip():
             node.properties['title'] = title.strip()
+        self.record_node_update(node)
         
         # Create edges from datapoints to this insight
         for dp_id in supporting_datapoints:
@@ -338,42 +574,118 @@ class InvestigationGraph:
         if target.id not in self.nodes:
             raise ValueError(f"Target node {target.id} not in graph")
             
-        edge = Edge(
-            id=str(uuid.uuid4()),
-            source_id=source.id,
-            target_id=target.id, 
-            edge_type=edge_type,
-            properties=properties,
-            created_at=datetime.now()
-        )
+        if self.compact:
+            edge = CompactEdge(str(self._next_edge_index), source.id, target.id, edge_type, properties, time.time())
+            self._next_edge_index += 1
+        else:
+            edge = Edge(
+                id=str(uuid.uuid4()),
+                source_id=source.id,
+                target_id=target.id, 
+                edge_type=edge_type,
+                properties=properties,
+                created_at=datetime.now()
+            )
         
+        reachability_in_sync = self._reachability_in_sync()
         self.edges.append(edge)
         self._edges_by_source[source.id].append(edge)
         self._edges_by_target[target.id].append(edge)
+        self._union_components(source, target)
+        if reachability_in_sync:
+            if target.node_type == "Insight" or target.id in self._reaches_insight:
+                self._propagate_reaches_insight([source.id])
+            self._mark_reachability_synced()
+        if self.wal is not None:
+            self.wal.append("edge", data=self.serialize_edge(edge))
         
         return edge
     
+    # Connected components (union-find)
+    def _add_to_components(self, node: Node):
+        if node.id not in self._component_parent:
+            self._component_parent[node.id] = node.id
+            self._component_members[node.id] = [node]
+    
+    def _find_component(self, node_id: str) -> str:
+        """Root id of a node's component, with path halving (iterative)"""
+        parent = self._component_parent
+        while parent[node_id] != node_id:
+            parent[node_id] = parent[parent[node_id]]
+            node_id = parent[node_id]
+        return node_id
+    
+    def _union_components(self, source: Node, target: Node):
+        self._add_to_components(source)
+        self._add_to_components(target)
+        root_a = self._find_component(source.id)
+        root_b = self._find_component(target.id)
+        if root_a == root_b:
+            return
+        # Union by size: fold the smaller member list into the larger
+        if len(self._component_members[root_a]) < len(self._component_members[root_b]):
+            root_a, root_b = root_b, root_a
+        self._component_parent[root_b] = root_a
+        self._component_members[root_a].extend(self._component_members.pop(root_b))
+    
+    def _rebuild_components(self):
+        """Recompute components from scratch (iteratively) after nodes were removed or loaded"""
+        self._component_parent.clear()
+        self._component_members.clear()
+        for node in self.nodes.values():
+            self._add_to_components(node)
+        for edge in self.edges:
+            source = self.nodes.get(edge.source_id)
+            target = self.nodes.get(edge.target_id)
+            if source is not None and target is not None:
+                self._union_components(source, target)
+    
+    def _ensure_components(self):
+        # Nodes inserted into or deleted from self.nodes directly bypass the incremental path
+        if len(self._component_parent) != len(self.nodes):
+            self._rebuild_components()
+    
+    def get_component_id(self, node_id: str) -> Optional[str]:
+        """Id of the component root the node belongs to (equal ids = connected)"""
+        if node_id not in self.nodes:
+            return None
+        self._ensure_components()
+        return self._find_component(self.nodes[node_id].id)
+    
+    def are_connected(self, node_id_a: str, node_id_b: str) -> bool:
+        """Whether two nodes are linked by any chain of edges (direction ignored)"""
+        root_a = self.get_component_id(node_id_a)
+        return root_a is not None and root_a == self.get_component_id(node_id_b)
+    
     # Query methods
     def get_nodes_by_type(self, node_type: str) -> List[Node]:
         """Get all nodes of a specific type"""
         return self._nodes_by_type.get(node_type, [])
     
+    def get_search_query_nodes(self, include_prior: bool = False) -> List[Node]:
+        """SearchQuery nodes of this run, optionally with those imported from past investigations"""
+        searches = self.get_nodes_by_type("SearchQuery")
+        return list(searches) if include_prior else [n for n in searches if not n.properties.get("prior")]
+    
     def find_search_query_node(self, endpoint: str, parameters: Dict[str, Any]) -> Optional[Node]:
         """Find existing SearchQuery node by endpoint and parameters"""
-        search_nodes = self.get_nodes_by_type("SearchQuery")
-        for node in search_nodes:
-            if (node.properties.get("endpoint") == endpoint and 
-                node.properties.get("parameters") == parameters):
-                return node
-        return None
+        return self._search_by_key.get((endpoint, _freeze(parameters or {})))
+    
+    def find_search_query_nodes_by_endpoint(self, endpoint: str) -> List[Node]:
+        """All SearchQuery nodes for an endpoint, in creation order"""
+        return list(self._searches_by_endpoint.get(endpoint, []))
+    
+    def find_search_query_nodes_by_query(self, query: str) -> List[Node]:
+        """All SearchQuery nodes whose 'query' parameter matches, ignoring case and spacing"""
+        return list(self._searches_by_query.get(_normalize_query_text(query), []))
     
     def get_outgoing_edges(self, node_id: str) -> List[Edge]:
         """Get edges originating from a node"""
-        return self._edges_by_source.get(node_id, [])
+        return self._edges_by_source.get(self.nodes._key(node_id) if self.compact else node_id, [])
     
     def get_incoming_edges(self, node_id: str) -> List[Edge]:
         """Get edges targeting a node"""
-        return self._edges_by_target.get(node_id, [])
+        return self._edges_by_target.get(self.nodes._key(node_id) if self.compact else node_id, [])
     
     def get_connected_nodes(self, node_id: str) -> List[Node]:
         """Get all nodes connected to this node"""
@@ -443,33 +755,9 @@ class InvestigationGraph:
         if not self.nodes:
             return []
         
-        # Find connected components using DFS
-        visited = set()
-        components = []
-        
-        def dfs(node_id: str, component: List[Node]):
-            if node_id in visited:
-                return
-            
-            visited.add(node_id)
-            if node_id in self.nodes:
-                component.append(self.nodes[node_id])
-                
-                # Visit connected nodes
-                for connected_node in self.get_connected_nodes(node_id):
-                    if connected_node.id not in visited:
-                        dfs(connected_node.id, component)
-        
-        # Find all components
-        for node_id in self.nodes:
-            if node_id not in visited:
-                component = []
-                dfs(node_id, component)
-                if component:
-                    components.append(component)
-        
+        self._ensure_components()
         # Return components with more than 1 node (meaningful threads)
-        return [comp for comp in components if len(comp) > 1]
+        return [list(members) for members in self._component_members.values() if len(members) > 1]
     
     def get_prioritized_questions(self) -> List[Node]:
         """Get investigation questions ordered by priority"""
@@ -515,7 +803,7 @@ class InvestigationGraph:
         context_parts.append(f"\nINVESTIGATION PROGRESS:")
         context_parts.append(f"- Questions Asked: {len(self.get_nodes_by_type('InvestigationQuestion'))}")
         context_parts.append(f"- Questions Answered: {len(self.get_answered_questions())}")
-        context_parts.append(f"- Searches Conducted: {len(self.get_nodes_by_type('SearchQuery'))}")
+        context_parts.append(f"- Searches Conducted: {len(self.get_search_query_nodes())}")
         context_parts.append(f"- Data Points Collected: {len(self.get_nodes_by_type('DataPoint'))}")
         context_parts.append(f"- Insights Generated: {len(self.get_nodes_by_type('Insight'))}")
         
@@ -547,42 +835,46 @@ class InvestigationGraph:
     
     def get_answered_questions(self) -> List[Node]:
         """Get investigation questions that have been answered (have insights)"""
-        answered = []
-        questions = self.get_nodes_by_type("InvestigationQuestion")
-        
-        for q in questions:
-            # Check if there's a path from this question to insights
-            if self._has_path_to_insights(q.id):
-                answered.append(q)
+        if not self._reachability_in_sync():
+            self._rebuild_reachability()
         
-        return answered
+        # A question is answered if there's a path from it to an insight
+        return [q for q in self.get_nodes_by_type("InvestigationQuestion") if q.id in self._reaches_insight]
     
-    def _has_path_to_insights(self, node_id: str, visited: set = None) -> bool:
+    def _has_path_to_insights(self, node_id: str) -> bool:
         """Check if there's a path from this node to any insights"""
-        if visited is None:
-            visited = set()
-        
-        if node_id in visited:
-            return False
-        
-        visited.add(node_id)
-        
-        # Check direct connections
-        for edge in self.get_outgoing_edges(node_id):
-            target_node = self.nodes.get(edge.target_id)
-            if target_node and target_node.node_type == "Insight":
-                return True
-            
-            # Recursive check
-            if self._has_path_to_insights(edge.target_id, visited):
-                return True
-        
-        return False
+        if not self._reachability_in_sync():
+            self._rebuild_reachability()
+        return node_id in self._reaches_insight
+    
+    # Insight reachability (incremental; rebuilt when the graph changed behind our back)
+    def _reachability_in_sync(self) -> bool:
+        return self._reachability_synced_at == (len(self.nodes), len(self.edges))
+    
+    def _mark_reachability_synced(self):
+        self._reachability_synced_at = (len(self.nodes), len(self.edges))
+    
+    def _propagate_reaches_insight(self, node_ids: List[str]):
+        """Add node_ids and every node with a path into them; stops at nodes already known to reach"""
+        stack = [node_id for node_id in node_ids if node_id not in self._reaches_insight]
+        self._reaches_insight.update(stack)
+        while stack:
+            for edge in self._edges_by_target.get(stack.pop(), []):
+                if edge.source_id not in self._reaches_insight:
+                    self._reaches_insight.add(edge.source_id)
+                    stack.append(edge.source_id)
+    
+    def _rebuild_reachability(self):
+        self._reaches_insight.clear()
+        for insight in self.get_nodes_by_type("Insight"):
+            if insight.id in self.nodes:
+                self._propagate_reaches_insight([edge.source_id for edge in self.get_incoming_edges(insight.id)])
+        self._mark_reachability_synced()
     
     def get_failed_patterns(self) -> List[str]:
         """Identify search patterns that consistently failed"""
         failed_patterns = []
-        search_nodes = self.get_nodes_by_type("SearchQuery")
+        search_nodes = self.get_search_query_nodes()
         
         # Group searches by query pattern
         query_stats = defaultdict(list)
@@ -606,45 +898,233 @@ class InvestigationGraph:
                         f"avg effectiveness: {avg_effectiveness:.1f}/10"
                     )
         
-        return failed_patterns
+        return failed_patterns + self._prior_failed_patterns()
+    
+    def _prior_failed_patterns(self) -> List[str]:
+        """Failures recorded on imported prior searches, one per query"""
+        patterns, seen = [], set()
+        for node in self._prior_search_keys.values():
+            failure = node.properties.get("prior_failure")
+            if not failure:
+                continue
+            query = _failed_query_text(node.properties.get("endpoint"), node.properties.get("parameters") or {})
+            if query not in seen:
+                seen.add(query)
+                patterns.append(failure)
+        return patterns
     
     # Serialization methods
     def to_json(self) -> str:
         """Serialize graph to JSON string"""
+        nodes = {}
+        for node_id, node in self.nodes.items():
+            node_data = self.serialize_node(node)
+            nodes[node_data["id"] if self.compact else node_id] = node_data
         data = {
-            "nodes": {node_id: node.to_dict() for node_id, node in self.nodes.items()},
-            "edges": [edge.to_dict() for edge in self.edges],
-            "analytic_question": self.analytic_question.id if self.analytic_question else None,
-            "created_at": datetime.now().isoformat()
+            "nodes": nodes,
+            "edges": [self.serialize_edge(edge) for edge in self.edges],
+            "analytic_question": self.serialized_node_id(self.analytic_question),
+            "created_at": self.serialization_timestamp()
         }
         return json.dumps(data, indent=2)
     
+    # Node properties that hold ids of other nodes, mapped like node ids in compact mode
+    NODE_REFERENCE_PROPERTIES = ('parent_analytic_question', 'supporting_datapoints')
+    
+    def serialize_node(self, node: Node) -> Dict[str, Any]:
+        """Node document as stored by to_json() (compact ids mapped to UUIDs)"""
+        node_data = node.to_dict()
+        if self.compact:
+            node_data["id"] = self._external_id(node.id)
+            node_data["properties"] = self._map_node_references(node.properties, self._external_reference)
+        return node_data
+    
+    def serialize_edge(self, edge: Edge) -> Dict[str, Any]:
+        """Edge document as stored by to_json() (compact ids mapped to UUIDs)"""
+        edge_data = edge.to_dict()
+        if self.compact:
+            edge_data["id"] = self._external_edge_id(edge.id)
+            edge_data["source_id"] = self._external_id(edge.source_id)
+            edge_data["target_id"] = self._external_id(edge.target_id)
+        return edge_data
+    
+    def serialized_node_id(self, node: Optional[Node]) -> Optional[str]:
+        if node is None:
+            return None
+        return self._external_id(node.id) if self.compact else node.id
+    
+    @staticmethod
+    def serialization_timestamp() -> str:
+        return datetime.now().isoformat()
+    
+    def _external_id(self, index: str) -> str:
+        """UUID for a compact node index, assigned on first serialization and stable afterwards"""
+        external = self._uuid_by_index.get(index)
+        if external is None:
+            external = str(uuid.uuid4())
+            self._uuid_by_index[index] = external
+            self._index_by_uuid[external] = index
+        return external
+    
+    def _external_reference(self, node_id: Any) -> Any:
+        """UUID for a compact node index held in a property; other values are kept"""
+        index = self.nodes._key(node_id) if isinstance(node_id, str) else None
+        return self._external_id(index) if dict.__contains__(self.nodes, index) else node_id
+    
+    def _internal_reference(self, node_id: Any) -> Any:
+        return self._index_by_uuid.get(node_id, node_id) if isinstance(node_id, str) else node_id
+    
+    def _map_node_references(self, properties: Dict[str, Any], convert) -> Dict[str, Any]:
+        """Copy of properties with the NODE_REFERENCE_PROPERTIES ids passed through convert"""
+        if not any(name in properties for name in self.NODE_REFERENCE_PROPERTIES):
+            return properties
+        mapped = dict(properties)
+        for name in self.NODE_REFERENCE_PROPERTIES:
+            value = mapped.get(name)
+            if isinstance(value, list):
+                mapped[name] = [convert(item) for item in value]
+            elif value is not None:
+                mapped[name] = convert(value)
+        return mapped
+    
+    def _external_edge_id(self, index: str) -> str:
+        """UUID for a compact edge index, assigned once like node UUIDs"""
+        external = self._edge_uuid_by_index.get(index)
+        if external is None:
+            external = self._edge_uuid_by_index[index] = str(uuid.uuid4())
+        return external
+    
     def from_json(self, json_str: str) -> None:
-        """Restore graph from JSON string"""
+        """Restore graph from JSON string (a to_json() document or graph_serialization JSON Lines)"""
+        if is_graph_jsonl(json_str):
+            self.load_records(GraphRecordReader(io.StringIO(json_str)))
+            return
+        
         data = json.loads(json_str)
+        self._restore(data["nodes"].items(), data["edges"], data.get("analytic_question"))
+    
+    def load_records(self, reader: 'GraphRecordReader') -> None:
+        """Restore graph from a graph_serialization stream, one record at a time"""
+        self._restore(((node_data["id"], node_data) for node_data in reader.nodes()),
+                      reader.edges(), reader.analytic_question)
+    
+    # Write-ahead log
+    def enable_wal(self, path: str, sequence: int = 0, **options) -> GraphWriteAheadLog:
+        """Log every node/edge creation to path from now on, starting from a snapshot of the current graph"""
+        self.close_wal()
+        self.wal = GraphWriteAheadLog(path, self, sequence=sequence, **options)
+        self.wal.compact()
+        return self.wal
+    
+    def close_wal(self, compact: bool = True) -> None:
+        if self.wal is not None:
+            self.wal.close(compact=compact)
+            self.wal = None
+    
+    def record_node_update(self, node: Node) -> None:
+        """Log a node's current properties after changing them in place"""
+        if self.wal is not None:
+            properties = (self._map_node_references(node.properties, self._external_reference)
+                          if self.compact else node.properties)
+            self.wal.append("update", id=self.serialized_node_id(node), properties=properties)
+    
+    def replay_wal(self, records: Iterable[Dict[str, Any]], after_sequence: int = 0) -> int:
+        """Apply WAL records newer than after_sequence; returns the last sequence number seen"""
+        sequence = after_sequence
+        for record in records:
+            if record["seq"] <= sequence:
+                continue
+            sequence = record["seq"]
+            op = record["op"]
+            if op == "node":
+                node_id = record["data"]["id"]
+                if node_id not in self.nodes:
+                    node = self._apply_node_document(node_id, record["data"])
+                    if self.analytic_question is None and node.node_type == "AnalyticQuestion":
+                        self.analytic_question = node
+            elif op == "edge":
+                self._apply_edge_document(record["data"])
+            elif op == "update":
+                if record["id"] in self.nodes:
+                    properties = record["properties"]
+                    if self.compact:
+                        properties = self._map_node_references(properties, self._internal_reference)
+                    self.nodes[record["id"]].properties.update(properties)
+            else:
+                raise ValueError(f"Unknown graph WAL operation '{op}'")
         
+        self._rebuild_components()
+        self._rebuild_reachability()
+        return sequence
+    
+    def _apply_node_document(self, node_id: str, node_data: Dict[str, Any]) -> Node:
+        """Add a node from its serialized document (no WAL record, components rebuilt by caller)"""
+        if self.compact:
+            # Referenced nodes precede the node in a document, so their UUIDs are already mapped
+            properties = self._map_node_references(node_data["properties"], self._internal_reference)
+            node = CompactNode(str(self._next_node_index), node_data["node_type"], properties,
+                               datetime.fromisoformat(node_data["created_at"]).timestamp())
+            self._next_node_index += 1
+            self._uuid_by_index[node.id] = node_id
+            self._index_by_uuid[node_id] = node.id
+        else:
+            node = Node.from_dict(node_data)
+        self.nodes[node.id if self.compact else node_id] = node
+        self._nodes_by_type[node.node_type].append(node)
+        if node.node_type == "SearchQuery":
+            self._index_search_query_node(node)
+        elif node.node_type == "DataPoint" and node.properties.get("prior"):
+            self._prior_datapoint_keys.add(_normalize_query_text(node.properties.get("content", "")))
+        return node
+    
+    def _apply_edge_document(self, edge_data: Dict[str, Any]) -> Edge:
+        """Add an edge from its serialized document (no WAL record, components rebuilt by caller)"""
+        if self.compact:
+            edge = CompactEdge(str(self._next_edge_index), self._index_by_uuid.get(edge_data["source_id"], edge_data["source_id"]),
+                               self._index_by_uuid.get(edge_data["target_id"], edge_data["target_id"]), edge_data["edge_type"],
+                               edge_data.get("properties"), datetime.fromisoformat(edge_data["created_at"]).timestamp())
+            self._next_edge_index += 1
+            if edge_data.get("id"):
+                self._edge_uuid_by_index[edge.id] = edge_data["id"]
+        else:
+            edge = Edge.from_dict(edge_data)
+        self.edges.append(edge)
+        self._edges_by_source[edge.source_id].append(edge)
+        self._edges_by_target[edge.target_id].append(edge)
+        return edge
+    
+    def _restore(self, node_items: Iterable[Tuple[str, Dict[str, Any]]], edge_items: Iterable[Dict[str, Any]],
+                 analytic_id: Optional[str]) -> None:
         # Clear existing data
         self.nodes.clear()
         self.edges.clear()
         self._edges_by_source.clear()
         self._edges_by_target.clear()
         self._nodes_by_type.clear()
+        self._search_by_key.clear()
+        self._searches_by_endpoint.clear()
+        self._searches_by_query.clear()
+        self._prior_search_keys.clear()
+        self._prior_datapoint_keys.clear()
+        
+        self._uuid_by_index.clear()
+        self._index_by_uuid.clear()
+        self._edge_uuid_by_index.clear()
+        self._next_node_index = 0
+        self._next_edge_index = 0
         
         # Restore nodes
-        for node_id, node_data in data["nodes"].items():
-            node = Node.from_dict(node_data)
-            self.nodes[node_id] = node
-            self._nodes_by_type[node.node_type].append(node)
+        for node_id, node_data in node_items:
+            self._apply_node_document(node_id, node_data)
         
         # Restore edges
-        for edge_data in data["edges"]:
-            edge = Edge.from_dict(edge_data)
-            self.edges.append(edge)
-            self._edges_by_source[edge.source_id].append(edge)
-            self._edges_by_target[edge.target_id].append(edge)
+        for edge_data in edge_items:
+            self._apply_edge_document(edge_data)
+        
+        self._rebuild_components()
+        self._rebuild_reachability()
         
         # Restore analytic question reference
-        analytic_id = data.get("analytic_question")
         if analytic_id and analytic_id in self.nodes:
             self.analytic_question = self.nodes[analytic_id]
 
@@ -665,6 +1145,8 @@ class InvestigationContext:
 # Wrapper classes for test compatibility
 class DataPointNodeWrapper:
     """Wrapper for DataPointNode to provide test compatibility"""
+    __slots__ = ('node', 'graph', 'id', 'type', 'attributes')
+    
     def __init__(self, node: DataPointNode, graph: InvestigationGraph):
         self.node = node
         self.graph = graph
@@ -688,6 +1170,8 @@ class DataPointNodeWrapper:
 
 class InsightNodeWrapper:
     """Wrapper for InsightNode to provide test compatibility"""
+    __slots__ = ('node', 'graph', 'id', 'type', 'attributes')
+    
     def __init__(self, node: InsightNode, graph: InvestigationGraph):
         self.node = node
         self.graph = graph
@@ -0,0 +1,484 @@
+# investigation_store.py
+"""
+Cross-Investigation Store
+
+Loads exported investigation graphs (to_json() documents and
+graph_serialization JSON Lines files) into one local SQLite database so
+past investigations can be queried together without opening every file:
+
+    nodes            one row per node, with node_type, endpoint, query text,
+                     content and created_at columns indexed for lookups
+    edges            one row per edge, indexed by source and target
+    node_properties  scalar node properties as key/value rows
+    content_fts      FTS5 index over DataPoint and Insight content
+
+Ingestion is incremental: a file whose size and modification time are
+unchanged since it was last ingested is skipped, a changed file replaces
+its investigation's rows.
+
+Usage:
+    python investigation_store.py ingest                  # repo root + investigations/outputs
+    python investigation_store.py search "flight logs" --type DataPoint
+
+    store = get_investigation_store()
+    store.search_content("flight logs", node_types=["DataPoint"])
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import twitter_config
+from graph_serialization import GraphRecordReader, is_graph_jsonl, open_graph_file
+
+logger = logging.getLogger(__name__)
+
+FTS_NODE_TYPES = ("DataPoint", "Insight")
+QUESTION_STOP_WORDS = {
+    'the', 'and', 'for', 'are', 'was', 'what', 'who', 'how', 'why', 'when', 'where', 'which', 'about',
+    'with', 'from', 'that', 'this', 'does', 'did', 'has', 'have', 'saying', 'say', 'says', 'recently'
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS investigations (
+    investigation_id TEXT PRIMARY KEY,
+    source_path TEXT,
+    analytic_question TEXT,
+    created_at TEXT,
+    file_size INTEGER,
+    file_mtime REAL,
+    node_count INTEGER,
+    edge_count INTEGER,
+    ingested_at TEXT
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    id INTEGER PRIMARY KEY,
+    investigation_id TEXT NOT NULL,
+    node_id TEXT NOT NULL,
+    node_type TEXT NOT NULL,
+    created_at TEXT,
+    endpoint TEXT,
+    query_text TEXT,
+    content TEXT,
+    properties TEXT,
+    UNIQUE (investigation_id, node_id)
+);
+CREATE INDEX IF NOT EXISTS idx_nodes_type ON nodes (node_type, created_at);
+CREATE INDEX IF NOT EXISTS idx_nodes_endpoint ON nodes (endpoint);
+CREATE INDEX IF NOT EXISTS idx_nodes_query ON nodes (query_text);
+CREATE INDEX IF NOT EXISTS idx_nodes_created ON nodes (created_at);
+CREATE TABLE IF NOT EXISTS edges (
+    investigation_id TEXT NOT NULL,
+    edge_id TEXT,
+    source_id TEXT NOT NULL,
+    target_id TEXT NOT NULL,
+    edge_type TEXT NOT NULL,
+    created_at TEXT,
+    properties TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_edges_source ON edges (investigation_id, source_id);
+CREATE INDEX IF NOT EXISTS idx_edges_target ON edges (investigation_id, target_id);
+CREATE INDEX IF NOT EXISTS idx_edges_type ON edges (edge_type);
+CREATE TABLE IF NOT EXISTS node_properties (
+    investigation_id TEXT NOT NULL,
+    node_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_properties_key ON node_properties (key, value);
+CREATE INDEX IF NOT EXISTS idx_properties_node ON node_properties (investigation_id, node_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS content_fts USING fts5 (content, tokenize = 'porter unicode61');
+"""
+
+
+def normalize_query_text(text: Any) -> Optional[str]:
+    """Case- and whitespace-insensitive search query text (None for empty)"""
+    normalized = " ".join(str(text).lower().split()) if text else ""
+    return normalized or None
+
+
+def question_terms(text: str) -> set:
+    """Content words of an analytic question, for similarity between investigations"""
+    return {word for word in re.findall(r"[a-z0-9]+", str(text).lower())
+            if len(word) >= 3 and word not in QUESTION_STOP_WORDS}
+
+
+def investigation_id_for_path(path: str) -> str:
+    """'investigation_graph_<id>.json[l[.gz]]' -> '<id>'"""
+    name = os.path.basename(path)
+    for suffix in ('.zst', '.gz', '.jsonl', '.json'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return name[len('investigation_graph_'):] if name.startswith('investigation_graph_') else name
+
+
+def default_graph_paths() -> List[str]:
+    """Exported graphs in the repo root and investigations/outputs (current_* copies excluded)"""
+    root = os.path.dirname(os.path.abspath(__file__))
+    paths = []
+    for directory in (root, os.path.join(root, 'investigations', 'outputs')):
+        paths.extend(glob.glob(os.path.join(directory, 'investigation_graph_*.json*')))
+    return sorted(paths)
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+def _node_columns(node: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """(endpoint, query_text, content) for a node document"""
+    properties = node.get('properties') or {}
+    endpoint = properties.get('endpoint')
+    parameters = properties.get('parameters')
+    query_text = normalize_query_text(parameters.get('query')) if isinstance(parameters, dict) else None
+    if node.get('node_type') == 'Insight' and properties.get('title'):
+        content = f"{properties['title']}\n{properties.get('content', '')}"
+    else:
+        content = properties.get('content') or properties.get('text')
+    return endpoint, query_text, str(content) if content is not None else None
+
+
+def _read_graph_documents(path: str) -> Tuple[Optional[str], Iterator[Tuple[str, Dict]], Iterator[Dict]]:
+    """(analytic question id, (node id, node) pairs, edges) from either export format"""
+    f = open_graph_file(path, 'r')
+    first = f.readline()
+    if is_graph_jsonl(first):
+        def lines():
+            yield first
+            yield from f
+        reader = GraphRecordReader(lines())
+
+        def edges():
+            try:
+                yield from reader.edges()
+            finally:
+                f.close()
+        return reader.analytic_question, ((node['id'], node) for node in reader.nodes()), edges()
+
+    with f:
+        data = json.loads(first + f.read())
+    return data.get('analytic_question'), iter(data.get('nodes', {}).items()), iter(data.get('edges', []))
+
+
+class InvestigationStore:
+    """SQLite index over many exported investigation graphs"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or twitter_config.INVESTIGATION_STORE_PATH
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    # Ingestion
+    def ingest_paths(self, paths: Optional[Iterable[str]] = None, force: bool = False) -> Dict[str, int]:
+        """Ingest files (glob patterns allowed); returns counts of ingested, skipped and failed files"""
+        summary = {'ingested': 0, 'skipped': 0, 'failed': 0}
+        # The same investigation exported to several places: keep the most recently written file
+        latest: Dict[str, str] = {}
+        for pattern in (default_graph_paths() if paths is None else paths):
+            for path in (sorted(glob.glob(pattern)) or [pattern]):
+                investigation_id = investigation_id_for_path(path)
+                current = latest.get(investigation_id)
+                if current is None or _mtime(path) > _mtime(current):
+                    latest[investigation_id] = path
+
+        for investigation_id, path in latest.items():
+            try:
+                if self.ingest_file(path, investigation_id, force=force):
+                    summary['ingested'] += 1
+                else:
+                    summary['skipped'] += 1
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.warning(f"Could not ingest {path}: {e}")
+                summary['failed'] += 1
+        return summary
+
+    def ingest_file(self, path: str, investigation_id: Optional[str] = None, force: bool = False) -> bool:
+        """Ingest one exported graph; returns False if it was already ingested unchanged"""
+        investigation_id = investigation_id or investigation_id_for_path(path)
+        stat = os.stat(path)
+        if not force:
+            row = self._conn.execute(
+                "SELECT file_size, file_mtime FROM investigations WHERE investigation_id = ?", (investigation_id,)
+            ).fetchone()
+            if row and row['file_size'] == stat.st_size and row['file_mtime'] == stat.st_mtime:
+                return False
+
+        analytic_id, nodes, edges = _read_graph_documents(path)
+        self._ingest(investigation_id, nodes, edges, analytic_id,
+                     source_path=os.path.abspath(path), file_size=stat.st_size, file_mtime=stat.st_mtime)
+        return True
+
+    def ingest_graph(self, graph, investigation_id: str) -> None:
+        """Ingest a live InvestigationGraph (e.g. right after export)"""
+        nodes = ((document['id'], document) for document in map(graph.serialize_node, list(graph.nodes.values())))
+        edges = map(graph.serialize_edge, list(graph.edges))
+        self._ingest(investigation_id, nodes, edges, graph.serialized_node_id(graph.analytic_question))
+
+    def _ingest(self, investigation_id: str, nodes: Iterable[Tuple[str, Dict]], edges: Iterable[Dict],
+                analytic_id: Optional[str], source_path: Optional[str] = None,
+                file_size: Optional[int] = None, file_mtime: Optional[float] = None) -> None:
+        with self._lock, self._conn:
+            self._delete(investigation_id)
+
+            analytic_question = None
+            graph_created_at = None
+            node_count = 0
+            for node_id, node in nodes:
+                properties = node.get('properties') or {}
+                endpoint, query_text, content = _node_columns(node)
+                created_at = node.get('created_at')
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO nodes (investigation_id, node_id, node_type, created_at, endpoint, "
+                    "query_text, content, properties) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (investigation_id, node_id, node['node_type'], created_at, endpoint, query_text, content,
+                     json.dumps(properties, default=str))
+                )
+                if not cursor.rowcount:
+                    continue  # Duplicate node id
+                if content and node['node_type'] in FTS_NODE_TYPES:
+                    self._conn.execute("INSERT INTO content_fts (rowid, content) VALUES (?, ?)",
+                                       (cursor.lastrowid, content))
+                self._conn.executemany(
+                    "INSERT INTO node_properties (investigation_id, node_id, key, value) VALUES (?, ?, ?, ?)",
+                    [(investigation_id, node_id, key, str(value)) for key, value in properties.items()
+                     if isinstance(value, (str, int, float, bool))]
+                )
+                if node_id == analytic_id:
+                    analytic_question = properties.get('text')
+                if created_at and (graph_created_at is None or created_at < graph_created_at):
+                    graph_created_at = created_at
+                node_count += 1
+
+            edge_count = 0
+            for edge in edges:
+                self._conn.execute(
+                    "INSERT INTO edges (investigation_id, edge_id, source_id, target_id, edge_type, created_at, "
+                    "properties) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (investigation_id, edge.get('id'), edge['source_id'], edge['target_id'], edge['edge_type'],
+                     edge.get('created_at'), json.dumps(edge.get('properties') or {}, default=str))
+                )
+                edge_count += 1
+
+            self._conn.execute(
+                "INSERT INTO investigations (investigation_id, source_path, analytic_question, created_at, file_size, "
+                "file_mtime, node_count, edge_count, ingested_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (investigation_id, source_path, analytic_question, graph_created_at, file_size, file_mtime,
+                 node_count, edge_count, datetime.now().isoformat())
+            )
+        logger.info(f"Ingested investigation {investigation_id}: {node_count} nodes, {edge_count} edges")
+
+    def _delete(self, investigation_id: str) -> None:
+        self._conn.execute("DELETE FROM content_fts WHERE rowid IN "
+                           "(SELECT id FROM nodes WHERE investigation_id = ?)", (investigation_id,))
+        for table in ('nodes', 'edges', 'node_properties', 'investigations'):
+            self._conn.execute(f"DELETE FROM {table} WHERE investigation_id = ?", (investigation_id,))
+
+    def remove_investigation(self, investigation_id: str) -> None:
+        with self._lock, self._conn:
+            self._delete(investigation_id)
+
+    # Queries
+    def search_content(self, text: str, node_types: Sequence[str] = FTS_NODE_TYPES,
+                       investigation_id: Optional[str] = None, limit: int = 50,
+                       raw_query: bool = False) -> List[Dict[str, Any]]:
+        """
+        DataPoint/Insight nodes whose content matches text, best matches first.
+
+        text is matched as a phrase unless raw_query=True, which passes FTS5
+        query syntax (AND/OR/NEAR, prefix*) through unchanged.
+        """
+        match = text if raw_query else '"' + text.replace('"', '""') + '"'
+        sql = ("SELECT nodes.*, bm25(content_fts) AS rank FROM content_fts "
+               "JOIN nodes ON nodes.id = content_fts.rowid WHERE content_fts MATCH ?")
+        params: List[Any] = [match]
+        if node_types:
+            sql += f" AND nodes.node_type IN ({','.join('?' * len(node_types))})"
+            params.extend(node_types)
+        if investigation_id:
+            sql += " AND nodes.investigation_id = ?"
+            params.append(investigation_id)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        return self._fetch(sql, params)
+
+    def find_nodes(self, node_type: Optional[str] = None, endpoint: Optional[str] = None,
+                   query_text: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+                   investigation_id: Optional[str] = None, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Nodes matching all given filters (query_text is compared case/whitespace-insensitively)"""
+        clauses, params = [], []
+        for column, value in (('node_type', node_type), ('endpoint', endpoint),
+                              ('query_text', normalize_query_text(query_text)),
+                              ('investigation_id', investigation_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("created_at < ?")
+            params.append(until)
+        sql = "SELECT * FROM nodes"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at LIMIT ?"
+        params.append(limit)
+        return self._fetch(sql, params)
+
+    def find_by_property(self, key: str, value: Any, node_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Nodes with a scalar property equal to value"""
+        sql = ("SELECT nodes.* FROM node_properties JOIN nodes ON nodes.investigation_id = node_properties.investigation_id "
+               "AND nodes.node_id = node_properties.node_id WHERE node_properties.key = ? AND node_properties.value = ?")
+        params: List[Any] = [key, str(value)]
+        if node_type:
+            sql += " AND nodes.node_type = ?"
+            params.append(node_type)
+        return self._fetch(sql, params)
+
+    def get_edges(self, investigation_id: str, node_id: str, direction: str = 'out') -> List[Dict[str, Any]]:
+        column = 'source_id' if direction == 'out' else 'target_id'
+        return self._fetch(f"SELECT * FROM edges WHERE investigation_id = ? AND {column} = ?",
+                           [investigation_id, node_id])
+
+    def list_investigations(self) -> List[Dict[str, Any]]:
+        return self._fetch("SELECT * FROM investigations ORDER BY created_at", [])
+
+    def find_similar_investigations(self, question: str, limit: int = 3, min_similarity: Optional[float] = None,
+                                    exclude_ids: Sequence[str] = ()) -> List[Dict[str, Any]]:
+        """Investigations whose analytic question shares most of its terms with question, most similar first"""
+        if min_similarity is None:
+            min_similarity = twitter_config.PRIOR_INVESTIGATION_MIN_SIMILARITY
+        terms = question_terms(question)
+        if not terms:
+            return []
+
+        similar = []
+        for investigation in self.list_investigations():
+            if investigation['investigation_id'] in exclude_ids or not investigation['analytic_question']:
+                continue
+            other = question_terms(investigation['analytic_question'])
+            similarity = len(terms & other) / len(terms | other) if other else 0.0
+            if similarity >= min_similarity:
+                similar.append({**investigation, 'similarity': similarity})
+        similar.sort(key=lambda i: (i['similarity'], i['created_at'] or ''), reverse=True)
+        return similar[:limit]
+
+    def get_prior_knowledge(self, investigation_id: str, max_datapoints: Optional[int] = None) -> Dict[str, Any]:
+        """
+        What a past investigation established, for seeding a new one.
+
+        Returns its Insights, DataPoints (those supporting an Insight first,
+        capped at max_datapoints), the SUPPORTS links between them, and its
+        SearchQuery nodes with the number of DataPoints each one produced.
+        """
+        if max_datapoints is None:
+            max_datapoints = twitter_config.PRIOR_INVESTIGATION_MAX_DATAPOINTS
+        insights = self.find_nodes(node_type="Insight", investigation_id=investigation_id)
+        supports = self._fetch("SELECT source_id, target_id FROM edges WHERE investigation_id = ? "
+                               "AND edge_type = 'SUPPORTS'", [investigation_id])
+        supporting = {edge['source_id'] for edge in supports}
+        datapoints = self.find_nodes(node_type="DataPoint", investigation_id=investigation_id)
+        datapoints.sort(key=lambda dp: dp['node_id'] not in supporting)
+        datapoints = datapoints[:max_datapoints]
+
+        included = {node['node_id'] for node in insights + datapoints}
+        searches = self._fetch(
+            "SELECT s.*, (SELECT COUNT(*) FROM edges e JOIN nodes t ON t.investigation_id = e.investigation_id "
+            "AND t.node_id = e.target_id WHERE e.investigation_id = s.investigation_id AND e.source_id = s.node_id "
+            "AND t.node_type = 'DataPoint') AS datapoint_count FROM nodes s "
+            "WHERE s.investigation_id = ? AND s.node_type = 'SearchQuery'", [investigation_id]
+        )
+        return {
+            'investigation_id': investigation_id,
+            'insights': insights,
+            'datapoints': datapoints,
+            'supports': [(edge['source_id'], edge['target_id']) for edge in supports
+                         if edge['source_id'] in included and edge['target_id'] in included],
+            'searches': searches
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        counts = {table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ('investigations', 'nodes', 'edges')}
+        counts['db_path'] = self.db_path
+        return counts
+
+    def _fetch(self, sql: str, params: List[Any]) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        results = []
+        for row in rows:
+            record = dict(row)
+            if 'properties' in record and record['properties']:
+                record['properties'] = json.loads(record['properties'])
+            results.append(record)
+        return results
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store: Optional[InvestigationStore] = None
+_store_lock = threading.Lock()
+
+
+def get_investigation_store() -> InvestigationStore:
+    """Global store at INVESTIGATION_STORE_PATH"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = InvestigationStore()
+    return _store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--db', default=None, help='SQLite path (default: INVESTIGATION_STORE_PATH)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help='Load exported graphs into the store')
+    ingest.add_argument('paths', nargs='*', help='Files or glob patterns (default: repo root and investigations/outputs)')
+    ingest.add_argument('--force', action='store_true', help='Re-ingest unchanged files')
+
+    search = commands.add_parser('search', help='Full-text search over DataPoint/Insight content')
+    search.add_argument('text')
+    search.add_argument('--type', action='append', dest='node_types', choices=FTS_NODE_TYPES)
+    search.add_argument('--limit', type=int, default=20)
+
+    commands.add_parser('stats', help='Show row counts')
+    args = parser.parse_args()
+
+    store = InvestigationStore(args.db)
+    if args.command == 'ingest':
+        summary = store.ingest_paths(args.paths or None, force=args.force)
+        print(f"Ingested {summary['ingested']}, skipped {summary['skipped']} unchanged, {summary['failed']} failed")
+        print(store.get_stats())
+    elif args.command == 'search':
+        for row in store.search_content(args.text, node_types=args.node_types or FTS_NODE_TYPES, limit=args.limit):
+            print(f"[{row['investigation_id'][:8]}] {row['node_type']}: {row['content'][:120]}")
+    else:
+        print(store.get_stats())
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,15 +7,29 @@ for strategic decision making and analysis.
 """
 
 import os
+import sys
 import json
+import time
+import asyncio
+import logging
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Union
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
-from datetime import datetime
+
+from response_cache import get_llm_response_cache, make_cache_key
+from traffic_cassette import get_active_cassette
+from utils.stage_timer import get_stage_timer
+import twitter_config
+
+logger = logging.getLogger(__name__)
+logger.setLevel(twitter_config.LLM_CALL_LOG_LEVEL)
 
 # Import LLM call tracer
 try:
-    from .utils.llm_call_tracer import get_tracer
+    from utils.llm_call_tracer import get_tracer
     TRACER_AVAILABLE = True
 except ImportError:
     TRACER_AVAILABLE = False
@@ -99,6 +113,82 @@ def _load_api_keys_to_environment():
     print(f"LiteLLM: Loaded {len(loaded_keys)} API keys: {list(loaded_keys.keys())}")
     return loaded_keys
 
+def _caller_location(frame) -> str:
+    """'file.py:line:function' for the frame that called into the client"""
+    # Skip LiteLLMClient's own wrappers (simple_completion, completion_many, ...)
+    while frame is not None and frame.f_code.co_filename == __file__:
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno}:{frame.f_code.co_name}"
+
+
+def _fix_schema_for_structured_output(schema_obj):
+    """Ensure additionalProperties is false and a required array exists for all objects (required for structured output)"""
+    if isinstance(schema_obj, dict):
+        if schema_obj.get("type") == "object":
+            schema_obj["additionalProperties"] = False
+            # Ensure required array exists - if missing and has properties, set to empty array
+            if "properties" in schema_obj and "required" not in schema_obj:
+                schema_obj["required"] = []
+        # Recursively fix nested objects
+        for value in schema_obj.values():
+            if isinstance(value, dict):
+                _fix_schema_for_structured_output(value)
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, dict):
+                        _fix_schema_for_structured_output(item)
+
+
+@lru_cache(maxsize=None)
+def _structured_output_json(response_format: type) -> str:
+    schema = response_format.model_json_schema()
+    _fix_schema_for_structured_output(schema)
+    return json.dumps({
+        "type": "json_schema",
+        "json_schema": {
+            "name": getattr(response_format, '__name__', 'structured_output'),
+            "strict": True,
+            "schema": schema
+        }
+    })
+
+
+def _structured_output_format(response_format: type) -> Dict[str, Any]:
+    """Memoized response_format for a Pydantic model; a fresh dict per call since providers may mutate it"""
+    return json.loads(_structured_output_json(response_format))
+
+
+def get_provider(model: str) -> str:
+    """Provider name used for concurrency caps (litellm 'provider/model' prefix or model family)"""
+    if '/' in model:
+        return model.split('/', 1)[0].lower()
+    lowered = model.lower()
+    if lowered.startswith(('gpt', 'o1', 'o3', 'o4', 'text-embedding')):
+        return 'openai'
+    if lowered.startswith('claude'):
+        return 'anthropic'
+    if lowered.startswith('gemini'):
+        return 'gemini'
+    return 'default'
+
+
+_provider_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_provider_semaphores_lock = threading.Lock()
+
+
+def _provider_semaphore(model: str) -> threading.BoundedSemaphore:
+    """Process-wide cap on in-flight calls per provider, shared by all fan-out callers"""
+    provider = get_provider(model)
+    with _provider_semaphores_lock:
+        if provider not in _provider_semaphores:
+            limits = twitter_config.LLM_MAX_CONCURRENCY_PER_PROVIDER
+            limit = limits.get(provider, limits.get('default', 4))
+            _provider_semaphores[provider] = threading.BoundedSemaphore(limit)
+        return _provider_semaphores[provider]
+
+
 class LiteLLMClient:
     """
     LiteLLM client wrapper with structured output support
@@ -124,13 +214,14 @@ class LiteLLMClient:
             model: Model name (e.g., "gpt-5-mini")
             messages: List of message dicts with role and content
             response_format: Optional pydantic model or dict for structured output
-            **kwargs: Additional parameters for litellm
+            **kwargs: Additional parameters for litellm; cache=False bypasses the response cache
             
         Returns:
             LiteLLM completion response with structured output if requested
         """
         if not LITELLM_AVAILABLE:
             raise RuntimeError("LiteLLM not available")
+        use_cache = kwargs.pop('cache', True)
         
         # Track LLM call with enhanced visibility
         tracer = get_tracer() if TRACER_AVAILABLE else None
@@ -140,19 +231,39 @@ class LiteLLMClient:
         if 'purpose' in kwargs:
             purpose = kwargs.pop('purpose')
         
-        # Add stack trace for call source identification
-        import traceback
-        caller_info = traceback.extract_stack()[-3]  # Get the caller's info
-        caller_location = f"{caller_info.filename.split('/')[-1]}:{caller_info.lineno}:{caller_info.name}"
+        # Caller attribution from the frame pointer (no full stack walk or source lookup)
+        caller_location = _caller_location(sys._getframe(1))
+        logger.info("LLM call: %s | model=%s | input=%d chars | from %s", purpose, model, data_size, caller_location)
+        started = time.perf_counter()
         
-        # CONSOLE VISIBILITY - Print every LLM call in real-time
-        print(f"LLM CALL #{len(tracer.calls) + 1 if tracer else '?'}: {purpose}")
-        print(f"   Called from: {caller_location}")
-        print(f"   Model: {model}")
-        print(f"   Input size: {data_size} chars")
-        print(f"   Timestamp: {datetime.now().strftime('%H:%M:%S')}")
+        # Prepare parameters for direct litellm.completion call
+        # LiteLLM auto-detects provider based on model name and environment variables
+        completion_params = {
+            "model": model,
+            "messages": messages.copy(),  # Work with copy to avoid modifying original
+            **kwargs
+        }
         
-        if tracer:
+        # Add structured output support if requested
+        if response_format:
+            if isinstance(response_format, dict):
+                # Direct dict format (already converted for OpenAI JSON mode)
+                completion_params["response_format"] = response_format
+            elif hasattr(response_format, 'model_json_schema'):
+                # Pydantic model - strict json_schema format, built once per class
+                completion_params["response_format"] = _structured_output_format(response_format)
+            else:
+                # Fallback to JSON mode for OpenAI
+                completion_params["response_format"] = {"type": "json_object"}
+        
+        # Exact-match response cache: identical model/messages/schema/temperature reuse the stored answer.
+        # Looked up before start_call so a hit is counted as a cache hit, not as an LLM call
+        cache_key = self._response_cache_key(completion_params) if use_cache and self._response_cache_enabled() else None
+        cached = self._cached_response(cache_key) if cache_key else None
+        if tracer and cache_key:
+            tracer.record_cache_lookup(cached is not None)
+        
+        if tracer and cached is None:
             call_id = tracer.start_call(
                 component="llm_client", 
                 purpose=purpose,
@@ -163,82 +274,10 @@ class LiteLLMClient:
             tracer.calls[call_id].metadata['caller_location'] = caller_location
             
         try:
-            # Prepare parameters for direct litellm.completion call
-            # LiteLLM auto-detects provider based on model name and environment variables
-            completion_params = {
-                "model": model,
-                "messages": messages.copy(),  # Work with copy to avoid modifying original
-                **kwargs
-            }
-            
-            # Add structured output support if requested
-            if response_format:
-                if isinstance(response_format, dict):
-                    # Direct dict format (already converted for OpenAI JSON mode)
-                    completion_params["response_format"] = response_format
-                elif hasattr(response_format, 'model_json_schema'):
-                    # Pydantic model - convert to new structured output format
-                    schema = response_format.model_json_schema()
-                    
-                    # Ensure additionalProperties is false and required array exists for all objects (required for structured output)
-                    def fix_schema_for_structured_output(schema_obj):
-                        if isinstance(schema_obj, dict):
-                            if schema_obj.get("type") == "object":
-                                schema_obj["additionalProperties"] = False
-                                # Ensure required array exists - if missing and has properties, set to empty array
-                                if "properties" in schema_obj and "required" not in schema_obj:
-                                    schema_obj["required"] = []
-                            # Recursively fix nested objects
-                            for key, value in schema_obj.items():
-                                if isinstance(value, dict):
-                                    fix_schema_for_structured_output(value)
-                                elif isinstance(value, list):
-                                    for item in value:
-                                        if isinstance(item, dict):
-                                            fix_schema_for_structured_output(item)
-                    
-                    fix_schema_for_structured_output(schema)
-                    
-                    completion_params["response_format"] = {
-                        "type": "json_schema",
-                        "json_schema": {
-                            "name": getattr(response_format, '__name__', 'structured_output'),
-                            "strict": True,
-                            "schema": schema
-                        }
-                    }
-                else:
-                    # Fallback to JSON mode for OpenAI
-                    completion_params["response_format"] = {"type": "json_object"}
-            
-            # Make the direct litellm API call with retry logic
-            max_retries = 3
-            retry_count = 0
-            
-            while retry_count <= max_retries:
-                try:
-                    response = completion(**completion_params)
-                    break  # Success, exit retry loop
-                    
-                except Exception as e:
-                    error_str = str(e).lower()
-                    
-                    # Check for retryable errors (503 service unavailable, rate limits, timeouts)
-                    if (retry_count < max_retries and 
-                        ('503' in error_str or 'service unavailable' in error_str or 
-                         'overloaded' in error_str or 'rate limit' in error_str or
-                         'timeout' in error_str or 'connection' in error_str)):
-                        
-                        wait_time = (2 ** retry_count) + 1  # Exponential backoff: 2s, 5s, 9s
-                        print(f"LLM service error ({error_str[:100]}), retrying in {wait_time}s ({retry_count+1}/{max_retries})")
-                        
-                        import time
-                        time.sleep(wait_time)
-                        retry_count += 1
-                        continue
-                    else:
-                        # Non-retryable error or max retries exceeded
-                        raise e
+            if cached is not None:
+                response = litellm.ModelResponse(**cached)
+            else:
+                response = self._call_with_retries(completion_params)
             
             # If structured output requested and it's a Pydantic model, parse and attach
             if (response_format and hasattr(response_format, 'model_json_schema') 
@@ -263,19 +302,18 @@ class LiteLLMClient:
                         
                 except (json.JSONDecodeError, TypeError, ValueError) as e:
                     # If parsing fails, set parsed to None but don't crash
-                    print(f"Warning: Failed to parse structured output: {e}")
-                    print(f"Raw content: {content[:200] if 'content' in locals() else 'None'}")
+                    logger.warning("Failed to parse structured output: %s | raw content: %s",
+                                   e, content[:200] if 'content' in locals() else 'None')
                     response.choices[0].message.parsed = None
             
+            if cache_key and cached is None:
+                self._store_cached_response(cache_key, response, response_format)
+            
             # Track successful completion
             response_size = len(str(response.choices[0].message.content)) if response.choices and response.choices[0].message else 0
-            duration_ms = (datetime.now().timestamp() - tracer.calls[call_id].timestamp.timestamp()) * 1000 if tracer and call_id is not None else 0
-            
-            print(f"LLM CALL COMPLETED: {purpose}")
-            print(f"   Response size: {response_size} chars")
-            print(f"   Duration: {duration_ms:.0f}ms")
-            print(f"   Total calls this session: {len(tracer.calls) if tracer else '?'}")
-            print("   " + "="*50)
+            logger.info("LLM call completed: %s%s | response=%d chars | %.0fms",
+                        purpose, " (cache hit)" if cached is not None else "", response_size,
+                        (time.perf_counter() - started) * 1000)
             
             if tracer and call_id is not None:
                 tracer.end_call(call_id, success=True, metadata={'response_size': response_size})
@@ -283,17 +321,153 @@ class LiteLLMClient:
             return response
             
         except Exception as e:
-            # Track failed completion with console output
-            print(f"LLM CALL FAILED: {purpose}")
-            print(f"   Called from: {caller_location}")
-            print(f"   Error: {str(e)[:100]}")
-            print("   " + "="*50)
+            # Track failed completion
+            logger.warning("LLM call failed: %s | from %s | %s", purpose, caller_location, str(e)[:100])
             
             if tracer and call_id is not None:
                 tracer.end_call(call_id, success=False, error=str(e))
             # Re-raise with more context
             raise RuntimeError(f"LiteLLM completion failed: {e}")
     
+    def _call_with_retries(self, completion_params: Dict[str, Any]):
+        """Make the direct litellm API call with retry logic"""
+        max_retries = 3
+        retry_count = 0
+        
+        while retry_count <= max_retries:
+            try:
+                response = self._call_litellm(completion_params)
+                break  # Success, exit retry loop
+                
+            except Exception as e:
+                error_str = str(e).lower()
+                
+                # Check for retryable errors (503 service unavailable, rate limits, timeouts)
+                if (retry_count < max_retries and 
+                    ('503' in error_str or 'service unavailable' in error_str or 
+                     'overloaded' in error_str or 'rate limit' in error_str or
+                     'timeout' in error_str or 'connection' in error_str)):
+                    
+                    wait_time = (2 ** retry_count) + 1  # Exponential backoff: 2s, 5s, 9s
+                    logger.warning("LLM service error (%s), retrying in %ss (%d/%d)",
+                                   error_str[:100], wait_time, retry_count + 1, max_retries)
+                    
+                    time.sleep(wait_time)
+                    retry_count += 1
+                    continue
+                else:
+                    # Non-retryable error or max retries exceeded
+                    raise e
+        return response
+    
+    @staticmethod
+    def _response_cache_enabled() -> bool:
+        # A record/replay cassette must see every call, so the cache stays out of its way
+        return twitter_config.LLM_CACHE_ENABLED and get_active_cassette() is None
+    
+    @staticmethod
+    def _response_cache_key(completion_params: Dict[str, Any]) -> str:
+        """Key on the full request; runs of whitespace in message content collapse so re-indented prompts still match"""
+        normalized = dict(completion_params)
+        normalized['messages'] = [
+            {**msg, 'content': " ".join(msg['content'].split())} if isinstance(msg.get('content'), str) else msg
+            for msg in completion_params['messages']
+        ]
+        return make_cache_key('llm', normalized)
+    
+    @staticmethod
+    def _cached_response(cache_key: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached response payload or None. Cache failures count as misses."""
+        try:
+            return get_llm_response_cache().get(cache_key)
+        except Exception as e:
+            logger.warning("LLM response cache lookup failed: %s", e)
+            return None
+    
+    @staticmethod
+    def _store_cached_response(cache_key: str, response, response_format):
+        """Store a response without its parsed object; hits re-parse it against response_format"""
+        message = response.choices[0].message if response.choices else None
+        if (response_format is not None and hasattr(response_format, 'model_json_schema')
+                and getattr(message, 'parsed', None) is None):
+            return  # Don't pin a response that failed structured parsing
+        payload = response.model_dump()
+        for choice in payload.get('choices', []):
+            if isinstance(choice.get('message'), dict):
+                choice['message'].pop('parsed', None)
+        try:
+            get_llm_response_cache().set(cache_key, payload)
+        except Exception as e:
+            logger.warning("LLM response cache store failed: %s", e)
+    
+    def _completion_capped(self, request: Dict[str, Any]):
+        """completion() for one request dict, holding the provider's concurrency slot"""
+        request = dict(request)
+        model = request.pop('model')
+        messages = request.pop('messages')
+        with _provider_semaphore(model):
+            return self.completion(model, messages, **request)
+    
+    async def acompletion(self, model: str, messages: List[Dict[str, str]],
+                          response_format: Optional[Union[BaseModel, Dict[str, Any]]] = None, **kwargs):
+        """
+        Async completion with the same structured-output parsing and retry logic as completion().
+        
+        The blocking call runs on a worker thread, so retries back off without stalling the event loop.
+        """
+        request = {'model': model, 'messages': messages, 'response_format': response_format, **kwargs}
+        return await asyncio.to_thread(self._completion_capped, request)
+    
+    def completion_many(self, requests: List[Dict[str, Any]], max_concurrency: Optional[int] = None,
+                        return_exceptions: bool = False) -> List[Any]:
+        """
+        Run independent completions concurrently.
+        
+        Args:
+            requests: dicts with 'model', 'messages' and any completion() kwargs
+                      (response_format, purpose, ...)
+            max_concurrency: Max calls in flight for this batch (per-provider caps still apply)
+            return_exceptions: Put exceptions in the result list instead of raising the first one
+            
+        Returns:
+            Responses in the same order as requests
+        """
+        if not requests:
+            return []
+        max_workers = max(1, min(max_concurrency or twitter_config.LLM_DEFAULT_MAX_CONCURRENCY, len(requests)))
+        if max_workers == 1:
+            results = []
+            for request in requests:
+                try:
+                    results.append(self._completion_capped(request))
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results.append(e)
+            return results
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm") as executor:
+            futures = [executor.submit(self._completion_capped, request) for request in requests]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    if not return_exceptions:
+                        for pending in futures:
+                            pending.cancel()
+                        raise
+                    results.append(e)
+            return results
+    
+    def _call_litellm(self, completion_params: Dict[str, Any]):
+        """Single litellm.completion call, routed through the record/replay cassette if one is active"""
+        get_stage_timer().count_llm_call()
+        cassette = get_active_cassette()
+        if cassette is not None:
+            return cassette.llm_completion(completion_params, lambda: completion(**completion_params))
+        return completion(**completion_params)
+    
     def simple_completion(self, model: str, prompt: str, **kwargs) -> str:
         """
         Simple text completion without structured output
@@ -0,0 +1,210 @@
+# local_embeddings.py
+"""
+Local Embeddings - CPU-only Text Vectors and an In-Memory DataPoint Index
+
+Lets RealTimeInsightSynthesizer cluster DataPoints and judge group cohesion
+without an LLM call. Two backends:
+
+- HashedTfidfEmbedder (default): signed feature hashing of word unigrams and
+  bigrams with sublinear term frequency. Raw term-frequency rows are stored
+  and IDF weights from the documents indexed so far are applied whenever
+  vectors are read, so earlier DataPoints never carry stale weights.
+- SentenceTransformerEmbedder: a small sentence-transformers model, used when
+  the package is installed and LOCAL_EMBEDDING_BACKEND selects it.
+
+Similarity thresholds differ per backend; each embedder carries defaults that
+twitter_config can override.
+"""
+
+import hashlib
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import twitter_config
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9'_-]*")
+_URL = re.compile(r'https?://\S+')
+_STOP_WORDS = {
+    'the', 'a', 'an', 'and', 'or', 'but', 'of', 'to', 'in', 'on', 'at', 'for', 'with', 'from', 'by',
+    'is', 'are', 'was', 'were', 'be', 'been', 'it', 'its', 'this', 'that', 'as', 'rt', 'via', 'amp'
+}
+
+
+def _features(text: str) -> List[str]:
+    tokens = [t for t in _TOKEN.findall(_URL.sub(' ', str(text or '').lower())) if t not in _STOP_WORDS]
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+class HashedTfidfEmbedder:
+    """Feature-hashed TF-IDF vectors; fitted incrementally as documents are indexed"""
+
+    name = 'hashed'
+    group_similarity = 0.2
+    min_cohesion = 0.25
+
+    def __init__(self, dim: Optional[int] = None):
+        self.dim = dim or twitter_config.LOCAL_EMBEDDING_DIM
+        self.documents = 0
+        self.document_frequency = np.zeros(self.dim, dtype=np.float32)
+
+    def _bucket(self, feature: str):
+        value = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+        return value % self.dim, 1.0 if value >> 63 else -1.0
+
+    def embed_raw(self, texts: Sequence[str]) -> 'np.ndarray':
+        """Signed sublinear term-frequency rows (no IDF), one per text"""
+        rows = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            counts: Dict[int, float] = {}
+            for feature in _features(text):
+                bucket, sign = self._bucket(feature)
+                counts[bucket] = counts.get(bucket, 0.0) + sign
+            for bucket, count in counts.items():
+                rows[i, bucket] = np.sign(count) * (1.0 + np.log(abs(count))) if count else 0.0
+        return rows
+
+    def observe(self, raw: 'np.ndarray'):
+        """Update document frequencies with newly indexed rows"""
+        self.documents += raw.shape[0]
+        self.document_frequency += (raw != 0).sum(axis=0)
+
+    def finalize(self, raw: 'np.ndarray') -> 'np.ndarray':
+        """Apply current IDF weights and L2-normalize"""
+        idf = np.log((1.0 + self.documents) / (1.0 + self.document_frequency)) + 1.0
+        return _normalize(raw * idf[None, :])
+
+
+class SentenceTransformerEmbedder:
+    """Dense sentence embeddings from a small local sentence-transformers model"""
+
+    name = 'sentence-transformers'
+    group_similarity = 0.55
+    min_cohesion = 0.5
+
+    def __init__(self, model_name: Optional[str] = None):
+        self.model = SentenceTransformer(model_name or twitter_config.LOCAL_EMBEDDING_MODEL, device='cpu')
+
+    def embed_raw(self, texts: Sequence[str]) -> 'np.ndarray':
+        return np.asarray(self.model.encode(list(texts), convert_to_numpy=True), dtype=np.float32)
+
+    def observe(self, raw: 'np.ndarray'):
+        pass
+
+    def finalize(self, raw: 'np.ndarray') -> 'np.ndarray':
+        return _normalize(raw)
+
+
+def _normalize(matrix: 'np.ndarray') -> 'np.ndarray':
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def get_embedder(backend: Optional[str] = None):
+    """Embedder for LOCAL_EMBEDDING_BACKEND ('hashed', 'sentence-transformers' or 'auto'), None without NumPy"""
+    if not NUMPY_AVAILABLE:
+        return None
+    backend = backend or twitter_config.LOCAL_EMBEDDING_BACKEND
+    if backend in ('sentence-transformers', 'auto') and SENTENCE_TRANSFORMERS_AVAILABLE:
+        try:
+            return SentenceTransformerEmbedder()
+        except Exception as e:
+            logger.warning(f"Could not load sentence-transformers model, using hashed TF-IDF: {e}")
+    elif backend == 'sentence-transformers':
+        logger.warning("sentence-transformers is not installed, using hashed TF-IDF embeddings")
+    return HashedTfidfEmbedder()
+
+
+def cosine_similarity_matrix(vectors: 'np.ndarray') -> 'np.ndarray':
+    """Pairwise cosine similarities of L2-normalized rows"""
+    return vectors @ vectors.T
+
+
+def cluster_by_similarity(vectors: 'np.ndarray', threshold: float) -> List[List[int]]:
+    """Connected components of the graph linking rows with cosine >= threshold
+
+    Labels propagate as the minimum label over each row's neighbours until
+    stable, so every step is one vectorized pass over the similarity matrix.
+    Clusters are returned largest first, members in input order.
+    """
+    n = vectors.shape[0]
+    if n == 0:
+        return []
+    adjacency = cosine_similarity_matrix(vectors) >= threshold
+    np.fill_diagonal(adjacency, True)
+    labels = np.arange(n)
+    while True:
+        updated = np.where(adjacency, labels[None, :], n).min(axis=1)
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+    clusters: Dict[int, List[int]] = {}
+    for index, label in enumerate(labels.tolist()):
+        clusters.setdefault(label, []).append(index)
+    return sorted(clusters.values(), key=lambda members: (-len(members), members[0]))
+
+
+def cohesion(vectors: 'np.ndarray') -> float:
+    """Mean pairwise cosine similarity of a group (0.0 for fewer than two rows)"""
+    n = vectors.shape[0]
+    if n < 2:
+        return 0.0
+    similarities = cosine_similarity_matrix(vectors)
+    return float((similarities.sum() - np.trace(similarities)) / (n * (n - 1)))
+
+
+class VectorIndex:
+    """In-memory matrix of embeddings keyed by node id"""
+
+    def __init__(self, embedder):
+        self.embedder = embedder
+        self._positions: Dict[str, int] = {}
+        self._raw = None  # Grown by doubling; rows beyond len(self) are unused
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._positions
+
+    def add(self, node_ids: Iterable[str], texts: Iterable[str]):
+        """Embed and store texts; ids already indexed are skipped"""
+        new = [(node_id, text) for node_id, text in zip(node_ids, texts) if node_id not in self._positions]
+        if not new:
+            return
+        raw = self.embedder.embed_raw([text for _, text in new])
+        self.embedder.observe(raw)
+        offset = len(self._positions)
+        if self._raw is None:
+            self._raw = np.zeros((max(64, len(new)), raw.shape[1]), dtype=raw.dtype)
+        elif offset + len(new) > self._raw.shape[0]:
+            grown = np.zeros((max(2 * self._raw.shape[0], offset + len(new)), raw.shape[1]), dtype=raw.dtype)
+            grown[:offset] = self._raw[:offset]
+            self._raw = grown
+        self._raw[offset:offset + len(new)] = raw
+        for i, (node_id, _) in enumerate(new):
+            self._positions[node_id] = offset + i
+
+    def vectors(self, node_ids: Sequence[str]) -> 'np.ndarray':
+        """Normalized embeddings for indexed ids, in the given order"""
+        rows = [self._positions[node_id] for node_id in node_ids]
+        return self.embedder.finalize(self._raw[rows])
+
+    def query(self, text: str) -> 'np.ndarray':
+        """Normalized embedding for text that is not stored in the index"""
+        return self.embedder.finalize(self.embedder.embed_raw([text]))[0]
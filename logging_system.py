@@ -144,6 +144,13 @@ class InvestigationLogger:
         
         return session_id
     
+    def resume_session(self, session_id: str, user_query: str) -> str:
+        """Continue logging to an existing session (resumed from a checkpoint)"""
+        self.current_session_id = session_id
+        self.session_start_time = datetime.now(timezone.utc)
+        self.system_logger.info(f"Resumed investigation session {session_id} for query: {user_query[:50]}...")
+        return session_id
+    
     def end_session(self, session):
         """Log investigation session completion"""
         if not self.current_session_id or not self.session_start_time:
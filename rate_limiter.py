@@ -0,0 +1,277 @@
+# rate_limiter.py
+"""
+Client-Side Token Bucket Rate Limiter
+
+A process-wide limiter shared by every RapidAPI caller. Instead of firing
+requests until the API answers 429 and then backing off, callers reserve a
+token before each request and sleep briefly if the bucket is empty, so
+concurrent searches and investigations queue rather than stampede.
+
+The bucket also tracks RapidAPI's X-RateLimit-* response headers: when the
+server says the quota is exhausted, all callers pause until it resets - or,
+when the reset is further away than RATE_LIMITER_MAX_BLOCK_SECONDS (RapidAPI
+reports the time left in the billing period), fail fast with
+QuotaExhaustedError instead of sleeping. Bucket
+state can optionally live in an SQLite file so several processes on the same
+machine share one quota.
+"""
+
+import asyncio
+import bisect
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import twitter_config as config
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the wait-time histogram buckets
+WAIT_HISTOGRAM_BOUNDS = [0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0]
+
+
+class QuotaExhaustedError(RuntimeError):
+    """The server-side quota resets too far in the future to wait for"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"RapidAPI quota exhausted; resets in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class _LocalBucketState:
+    """Bucket state held in memory, shared by threads of one process"""
+
+    def __init__(self, burst: float, now: float):
+        self._lock = threading.Lock()
+        self.tokens = burst
+        self.updated_at = now
+        self.blocked_until = 0.0
+
+    def update(self, fn: Callable[[float, float, float], tuple]):
+        """Atomically apply fn(tokens, updated_at, blocked_until) -> (new state..., result)"""
+        with self._lock:
+            self.tokens, self.updated_at, self.blocked_until, result = fn(
+                self.tokens, self.updated_at, self.blocked_until
+            )
+            return result
+
+
+class _SqliteBucketState:
+    """Bucket state held in an SQLite file, shared across processes"""
+
+    def __init__(self, path: str, burst: float, now: float):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS bucket (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                blocked_until REAL NOT NULL
+            )
+        """)
+        self._conn.execute("INSERT OR IGNORE INTO bucket VALUES (1, ?, ?, 0)", (burst, now))
+
+    def update(self, fn: Callable[[float, float, float], tuple]):
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front so read-modify-write is atomic across processes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT tokens, updated_at, blocked_until FROM bucket WHERE id = 1").fetchone()
+                tokens, updated_at, blocked_until, result = fn(*row)
+                self._conn.execute(
+                    "UPDATE bucket SET tokens = ?, updated_at = ?, blocked_until = ? WHERE id = 1",
+                    (tokens, updated_at, blocked_until)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return result
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket with reservation semantics
+
+    Each acquire() takes one token; if none is available the caller is told
+    (and made to wait) exactly how long until its token is refilled. Waits
+    queue up fairly because reservations can drive the balance negative.
+    """
+
+    def __init__(self, rate_per_second: float, burst: float = None, state_path: str = None,
+                 clock: Callable[[], float] = time.time, sleep: Callable[[float], None] = time.sleep,
+                 max_block_seconds: float = None):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        self.rate = float(rate_per_second)
+        self.burst = float(burst if burst is not None else max(1.0, rate_per_second))
+        self.max_block_seconds = (config.RATE_LIMITER_MAX_BLOCK_SECONDS
+                                  if max_block_seconds is None else max_block_seconds)
+        self.state_path = state_path
+        self._clock = clock
+        self._sleep = sleep
+
+        now = clock()
+        self._state = _SqliteBucketState(state_path, self.burst, now) if state_path else _LocalBucketState(self.burst, now)
+
+        self._stats_lock = threading.Lock()
+        self.acquired = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.server_blocks = 0
+        self.quota_rejections = 0
+        self._wait_histogram = [0] * (len(WAIT_HISTOGRAM_BOUNDS) + 1)
+
+    def reserve(self) -> float:
+        """Take one token now and return how many seconds the caller must wait before using it
+
+        Raises QuotaExhaustedError (without taking a token) while the server
+        block lasts longer than max_block_seconds.
+        """
+        now = self._clock()
+
+        def take(tokens, updated_at, blocked_until):
+            if blocked_until - now > self.max_block_seconds:
+                return tokens, updated_at, blocked_until, -(blocked_until - now)
+            tokens = min(self.burst, tokens + max(0.0, now - updated_at) * self.rate)
+            tokens -= 1.0
+            wait = max(0.0, -tokens / self.rate, blocked_until - now)
+            return tokens, now, blocked_until, wait
+
+        wait = self._state.update(take)
+        if wait < 0:
+            with self._stats_lock:
+                self.quota_rejections += 1
+            raise QuotaExhaustedError(-wait)
+        self._record_wait(wait)
+        return wait
+
+    def acquire(self) -> float:
+        """Block until a request may be sent. Returns the time waited."""
+        wait = self.reserve()
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Async acquire that yields to the event loop while waiting"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def update_from_headers(self, headers: Optional[Mapping[str, Any]]):
+        """
+        Sync the bucket with RapidAPI's X-RateLimit-*-Remaining / -Reset headers.
+
+        Remaining caps the local balance; when it hits zero every caller pauses
+        until the advertised reset, or gets QuotaExhaustedError if that reset is
+        beyond max_block_seconds.
+        """
+        if not headers:
+            return
+        remaining = _header_number(headers, 'X-RateLimit-Requests-Remaining')
+        reset = _header_number(headers, 'X-RateLimit-Requests-Reset')
+        if remaining is None:
+            return
+        now = self._clock()
+
+        def sync(tokens, updated_at, blocked_until):
+            tokens = min(tokens, remaining)
+            if remaining <= 0 and reset:
+                blocked_until = max(blocked_until, now + reset)
+            return tokens, updated_at, blocked_until, None
+
+        self._state.update(sync)
+        if remaining <= 0:
+            with self._stats_lock:
+                self.server_blocks += 1
+            if (reset or 0) > self.max_block_seconds:
+                logger.warning(f"RapidAPI quota exhausted; requests fail until reset in {reset:.0f}s")
+            else:
+                logger.warning(f"RapidAPI quota exhausted; pausing callers for {reset or 0:.0f}s")
+
+    def penalize(self, seconds: float):
+        """Pause all callers for `seconds` (e.g. after a 429 with Retry-After)"""
+        now = self._clock()
+
+        def block(tokens, updated_at, blocked_until):
+            return min(tokens, 0.0), updated_at, max(blocked_until, now + seconds), None
+
+        self._state.update(block)
+        with self._stats_lock:
+            self.server_blocks += 1
+
+    def _record_wait(self, wait: float):
+        with self._stats_lock:
+            self.acquired += 1
+            self.total_wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+            self._wait_histogram[bisect.bisect_left(WAIT_HISTOGRAM_BOUNDS, wait)] += 1
+
+    def get_wait_histogram(self) -> Dict[str, int]:
+        """Wait-time histogram as {'<=0.1s': count, ...}"""
+        with self._stats_lock:
+            histogram = {}
+            for bound, count in zip(WAIT_HISTOGRAM_BOUNDS, self._wait_histogram):
+                histogram[f"<={bound:g}s"] = count
+            histogram[f">{WAIT_HISTOGRAM_BOUNDS[-1]:g}s"] = self._wait_histogram[-1]
+            return histogram
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics"""
+        histogram = self.get_wait_histogram()
+        with self._stats_lock:
+            return {
+                'rate_per_second': self.rate,
+                'burst': self.burst,
+                'shared_state': bool(self.state_path),
+                'acquired': self.acquired,
+                'total_wait_seconds': round(self.total_wait_seconds, 3),
+                'avg_wait_seconds': self.total_wait_seconds / self.acquired if self.acquired else 0.0,
+                'max_wait_seconds': round(self.max_wait_seconds, 3),
+                'server_blocks': self.server_blocks,
+                'quota_rejections': self.quota_rejections,
+                'wait_histogram': histogram
+            }
+
+
+def _header_number(headers: Mapping[str, Any], name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.lower())
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+# Global limiter instance
+_global_limiter: Optional[TokenBucketLimiter] = None
+_global_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucketLimiter:
+    """Get the process-wide RapidAPI rate limiter"""
+    global _global_limiter
+    if _global_limiter is None:
+        with _global_limiter_lock:
+            if _global_limiter is None:
+                _global_limiter = TokenBucketLimiter(
+                    config.RAPIDAPI_RATE_LIMIT_PER_SECOND,
+                    burst=config.RAPIDAPI_RATE_LIMIT_BURST,
+                    state_path=config.RAPIDAPI_RATE_LIMIT_STATE_PATH
+                )
+    return _global_limiter
+
+
+def reset_rate_limiter():
+    """Discard the global limiter (e.g. after changing rate settings)"""
+    global _global_limiter
+    with _global_limiter_lock:
+        _global_limiter = None
@@ -10,15 +10,21 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import json  # Used for structured logging only
 import os
+import time
 from investigation_context import InvestigationContext
 from investigation_graph import InvestigationGraph, Node
 from llm_client import LiteLLMClient
+from local_embeddings import VectorIndex, get_embedder, cluster_by_similarity, cohesion
 from pydantic import BaseModel, Field
 import logging
+import twitter_config
+
+# Per-investigation synthesis debug logs (synthesis_<investigation_id>.jsonl)
+SYNTHESIS_LOG_DIR = os.path.join(os.path.dirname(__file__), "logs", "synthesis")
 
 # Import LLM call tracer
 try:
-    from .utils.llm_call_tracer import get_tracer
+    from utils.llm_call_tracer import get_tracer
     TRACER_AVAILABLE = True
 except ImportError:
     TRACER_AVAILABLE = False
@@ -79,9 +85,8 @@ class InsightSynthesisLogger:
         self.logger = logging.getLogger(f"synthesis.{investigation_id}")
         
         # Create synthesis-specific log file
-        log_dir = os.path.join(os.path.dirname(__file__), "logs", "synthesis")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, f"synthesis_{investigation_id}.jsonl")
+        os.makedirs(SYNTHESIS_LOG_DIR, exist_ok=True)
+        log_file = os.path.join(SYNTHESIS_LOG_DIR, f"synthesis_{investigation_id}.jsonl")
         
         handler = logging.FileHandler(log_file)
         formatter = logging.Formatter('%(message)s')
@@ -165,14 +170,55 @@ class RealTimeInsightSynthesizer:
         # CRITICAL: Bridge will be injected by investigation engine for architectural integration
         self.bridge = None
         
+        # Local vector index over DataPoints: grouping and timing without LLM calls (local_embeddings.py)
+        embedder = get_embedder() if twitter_config.LOCAL_SYNTHESIS_GROUPING else None
+        self.embedding_index = VectorIndex(embedder) if embedder is not None else None
+        
+        # Debounced triggering: DataPoints received since the last synthesis decision
+        self._undecided_count = 0
+        self._undecided_since = None
+        self.trigger_stats = {"datapoints": 0, "decisions": 0}
+        
     def process_new_datapoint(self, datapoint_id: str) -> Optional[List[str]]:
         """Process new DataPoint with comprehensive logging"""
-        self.pending_datapoints.append(datapoint_id)
+        return self.process_new_datapoints([datapoint_id], flush=True)
+        
+    def process_new_datapoints(self, datapoint_ids: List[str], flush: bool = False) -> Optional[List[str]]:
+        """Buffer new DataPoints and make at most one synthesis decision for the batch
+        
+        The decision runs when flush is set (e.g. at round end), once
+        SYNTHESIS_FLUSH_COUNT DataPoints have arrived since the last decision,
+        or once the oldest of them has waited SYNTHESIS_FLUSH_SECONDS.
+        """
+        for datapoint_id in datapoint_ids:
+            self.pending_datapoints.append(datapoint_id)
+            self.synthesis_logger.log_datapoint_processing(datapoint_id, len(self.pending_datapoints))
+        if datapoint_ids and self._undecided_since is None:
+            self._undecided_since = time.monotonic()
+        self._undecided_count += len(datapoint_ids)
+        self.trigger_stats["datapoints"] += len(datapoint_ids)
+        
+        if not self._undecided_count:
+            return None
+        due = (flush
+               or self._undecided_count >= twitter_config.SYNTHESIS_FLUSH_COUNT
+               or time.monotonic() - self._undecided_since >= twitter_config.SYNTHESIS_FLUSH_SECONDS)
+        if not due:
+            return None
+        self._undecided_count, self._undecided_since = 0, None
+        self.trigger_stats["decisions"] += 1
         
-        self.synthesis_logger.log_datapoint_processing(datapoint_id, len(self.pending_datapoints))
+        tracer = get_tracer() if TRACER_AVAILABLE else None
+        if tracer:
+            tracer.log_trigger("datapoint_batch", "realtime_insight_synthesizer", "synthesis_decision")
         
         try:
-            if self._should_synthesize_llm(self.pending_datapoints):
+            if self.embedding_index is not None:
+                should_synthesize = self._should_synthesize_local(self.pending_datapoints)
+            else:
+                should_synthesize = self._should_synthesize_llm(self.pending_datapoints)
+            
+            if should_synthesize:
                 self.synthesis_logger._log_structured({
                     "event": "synthesis_triggered",
                     "pending_count": len(self.pending_datapoints),
@@ -201,6 +247,10 @@ class RealTimeInsightSynthesizer:
             
         return None
         
+    def flush_datapoints(self) -> Optional[List[str]]:
+        """Decide on any DataPoints still waiting for a synthesis decision (call at round end)"""
+        return self.process_new_datapoints([], flush=True)
+        
     def _should_synthesize_llm(self, pending_datapoints: List[str]) -> bool:
         """LLM decides synthesis timing - NO hardcoded thresholds"""
         
@@ -256,6 +306,65 @@ class RealTimeInsightSynthesizer:
             # Fallback to conservative approach on error
             return len(pending_datapoints) >= 8
         
+    def _similarity_thresholds(self):
+        """(group linking cosine, minimum group cohesion) for the active embedding backend"""
+        embedder = self.embedding_index.embedder
+        similarity = twitter_config.SYNTHESIS_GROUP_SIMILARITY
+        min_cohesion = twitter_config.SYNTHESIS_MIN_COHESION
+        return (embedder.group_similarity if similarity is None else similarity,
+                embedder.min_cohesion if min_cohesion is None else min_cohesion)
+    
+    def _datapoint_vectors(self, datapoints: List[Node]):
+        """Index any DataPoints not yet embedded and return their vectors in order"""
+        self.embedding_index.add([dp.id for dp in datapoints],
+                                 [dp.properties.get("content", "") for dp in datapoints])
+        return self.embedding_index.vectors([dp.id for dp in datapoints])
+    
+    def _should_synthesize_local(self, pending_datapoints: List[str]) -> bool:
+        """Synthesize once pending DataPoints contain a cohesive group (or too many are waiting)"""
+        
+        if len(pending_datapoints) < 3:
+            return False
+        if len(pending_datapoints) >= twitter_config.SYNTHESIS_MAX_PENDING:
+            return True
+        
+        nodes = [self.graph.nodes[dp_id] for dp_id in pending_datapoints
+                 if dp_id in self.graph.nodes and self.graph.nodes[dp_id].node_type == "DataPoint"]
+        if len(nodes) < 2:
+            return False
+        vectors = self._datapoint_vectors(nodes)
+        similarity, min_cohesion = self._similarity_thresholds()
+        return any(len(members) >= 2 and cohesion(vectors[members]) >= min_cohesion
+                   for members in cluster_by_similarity(vectors, similarity))
+    
+    def _group_semantically_local(self, datapoints: List[Node]) -> SemanticGrouping:
+        """Cluster DataPoints by cosine similarity of their local embeddings"""
+        
+        vectors = self._datapoint_vectors(datapoints)
+        similarity, min_cohesion = self._similarity_thresholds()
+        question = self.embedding_index.query(self.context.analytic_question)
+        
+        groups = []
+        for members in cluster_by_similarity(vectors, similarity):
+            if len(members) < 2:
+                break  # Clusters come largest first; the rest are singletons
+            group_vectors = vectors[members]
+            # The member closest to the others names the group
+            central = datapoints[members[int((group_vectors @ group_vectors.T).sum(axis=1).argmax())]]
+            centroid = group_vectors.mean(axis=0)
+            centroid_norm = float((centroid @ centroid) ** 0.5) or 1.0
+            groups.append(SemanticGroup(
+                group_theme=" ".join(central.properties.get("content", "").split()[:8]) or "related findings",
+                datapoint_ids=[datapoints[i].id for i in members],
+                relevance_to_goal=max(0.0, float(centroid @ question) / centroid_norm),
+                synthesis_worthy=cohesion(group_vectors) >= min_cohesion
+            ))
+        
+        return SemanticGrouping(
+            groups=groups,
+            rationale=f"Local {self.embedding_index.embedder.name} cosine clustering at {similarity:.2f}"
+        )
+    
     def _synthesize_insights_batch(self) -> List[str]:
         """Synthesize insights from pending DataPoints"""
         
@@ -270,14 +379,20 @@ class RealTimeInsightSynthesizer:
             self.pending_datapoints.clear()
             return []
             
-        # Group by semantic similarity using LLM
+        # Group by semantic similarity (local vectors when available, else LLM)
         try:
-            semantic_grouping = self._group_semantically_llm(datapoint_nodes)
+            local_grouping = self.embedding_index is not None
+            if local_grouping:
+                semantic_grouping = self._group_semantically_local(datapoint_nodes)
+            else:
+                semantic_grouping = self._group_semantically_llm(datapoint_nodes)
             self.synthesis_logger.log_semantic_grouping(len(datapoint_nodes), semantic_grouping)
             
             insights_created = []
+            eligible_groups = []
             for group in semantic_grouping.groups:
-                if group.synthesis_worthy and group.relevance_to_goal > 0.5:
+                # Local groups leave goal relevance to the insight's own investigation_relevance check
+                if group.synthesis_worthy and (local_grouping or group.relevance_to_goal > 0.5):
                     # Get actual DataPoint nodes for this group
                     group_nodes = []
                     for dp_id in group.datapoint_ids:
@@ -286,12 +401,19 @@ class RealTimeInsightSynthesizer:
                             group_nodes.append(node)
                     
                     if len(group_nodes) >= 2:
-                        insight = self._synthesize_group_insight(group_nodes)
-                        
-                        if insight and insight.confidence_level > 0.3 and insight.investigation_relevance > 0.5:
-                            insight_node = self._create_insight_node(insight, group_nodes)
-                            insights_created.append(insight_node.id)
-                            self.synthesis_logger.log_insight_creation(insight, True)
+                        eligible_groups.append(group_nodes)
+            
+            # Independent groups fan out concurrently when the client supports it
+            if len(eligible_groups) > 1 and callable(getattr(type(self.llm), 'completion_many', None)):
+                insights = self._synthesize_group_insights_concurrently(eligible_groups)
+            else:
+                insights = [self._synthesize_group_insight(group_nodes) for group_nodes in eligible_groups]
+            
+            for group_nodes, insight in zip(eligible_groups, insights):
+                if insight and insight.confidence_level > 0.3 and insight.investigation_relevance > 0.5:
+                    insight_node = self._create_insight_node(insight, group_nodes)
+                    insights_created.append(insight_node.id)
+                    self.synthesis_logger.log_insight_creation(insight, True)
         
         except Exception as e:
             self.synthesis_logger._log_structured({
@@ -405,6 +527,41 @@ class RealTimeInsightSynthesizer:
     def _synthesize_group_insight(self, group: List[Node]) -> Optional[InsightSynthesis]:
         """Generate insight using proper LiteLLM structured output with context awareness"""
         
+        request = self._build_group_insight_request(group)
+        if request is None:
+            return None
+        
+        try:
+            response = self.llm.completion(**request)
+        except Exception as e:
+            self.synthesis_logger.log_llm_call("insight_synthesis", False, error=str(e))
+            # Surface errors for debugging (no silent suppression)
+            print(f"ERROR in insight synthesis: {e}")
+            raise e
+        return self._parse_group_insight_response(response)
+    
+    def _synthesize_group_insights_concurrently(self, groups: List[List[Node]]) -> List[Optional[InsightSynthesis]]:
+        """
+        Synthesize several independent groups with one concurrent LLM fan-out.
+        
+        All groups are prompted against the same existing-insight context, so
+        insights created by one group are not visible to the others in this batch.
+        """
+        requests = [self._build_group_insight_request(group) for group in groups]
+        to_send = [r for r in requests if r is not None]
+        
+        try:
+            responses = iter(self.llm.completion_many(to_send))
+        except Exception as e:
+            self.synthesis_logger.log_llm_call("insight_synthesis", False, error=str(e))
+            print(f"ERROR in insight synthesis: {e}")
+            raise e
+        return [self._parse_group_insight_response(next(responses)) if r is not None else None
+                for r in requests]
+    
+    def _build_group_insight_request(self, group: List[Node]) -> Optional[Dict[str, Any]]:
+        """Build the completion request for one group, or None if it has too little content"""
+        
         # Prepare content for LLM
         content_items = []
         for dp in group:
@@ -455,15 +612,17 @@ class RealTimeInsightSynthesizer:
         CRITICAL: Avoid creating duplicate insights. If findings are similar to existing insights, use STRENGTHEN or MERGE instead of CREATE.
         """
         
+        model = self.model_manager.get_model_for_operation("insight_synthesizer")
+        return {
+            'model': model,
+            'messages': [{"role": "user", "content": prompt}],
+            'response_format': InsightSynthesis,  # Temporarily back to working schema
+            'purpose': "insight_synthesis"
+        }
+    
+    def _parse_group_insight_response(self, response) -> Optional[InsightSynthesis]:
+        """Validate a group insight response; raises if structured output is missing"""
         try:
-            model = self.model_manager.get_model_for_operation("insight_synthesizer")
-            response = self.llm.completion(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                response_format=InsightSynthesis,  # Temporarily back to working schema
-                purpose="insight_synthesis"
-            )
-            
             # Check if parsed attribute exists before accessing it
             parsed_response = getattr(response.choices[0].message, 'parsed', None)
             self.synthesis_logger.log_llm_call("insight_synthesis", True, parsed_response)
@@ -511,6 +670,7 @@ class RealTimeInsightSynthesizer:
                     new_evidence = [dp.properties.get('content', '')[:100] for dp in group]
                     existing_evidence = target_insight.properties.get('key_evidence', [])
                     target_insight.properties['key_evidence'] = existing_evidence + new_evidence
+                    self.graph.record_node_update(target_insight)
                     
                     print(f"STRENGTHEN: Enhanced insight {decision.target_insight_id} to confidence {decision.confidence_adjustment}")
                     return None  # No new insight created, existing one updated
@@ -545,6 +705,7 @@ class RealTimeInsightSynthesizer:
         insight_node.properties['confidence'] = insight.confidence_level
         insight_node.properties['investigation_relevance'] = insight.investigation_relevance
         insight_node.properties['key_evidence'] = insight.key_evidence
+        self.graph.record_node_update(insight_node)
         
         # Create SUPPORTS edges from DataPoints to Insight
         for dp in supporting_datapoints:
@@ -0,0 +1,176 @@
+# response_cache.py
+"""
+Persistent Response Cache
+
+Content-addressed on-disk cache backed by SQLite. Values are stored as JSON
+under a SHA-256 key derived from the request, each entry carries its own
+TTL, and the least recently used entries are evicted once the cache grows
+past max_entries. Safe to share between threads and between processes
+(SQLite handles cross-process locking).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import twitter_config as config
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Build a stable key from JSON-serializable parts (dict order doesn't matter)"""
+    payload = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed key/value cache with per-entry TTL and LRU eviction"""
+
+    def __init__(self, db_path: str, max_entries: int = 5000, default_ttl: float = 3600):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL" if db_path != ':memory:' else "PRAGMA journal_mode=MEMORY")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache(last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def contains(self, key: str) -> bool:
+        """Check for an unexpired entry without touching stats or recency"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row is not None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a JSON-serializable value; ttl <= 0 means don't cache"""
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        now = time.time()
+        serialized = json.dumps(value, separators=(',', ':'), default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, serialized, now + ttl, now)
+            )
+            self._evict_if_needed()
+            self._conn.commit()
+
+    def _evict_if_needed(self):
+        """Drop expired entries, then least recently used ones beyond max_entries"""
+        count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        cursor = self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        self.evictions += cursor.rowcount
+        count -= cursor.rowcount
+        overflow = count - self.max_entries
+        if overflow > 0:
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY last_access ASC LIMIT ?)",
+                (overflow,)
+            )
+            self.evictions += cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': entries,
+                'evictions': self.evictions,
+                'max_entries': self.max_entries
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Global API response cache instance
+_api_cache: Optional[ResponseCache] = None
+_api_cache_lock = threading.Lock()
+
+
+def get_api_response_cache() -> ResponseCache:
+    """Get the process-wide cache for RapidAPI responses"""
+    global _api_cache
+    if _api_cache is None:
+        with _api_cache_lock:
+            if _api_cache is None:
+                _api_cache = ResponseCache(
+                    config.API_CACHE_PATH,
+                    max_entries=config.API_CACHE_MAX_ENTRIES,
+                    default_ttl=config.API_CACHE_DEFAULT_TTL_SECONDS
+                )
+    return _api_cache
+
+
+# Global LLM response cache instance
+_llm_cache: Optional[ResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> ResponseCache:
+    """Get the process-wide cache for LLM completions"""
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = ResponseCache(
+                    config.LLM_CACHE_PATH,
+                    max_entries=config.LLM_CACHE_MAX_ENTRIES,
+                    default_ttl=config.LLM_CACHE_TTL_SECONDS
+                )
+    return _llm_cache
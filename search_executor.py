@@ -7,8 +7,13 @@ a clean interface for the wave architecture.
 
 import time
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, List
 import api_client
+from http_session import get_connection_stats
+from response_cache import get_api_response_cache
+from rate_limiter import get_rate_limiter
+from utils.stage_timer import get_stage_timer
+import twitter_config
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +45,8 @@ class SearchExecutor:
                 self.rapidapi_key = None
 
     def execute_search(self, endpoint: str, params: Dict[str, Any],
-                      reason: str = "Wave search") -> Dict[str, Any]:
+                      reason: str = "Wave search",
+                      stop_when: Optional[Callable[[List[Any], List[Any]], bool]] = None) -> Dict[str, Any]:
         """
         Execute a search query
 
@@ -48,6 +54,8 @@ class SearchExecutor:
             endpoint: API endpoint to call (e.g. 'search.php')
             params: Parameters for the API call
             reason: Description of why this search is being performed
+            stop_when: Optional predicate (page_items, all_results) -> bool that
+                stops pagination early once results stop being useful
 
         Returns:
             Dictionary containing:
@@ -70,11 +78,13 @@ class SearchExecutor:
 
         try:
             # Execute the API call using existing api_client
-            result = api_client.execute_api_step(
-                search_plan,
-                [],  # No dependencies
-                self.rapidapi_key
-            )
+            with get_stage_timer().stage('search_execution'):
+                result = api_client.execute_api_step(
+                    search_plan,
+                    [],  # No dependencies
+                    self.rapidapi_key,
+                    stop_when=stop_when
+                )
 
             execution_time = time.time() - start_time
 
@@ -142,5 +152,8 @@ class SearchExecutor:
         """Get executor status"""
         return {
             'api_key_configured': self.rapidapi_key is not None,
-            'api_client_available': 'api_client' in globals()
+            'api_client_available': 'api_client' in globals(),
+            'http_pool': get_connection_stats(),
+            'response_cache': get_api_response_cache().get_stats() if twitter_config.API_CACHE_ENABLED else {'enabled': False},
+            'rate_limiter': get_rate_limiter().get_stats() if twitter_config.RATE_LIMITER_ENABLED else {'enabled': False}
         }
\ No newline at end of file
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for InvestigationGraph storage modes
+
+Builds the same synthetic investigation graph (searches fanning out to
+DataPoints, DataPoints supporting Insights) with default and compact storage
+and reports bytes allocated per node, measured with tracemalloc:
+
+    python tests/benchmark_graph_memory.py --datapoints 50000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from investigation_graph import InvestigationGraph  # noqa: E402
+
+TWEET = "Breaking: new filing in the case mentions {n} previously unreported contacts and a 2019 flight log"
+
+
+def build_graph(compact: bool, datapoints: int, per_search: int = 20, per_insight: int = 10) -> InvestigationGraph:
+    """Synthetic graph shaped like a long investigation"""
+    graph = InvestigationGraph(compact=compact)
+    question = graph.create_analytic_question_node("What is the connection between the filings and the flight logs?")
+    search = None
+    insight = None
+    for n in range(datapoints):
+        if n % per_search == 0:
+            search = graph.create_search_query_node("search.php", {"query": f"flight log filing {n // per_search}",
+                                                                   "search_type": "Latest"})
+            graph.create_edge(question, search, "MOTIVATES")
+        dp = graph.create_data_point_node(TWEET.format(n=n), {"source": "search.php", "author": f"user{n % 500}"})
+        graph.create_edge(search, dp, "GENERATES")
+        if n % per_insight == 0:
+            insight = graph.create_insight_node(f"Pattern {n // per_insight} across filings", "pattern")
+        graph.create_edge(dp, insight, "SUPPORTS")
+    return graph
+
+
+def measure(compact: bool, datapoints: int):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    graph = build_graph(compact, datapoints)
+    build_seconds = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'nodes': len(graph.nodes),
+        'edges': len(graph.edges),
+        'bytes': current,
+        'bytes_per_node': current / len(graph.nodes),
+        'build_seconds': build_seconds
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--datapoints', type=int, default=20000)
+    args = parser.parse_args()
+
+    results = {mode: measure(mode == 'compact', args.datapoints) for mode in ('default', 'compact')}
+    for mode, r in results.items():
+        print(f"{mode:<8} {r['nodes']} nodes, {r['edges']} edges: {r['bytes'] / 2**20:7.1f} MB "
+              f"({r['bytes_per_node']:.0f} B/node incl. edges), built in {r['build_seconds']:.2f}s")
+    saving = 1 - results['compact']['bytes'] / results['default']['bytes']
+    print(f"compact storage saves {saving:.0%}")
+
+
+if __name__ == "__main__":
+    main()
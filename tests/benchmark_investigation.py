@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+End-to-end investigation benchmark with per-stage timing breakdown
+
+Drives InvestigationEngine.conduct_investigation (and
+WaveInvestigationEngine.conduct_investigation when importable) over a fixed
+corpus of queries against local stub backends:
+
+- a local HTTP server standing in for RapidAPI (deterministic tweets,
+  configurable latency)
+- a schema-driven stub for litellm.completion that returns a minimal valid
+  structured output for whatever response_format the caller asks for
+
+Alternatively pass --cassette to replay recorded traffic (see traffic_cassette.py).
+
+Reports wall time per stage (strategy generation, search execution, finding
+evaluation, insight synthesis, cross-reference, timeline, graph export), LLM
+calls per round and peak RSS, and writes machine-readable JSON tagged with the
+git commit so runs can be compared:
+
+    python tests/benchmark_investigation.py --output bench_new.json
+    python tests/benchmark_investigation.py --compare bench_old.json bench_new.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import urlparse, parse_qs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DISABLE_STREAMLIT', '1')
+
+import litellm  # noqa: E402
+
+import api_client  # noqa: E402
+import llm_client  # noqa: E402
+from utils.stage_timer import get_stage_timer  # noqa: E402
+
+BENCHMARK_QUERIES = [
+    "What is Trump saying about Epstein recently?",
+    "Find information that debunks UFO whistleblower claims",
+    "Investigate controversies around Elon Musk's Twitter acquisition",
+    "Find critical analysis of cryptocurrency influencer claims",
+    "Research skeptical views on popular health trends",
+]
+
+STAGES = ['strategy_generation', 'search_execution', 'finding_evaluation', 'insight_synthesis',
+          'cross_reference', 'timeline', 'graph_export', 'final_summary']
+
+
+# --- Stub RapidAPI backend ---
+
+class StubTwitterHandler(BaseHTTPRequestHandler):
+    """Deterministic fake RapidAPI responses; latency set on the server object"""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        time.sleep(self.server.latency)
+
+        seed = hashlib.md5(f"{parsed.path}{sorted(params.items())}".encode()).hexdigest()
+        page = int(params.get('cursor', 'c0')[1:] or 0)
+        topic = params.get('query') or params.get('screenname') or 'topic'
+        tweets = [{
+            'tweet_id': f"{seed[:8]}{page}{i:02d}",
+            'text': f"{topic}: synthetic tweet {i} on page {page} ({seed[i % 32]})",
+            'screen_name': f"user{seed[i % 16]}{i}",
+            'created_at': f"2025-01-{(i % 28) + 1:02d}T12:00:00Z",
+            'favorites': i * 3,
+            'retweets': i,
+        } for i in range(self.server.tweets_per_page)]
+        payload = {'timeline': tweets, 'next_cursor': f"c{page + 1}" if page < 2 else None}
+
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_twitter(latency: float, tweets_per_page: int):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubTwitterHandler)
+    server.latency = latency
+    server.tweets_per_page = tweets_per_page
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# --- Stub LLM backend ---
+
+def _stub_value(schema, defs, name, query, depth=0):
+    """Build a minimal valid value for a JSON schema node, with a few field-name heuristics"""
+    if '$ref' in schema:
+        schema = defs.get(schema['$ref'].split('/')[-1], {})
+    if 'anyOf' in schema:
+        options = [s for s in schema['anyOf'] if s.get('type') != 'null'] or schema['anyOf']
+        return _stub_value(options[0], defs, name, query, depth)
+    if 'enum' in schema:
+        return schema['enum'][0]
+
+    kind = schema.get('type')
+    lowered = (name or '').lower()
+    if kind == 'object':
+        return {k: _stub_value(v, defs, k, query, depth + 1) for k, v in schema.get('properties', {}).items()}
+    if kind == 'array':
+        count = 2 if depth < 3 else 1
+        return [_stub_value(schema.get('items', {}), defs, name.rstrip('s') if name else name, query, depth + 1)
+                for _ in range(count)]
+    if kind == 'boolean':
+        return not lowered.startswith('should_continue')
+    if kind in ('number', 'integer'):
+        if 'confidence' in lowered or 'probability' in lowered or 'threshold' in lowered:
+            value = 0.8
+        elif 'score' in lowered or 'relevance' in lowered or 'value' in lowered:
+            value = 7
+        elif 'page' in lowered:
+            value = 1
+        else:
+            value = 2
+        return int(value) if kind == 'integer' else float(value)
+    if lowered == 'endpoint':
+        return 'search.php'
+    if lowered in ('query', 'search_query'):
+        return query
+    if lowered == 'search_type':
+        return 'Latest'
+    return f"stub {lowered or 'text'} about {query[:40]}"
+
+
+class StubLLM:
+    """Replacement for litellm.completion returning schema-valid responses"""
+
+    def __init__(self, latency: float, query: str = "benchmark"):
+        self.latency = latency
+        self.query = query
+
+    def __call__(self, **params):
+        time.sleep(self.latency)
+        response_format = params.get('response_format') or {}
+        json_schema = response_format.get('json_schema', {}).get('schema') if isinstance(response_format, dict) else None
+        if json_schema:
+            content = json.dumps(_stub_value(json_schema, json_schema.get('$defs', {}), '', self.query))
+        elif isinstance(response_format, dict) and response_format.get('type') == 'json_object':
+            content = json.dumps({'result': f"stub answer about {self.query}"})
+        else:
+            content = f"Stub analysis of: {self.query}"
+        return litellm.ModelResponse(
+            choices=[{'message': {'role': 'assistant', 'content': content}}],
+            model=params.get('model', 'stub')
+        )
+
+
+# --- Runner ---
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def peak_rss_mb():
+    # ru_maxrss is KB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def run_investigation_engine(query, args):
+    from investigation_engine import InvestigationEngine, InvestigationConfig
+
+    engine = InvestigationEngine('benchmark-key')
+    config = InvestigationConfig(
+        max_searches=args.max_searches,
+        max_time_minutes=10,
+        pages_per_search=args.pages,
+        concurrent_searches=args.concurrent_searches,
+    )
+    session = engine.conduct_investigation(query, config)
+    return {
+        'searches': session.search_count,
+        'results': session.total_results_found,
+        'findings': len(session.accumulated_findings),
+        'rounds': session.round_count,
+    }
+
+
+def run_wave_engine(query, args):
+    try:
+        from wave_investigation_engine import WaveInvestigationEngine
+    except ImportError:
+        from twitterexplorer.wave_investigation_engine import WaveInvestigationEngine
+
+    engine = WaveInvestigationEngine()
+    result = engine.conduct_investigation(query, max_waves=args.max_waves)
+    return {
+        'waves': len(result.get('waves', [])) if isinstance(result, dict) else None,
+        'searches': result.get('total_searches') if isinstance(result, dict) else None,
+    }
+
+
+ENGINES = {'investigation': run_investigation_engine, 'wave': run_wave_engine}
+
+
+def run_one(engine_name, query, args):
+    timer = get_stage_timer()
+    timer.reset()
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    error = None
+    summary = {}
+    try:
+        summary = ENGINES[engine_name](query, args)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    wall = time.perf_counter() - start
+
+    snapshot = timer.snapshot()
+    return {
+        'engine': engine_name,
+        'query': query,
+        'wall_seconds': round(wall, 3),
+        'stages': snapshot['stages'],
+        'llm_calls_per_round': snapshot['llm_calls_per_round'],
+        'llm_calls_total': snapshot['llm_calls_total'],
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'peak_rss_growth_mb': round(peak_rss_mb() - rss_before, 1),
+        'summary': summary,
+        'error': error,
+    }
+
+
+def run_benchmark(args):
+    from traffic_cassette import use_cassette
+
+    runs = []
+    queries = BENCHMARK_QUERIES[:args.queries]
+    server = None
+    patches = [patch.object(api_client.config, 'API_CACHE_ENABLED', args.with_cache),
+               patch.object(api_client.config, 'LLM_CACHE_ENABLED', args.with_cache)]
+
+    if args.cassette:
+        context = use_cassette(args.cassette, mode='replay', api_latency=args.api_latency,
+                               llm_latency=args.llm_latency, fault_rate=args.fault_rate, seed=args.seed)
+    else:
+        server, base_url = start_stub_twitter(args.api_latency, args.tweets_per_page)
+        patches.append(patch.object(api_client.config, 'RAPIDAPI_BASE_URL', base_url))
+        context = None
+
+    for p in patches:
+        p.start()
+    try:
+        if context:
+            context.__enter__()
+        for engine_name in args.engines:
+            for query in queries:
+                stub = None
+                if not args.cassette:
+                    stub = patch.object(llm_client, 'completion', StubLLM(args.llm_latency, query))
+                    stub.start()
+                try:
+                    print(f"[benchmark] {engine_name}: {query}", file=sys.stderr)
+                    runs.append(run_one(engine_name, query, args))
+                finally:
+                    if stub:
+                        stub.stop()
+    finally:
+        if context:
+            context.__exit__(None, None, None)
+        for p in reversed(patches):
+            p.stop()
+        if server:
+            server.shutdown()
+            server.server_close()
+
+    return {
+        'git_commit': git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {k: v for k, v in vars(args).items() if k not in ('compare', 'output')},
+        'runs': runs,
+        'totals': aggregate(runs),
+    }
+
+
+def aggregate(runs):
+    """Per-engine sums across the query corpus"""
+    totals = {}
+    for run in runs:
+        engine = totals.setdefault(run['engine'], {'wall_seconds': 0.0, 'llm_calls': 0, 'errors': 0,
+                                                   'stages': {}, 'peak_rss_mb': 0.0})
+        engine['wall_seconds'] = round(engine['wall_seconds'] + run['wall_seconds'], 3)
+        engine['llm_calls'] += run['llm_calls_total']
+        engine['errors'] += 1 if run['error'] else 0
+        engine['peak_rss_mb'] = max(engine['peak_rss_mb'], run['peak_rss_mb'])
+        for stage, data in run['stages'].items():
+            engine['stages'][stage] = round(engine['stages'].get(stage, 0.0) + data['total_seconds'], 4)
+    return totals
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"Comparing {old['git_commit'][:10]} -> {new['git_commit'][:10]}")
+    for engine, new_totals in new['totals'].items():
+        old_totals = old['totals'].get(engine)
+        if not old_totals:
+            continue
+        print(f"\n{engine}")
+        rows = [('wall_seconds', old_totals['wall_seconds'], new_totals['wall_seconds']),
+                ('llm_calls', old_totals['llm_calls'], new_totals['llm_calls']),
+                ('peak_rss_mb', old_totals['peak_rss_mb'], new_totals['peak_rss_mb'])]
+        for stage in STAGES:
+            if stage in old_totals['stages'] or stage in new_totals['stages']:
+                rows.append((stage, old_totals['stages'].get(stage, 0.0), new_totals['stages'].get(stage, 0.0)))
+        for name, before, after in rows:
+            change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+            print(f"  {name:<22} {before:>10.3f} -> {after:>10.3f}  {change}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=['investigation', 'wave'])
+    parser.add_argument('--queries', type=int, default=len(BENCHMARK_QUERIES), help="Number of corpus queries to run")
+    parser.add_argument('--max-searches', type=int, default=8)
+    parser.add_argument('--max-waves', type=int, default=2)
+    parser.add_argument('--pages', type=int, default=2)
+    parser.add_argument('--concurrent-searches', action='store_true')
+    parser.add_argument('--api-latency', type=float, default=0.2, help="Seconds per stub RapidAPI page")
+    parser.add_argument('--llm-latency', type=float, default=0.3, help="Seconds per stub LLM call")
+    parser.add_argument('--tweets-per-page', type=int, default=20)
+    parser.add_argument('--with-cache', action='store_true', help="Keep the on-disk API and LLM response caches enabled")
+    parser.add_argument('--cassette', help="Replay this cassette instead of the stub backends")
+    parser.add_argument('--fault-rate', type=float, default=0.0, help="Injected 429/5xx rate (cassette replay)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="Compare two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = run_benchmark(args)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    for engine, totals in results['totals'].items():
+        print(f"{engine}: {totals['wall_seconds']:.2f}s total, {totals['llm_calls']} LLM calls, "
+              f"{totals['errors']} errors, peak RSS {totals['peak_rss_mb']:.0f} MB")
+        for stage, seconds in sorted(totals['stages'].items(), key=lambda x: -x[1]):
+            print(f"   {stage:<22} {seconds:8.3f}s")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
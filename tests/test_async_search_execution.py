@@ -0,0 +1,118 @@
+# test_async_search_execution.py
+"""
+Test Suite for Async Search Execution
+
+Verifies that execute_api_step_async matches execute_api_step (pagination,
+retries, return shape) and that a round of independent searches run
+concurrently takes roughly the time of the slowest search, not the sum.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+import api_client
+from investigation_engine import InvestigationEngine, InvestigationConfig, InvestigationSession
+
+SEARCH_DELAY_SECONDS = 0.4
+
+
+class _SlowPagedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        if "fail" in query.get("query", [""])[0]:
+            self._send(400, {"message": "bad request"})
+            return
+        time.sleep(SEARCH_DELAY_SECONDS)
+        if "cursor" in query:
+            self._send(200, {"timeline": [{"tweet_id": "2", "text": "page two"}], "next_cursor": None})
+        else:
+            self._send(200, {"timeline": [{"tweet_id": "1", "text": "page one"}], "next_cursor": "abc"})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowPagedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    with patch.object(api_client.config, 'RAPIDAPI_BASE_URL', f"http://127.0.0.1:{server.server_address[1]}"), \
+         patch.object(api_client.config, 'API_CACHE_ENABLED', False):
+        yield
+    server.shutdown()
+    server.server_close()
+
+
+def _plan(query, max_pages=1):
+    return {"endpoint": "search.php", "params": {"query": query, "search_type": "Latest"},
+            "max_pages": max_pages, "reason": f"Search {query}"}
+
+
+def test_async_step_matches_sync_step(local_api):
+    """EVIDENCE: async twin returns the same shape and paginates the same way"""
+    sync_result = api_client.execute_api_step(_plan("trump", max_pages=2), [], "key")
+    async_result = asyncio.run(api_client.execute_api_step_async(_plan("trump", max_pages=2), [], "key"))
+
+    assert async_result == sync_result
+    assert [t['tweet_id'] for t in async_result['data']['timeline']] == ["1", "2"]
+    assert async_result['executed_params'] == {"query": "trump", "search_type": "Latest"}
+
+
+def test_async_step_reports_client_errors(local_api):
+    """EVIDENCE: 4xx errors come back as error dicts, not exceptions"""
+    result = asyncio.run(api_client.execute_api_step_async(_plan("fail"), [], "key"))
+    assert result['status_code'] == 400
+    assert "HTTP Error 400" in result['error']
+
+
+def test_step_dependency_detection():
+    assert not api_client.has_step_dependencies(_plan("trump"))
+    assert api_client.has_step_dependencies({"params": {"screenname": "$step1.users.0.screen_name"}})
+    assert api_client.has_step_dependencies(
+        {"params": {"users": {"source_step": 1, "source_list_path": "users", "extract_field": "id"}}}
+    )
+
+
+def test_concurrent_round_takes_slowest_search_time(local_api):
+    """EVIDENCE: 5 independent searches finish in ~1 search duration, not 5"""
+    engine = object.__new__(InvestigationEngine)
+    engine.rapidapi_key = "test_api_key"
+
+    config = InvestigationConfig(concurrent_searches=True, max_concurrent_searches=5)
+    session = InvestigationSession("test query", config)
+    searches = [_plan(f"query {i}") for i in range(5)]
+
+    start = time.time()
+    prefetched = engine._prefetch_round_searches(searches, session, round_number=1)
+    elapsed = time.time() - start
+
+    print(f"Concurrent round time: {elapsed:.2f}s (sequential would be ~{5 * SEARCH_DELAY_SECONDS:.1f}s)")
+    assert sorted(prefetched) == [0, 1, 2, 3, 4]
+    assert [prefetched[i].search_id for i in range(5)] == [1, 2, 3, 4, 5]
+    assert all(a.results_count == 1 and a.error is None for a in prefetched.values())
+    assert elapsed < 3 * SEARCH_DELAY_SECONDS
+
+
+def test_prefetch_disabled_by_default():
+    engine = object.__new__(InvestigationEngine)
+    engine.rapidapi_key = "test_api_key"
+    session = InvestigationSession("test query", InvestigationConfig())
+    assert engine._prefetch_round_searches([_plan("a"), _plan("b")], session, 1) == {}
@@ -0,0 +1,116 @@
+# test_finding_dedup.py
+"""
+Test Suite for Finding Deduplication and the Evaluation Verdict Cache
+
+Verifies that copies of a tweet returned by different endpoints - same id,
+retweets, reformatted links and near-duplicate quote variants - share one
+finding key, that repeats never reach the LLM twice, and that the engine
+links a repeated finding to its existing DataPoint instead of creating a
+second one.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from finding_dedup import FindingDeduplicator, normalize_finding_text, simhash, hamming_distance
+from finding_evaluator_llm import LLMFindingEvaluator, FindingAssessment
+
+TWEET = "Court filing names three passengers on the 2019 flight, including two senators"
+
+
+def _result(text, **metadata):
+    return {'text': text, 'source': 'twitter_api_timeline', 'metadata': metadata}
+
+
+def test_copies_share_a_key_and_distinct_tweets_do_not():
+    dedup = FindingDeduplicator()
+    original, _ = dedup.key_for(_result(TWEET + " https://t.co/abc", tweet_id="100"))
+
+    assert dedup.key_for(_result("different text, same id", tweet_id="100")) == (original, True)
+    assert dedup.key_for(_result(f"RT @reporter: {TWEET}", tweet_id="200",
+                                 retweeted_tweet={"tweet_id": "100"})) == (original, True)
+    assert dedup.key_for(_result(TWEET + " https://t.co/xyz", tweet_id="300")) == (original, True)
+    # Near duplicate: a quote variant adding a few words
+    assert dedup.key_for(_result("Quote: " + TWEET + " wow")) == (original, True)
+    # Later lookups of the near duplicate's id resolve to the same key
+    assert dedup.key_for(_result("anything", tweet_id="300")) == (original, True)
+
+    other, duplicate = dedup.key_for(_result("Senate hearing on flight records scheduled for next Tuesday morning"))
+    assert other != original and not duplicate
+    assert dedup.stats == {'seen': 7, 'exact': 4, 'near': 1}
+
+
+def test_short_texts_only_dedupe_exactly():
+    dedup = FindingDeduplicator()
+    first, _ = dedup.key_for(_result("big news"))
+    assert dedup.key_for(_result("Big   NEWS")) == (first, True)
+    assert dedup.key_for(_result("bad news"))[1] is False
+    # Bare links have nothing to compare
+    assert dedup.key_for(_result("https://t.co/a"))[0] != dedup.key_for(_result("https://t.co/b"))[0]
+
+
+def test_simhash_is_stable_for_small_edits():
+    a = simhash(normalize_finding_text(TWEET))
+    assert hamming_distance(a, simhash(normalize_finding_text("@someone " + TWEET.upper()))) == 0
+    assert hamming_distance(a, simhash(normalize_finding_text("Weather is sunny across the region today"))) > 6
+
+
+def test_annotate_drops_in_batch_repeats_and_verdicts_skip_the_llm():
+    """EVIDENCE: duplicates within and across batches cost zero LLM evaluations"""
+    dedup = FindingDeduplicator()
+    llm = MagicMock()
+    llm.completion.side_effect = lambda **kwargs: SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(
+        content=json.dumps([{"index": i, "is_significant": True, "relevance_score": 0.8, "reasoning": "ok"}
+                            for i in range(kwargs['messages'][-1]['content'].count("Result "))])))])
+    evaluator = LLMFindingEvaluator(llm_client=llm, model_manager=MagicMock())
+
+    search = dedup.annotate([_result(TWEET, tweet_id="100"), _result(TWEET, tweet_id="100"),
+                             _result("Unrelated sports recap from last night's game", tweet_id="5")])
+    assert len(search) == 2 and all('finding_key' in r for r in search)
+    evaluator.evaluate_batch(search, "goal")
+    assert llm.completion.call_count == 1
+
+    timeline = dedup.annotate([_result(f"RT @x: {TWEET}", tweet_id="900", retweeted_tweet={"tweet_id": "100"})])
+    assessment = evaluator.evaluate_batch(timeline, "goal")[0]
+    assert llm.completion.call_count == 1 and assessment.is_significant
+
+    # Copies inside one call are sent once and share the verdict
+    evaluator.clear_verdicts()
+    assessments = evaluator.evaluate_batches([search, timeline], "goal")
+    assert assessments[0][0] is assessments[1][0]
+    assert "Result 1" in llm.completion.call_args.kwargs['messages'][-1]['content']
+    assert "Result 2" not in llm.completion.call_args.kwargs['messages'][-1]['content']
+
+
+def test_engine_links_repeated_finding_to_existing_datapoint():
+    from investigation_engine import InvestigationEngine, InvestigationSession, InvestigationConfig, SearchAttempt
+    from investigation_graph import InvestigationGraph
+
+    engine = object.__new__(InvestigationEngine)
+    engine.graph_mode = True
+    engine.progress_container = None
+    engine.insight_synthesizer = None
+    engine.llm_coordinator = SimpleNamespace(graph=InvestigationGraph())
+    engine.finding_dedup = FindingDeduplicator()
+    engine.finding_datapoints = {}
+    engine.finding_evaluator = MagicMock()
+    engine.finding_evaluator.evaluate_batch.side_effect = lambda results, goal: [
+        FindingAssessment(True, 0.9, 0.5, {}, [], None, "ok") for _ in results]
+    session = InvestigationSession("Who was on the flight?", InvestigationConfig())
+    round_obj = session.start_new_round("r1")
+
+    attempts = []
+    for search_id, (endpoint, result) in enumerate([("search.php", _result(TWEET, tweet_id="100")),
+                                                     ("timeline.php", _result(f"RT @x: {TWEET}", tweet_id="7",
+                                                                              retweeted_tweet={"tweet_id": "100"}))]):
+        attempt = SearchAttempt(search_id, 1, endpoint, {'query': endpoint}, endpoint, 1, 5.0, 0.1)
+        attempt._raw_results = engine.finding_dedup.annotate([result])
+        attempts.append(attempt)
+    engine._analyze_round_results_with_llm(session, round_obj, attempts)
+
+    graph = engine.llm_coordinator.graph
+    datapoints = graph.get_nodes_by_type("DataPoint")
+    assert len(datapoints) == 1 and len(session.accumulated_findings) == 1
+    sources = {graph.nodes[e.source_id].properties['endpoint'] for e in graph.edges if e.target_id == datapoints[0].id}
+    assert sources == {"search.php", "timeline.php"}
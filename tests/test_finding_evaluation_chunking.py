@@ -0,0 +1,140 @@
+# test_finding_evaluation_chunking.py
+"""
+Test Suite for Chunked Finding Evaluation
+
+Drives LLMFindingEvaluator with a scripted client to verify that every result
+is evaluated however many are passed, that chunks follow the token and count
+budgets, that answers are merged back by index, and that whole-round mode
+packs several searches into as few calls as the model allows.
+"""
+
+import json
+import re
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+import finding_evaluator_llm
+import twitter_config
+from finding_evaluator_llm import LLMFindingEvaluator
+
+
+class _ScriptedClient:
+    """Answers each chunk in reverse order, echoing indices; 'signal' results are significant"""
+
+    def __init__(self, echo_index=True):
+        self.echo_index = echo_index
+        self.prompts = []
+        self.fan_outs = []
+
+    def completion(self, model, messages, **kwargs):
+        prompt = messages[-1]['content']
+        self.prompts.append(prompt)
+        results = re.findall(r"^Result (\d+): (.*)$", prompt, re.MULTILINE)
+        evaluations = [{"index": int(i), "is_significant": "signal" in text,
+                        "relevance_score": 0.9 if "signal" in text else 0.1, "reasoning": text}
+                       for i, text in results]
+        if self.echo_index:
+            evaluations.reverse()
+        else:
+            for evaluation in evaluations:
+                del evaluation["index"]
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(evaluations)))])
+
+    def completion_many(self, requests, max_concurrency=None):
+        self.fan_outs.append(len(requests))
+        return [self.completion(**request) for request in requests]
+
+
+class _Models:
+    def get_model_for_operation(self, operation):
+        return "gpt-4o-mini"
+
+
+def _results(count, prefix="tweet"):
+    return [{"text": f"{prefix} {i} " + ("signal" if i % 3 == 0 else "noise")} for i in range(count)]
+
+
+def test_every_result_evaluated_and_merged_by_index(monkeypatch):
+    """EVIDENCE: 23 results -> 3 concurrent chunks, no 'Not evaluated' padding, input order kept"""
+    monkeypatch.setattr(twitter_config, 'FINDING_EVAL_MAX_CHUNK_RESULTS', 10)
+    client = _ScriptedClient()
+    results = _results(23)
+
+    assessments = LLMFindingEvaluator(llm_client=client, model_manager=_Models()).evaluate_batch(results, "goal")
+
+    assert client.fan_outs == [3]
+    assert [a.reasoning for a in assessments] == [r["text"] for r in results]
+    assert [a.is_significant for a in assessments] == [i % 3 == 0 for i in range(23)]
+
+
+def test_token_budget_splits_long_results(monkeypatch):
+    monkeypatch.setattr(twitter_config, 'FINDING_EVAL_CHUNK_TOKENS', 120)
+    client = _ScriptedClient()
+    long_results = [{"text": f"{i} signal " + "x" * 400} for i in range(4)]  # ~50 tokens per preview
+
+    assessments = LLMFindingEvaluator(llm_client=client, model_manager=_Models()).evaluate_batch(long_results, "goal")
+
+    assert client.fan_outs == [2]
+    assert all(a.is_significant for a in assessments)
+
+
+def test_positional_fallback_and_missing_answers():
+    client = _ScriptedClient(echo_index=False)
+    evaluator = LLMFindingEvaluator(llm_client=client, model_manager=_Models())
+    assert [a.is_significant for a in evaluator.evaluate_batch(_results(4), "goal")] == [True, False, False, True]
+
+    short = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(
+        content='[{"index": 1, "is_significant": true, "relevance_score": 0.8}]'))])
+    parsed = evaluator._parse_batch_response(short, _results(3))
+    assert [a.reasoning for a in parsed] == ["Not evaluated", "No reasoning provided", "Not evaluated"]
+
+
+def test_whole_round_packs_searches_into_one_call():
+    """EVIDENCE: three searches' results share one call when the model context allows it"""
+    client = _ScriptedClient()
+    evaluator = LLMFindingEvaluator(llm_client=client, model_manager=_Models())
+    batches = [_results(20, "a"), [], _results(15, "b"), _results(20, "c")]
+
+    per_search = evaluator.evaluate_batches(batches, "goal")
+    assert client.fan_outs == [3]
+
+    client.fan_outs, client.prompts = [], []
+    evaluator.clear_verdicts()
+    with patch.object(finding_evaluator_llm, 'get_model_info',
+                      return_value={"max_input_tokens": 128000, "max_output_tokens": 16384}):
+        whole_round = evaluator.evaluate_batches(batches, "goal", whole_round=True)
+
+    assert client.fan_outs == [] and len(client.prompts) == 1
+    assert [[a.reasoning for a in batch] for batch in whole_round] == [[r["text"] for r in b] for b in batches]
+    assert [[a.is_significant for a in b] for b in whole_round] == [[a.is_significant for a in b] for b in per_search]
+
+
+def test_whole_round_respects_output_limit(monkeypatch):
+    client = _ScriptedClient()
+    evaluator = LLMFindingEvaluator(llm_client=client, model_manager=_Models())
+    with patch.object(finding_evaluator_llm, 'get_model_info',
+                      return_value={"max_input_tokens": 128000, "max_output_tokens": 1000}):
+        evaluator.evaluate_batches([_results(30, "a"), _results(30, "b")], "goal", whole_round=True)
+
+    assert client.fan_outs == [3]  # 1000 output tokens / 40 per evaluation -> 25 results per call
+
+
+def test_engine_whole_round_evaluates_results_past_top_20():
+    """EVIDENCE: whole-round mode evaluates all 35 results of a search; per-search mode keeps the top 20"""
+    from investigation_engine import InvestigationEngine
+
+    engine = object.__new__(InvestigationEngine)
+    engine.finding_evaluator = LLMFindingEvaluator(llm_client=_ScriptedClient(), model_manager=_Models())
+    attempts = [SimpleNamespace(results_count=35, _raw_results=_results(35, "a")),
+                SimpleNamespace(results_count=5, _raw_results=_results(5, "b"))]
+
+    with patch.object(finding_evaluator_llm, 'get_model_info',
+                      return_value={"max_input_tokens": 128000, "max_output_tokens": 16384}):
+        whole_round = engine._evaluate_round_findings_concurrently(attempts, "goal", whole_round=True)
+    engine.finding_evaluator.clear_verdicts()
+    per_search = engine._evaluate_round_findings_concurrently(attempts, "goal")
+
+    assert [a.reasoning for a in whole_round[id(attempts[0])]] == [r["text"] for r in attempts[0]._raw_results]
+    assert len(per_search[id(attempts[0])]) == 20
@@ -0,0 +1,103 @@
+# test_finding_prefilter.py
+"""
+Test Suite for the Local Finding Pre-filter Tier
+
+Verifies that clear negatives (empty, promotional, foreign-language,
+off-goal) and clear positives are settled without the LLM, that only the
+uncertain band is sent to it, and that the metrics report tokens saved and
+the agreement rate on audited results.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from finding_evaluator_llm import LLMFindingEvaluator
+from finding_prefilter import FindingPrefilter
+from investigation_context import InvestigationContext
+
+GOAL = "Epstein flight logs passengers"
+
+STRONG = ("Epstein flight logs list 12 passengers on the March 3, 2002 trip; "
+          "filing cites \"payments of $250,000 to the pilot\" and 45% of trips")
+UNCERTAIN = "People keep arguing about the Epstein documents today"
+
+
+def _prefilter(**kwargs):
+    return FindingPrefilter(InvestigationContext(GOAL, "twitter_investigation"), **kwargs)
+
+
+def _result(text, **metadata):
+    return {'text': text, 'metadata': metadata}
+
+
+def test_clear_cases_are_settled_locally():
+    prefilter = _prefilter(audit_rate=0)
+
+    assert not prefilter.triage(_result("   "), GOAL).is_significant
+    assert "Promotional" in prefilter.triage(_result("Epstein giveaway! Use code FLIGHT for 20% off"), GOAL).reasoning
+    assert "language" in prefilter.triage(_result("Epstein vuelos registros", lang="es"), GOAL).reasoning
+    assert "language" in prefilter.triage(_result("エプスタインの飛行記録について"), GOAL).reasoning
+    assert not prefilter.triage(_result("Great weather at the beach this weekend"), GOAL).is_significant
+
+    accepted = prefilter.triage(_result(STRONG), GOAL)
+    assert accepted.is_significant and accepted.relevance_score == 1.0 and accepted.entities
+    assert prefilter.triage(_result(UNCERTAIN), GOAL) is None
+
+    metrics = prefilter.get_metrics()
+    assert (metrics['rejected'], metrics['accepted'], metrics['uncertain']) == (5, 1, 1)
+    assert metrics['agreement_rate'] is None
+
+
+def test_only_uncertain_band_reaches_llm_with_agreement_metrics():
+    """EVIDENCE: 4 clear results never reach the LLM; audited verdicts feed the agreement rate"""
+    llm = MagicMock()
+
+    def answer(**kwargs):
+        prompt = kwargs['messages'][-1]['content']
+        lines = [line for line in prompt.splitlines() if line.startswith("Result ")]
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(
+            [{"index": i, "is_significant": "12 passengers" in line, "relevance_score": 0.7, "reasoning": "llm"}
+             for i, line in enumerate(lines)])))])
+
+    llm.completion.side_effect = answer
+    evaluator = LLMFindingEvaluator(llm_client=llm, model_manager=MagicMock())
+    evaluator.prefilter = _prefilter(audit_rate=0)
+    results = [_result(STRONG), _result(UNCERTAIN), _result("Buy now, link in bio"), _result(""),
+               _result("Sunny weekend at the lake with family")]
+
+    assessments = evaluator.evaluate_batch(results, GOAL)
+
+    prompt = llm.completion.call_args.kwargs['messages'][-1]['content']
+    assert llm.completion.call_count == 1 and "Result 0: People keep arguing" in prompt and "Result 1" not in prompt
+    assert [a.is_significant for a in assessments] == [True, False, False, False, False]
+    assert assessments[1].reasoning == "llm"
+    assert evaluator.prefilter.get_metrics()['estimated_tokens_saved'] > 4 * 40
+
+    # With every local verdict audited, the LLM sees them too and agreement is measured
+    evaluator.clear_verdicts()
+    evaluator.prefilter = _prefilter(audit_rate=1.0)
+    evaluator.evaluate_batch(results[:1] + results[2:], GOAL)
+    metrics = evaluator.prefilter.get_metrics()
+    assert metrics['audited'] == 4 and metrics['agreement_rate'] == 1.0
+    assert metrics['estimated_tokens_saved'] == 0
+
+
+def test_indicators_match_whole_words_and_rejections_are_kept():
+    prefilter = _prefilter(audit_rate=0)
+    # 'subscribers' / 'read moreover' are not the 'subscribe' / 'read more' boilerplate
+    text = "Epstein flight logs: 12 passengers named, reporter tells subscribers to read moreover the filing"
+    assert prefilter.triage(_result(text), GOAL) is None
+    assert not prefilter.rejections
+
+    rejected = prefilter.triage(_result("Epstein flight logs thread, subscribe for part 2"), GOAL)
+    assert "'subscribe'" in rejected.reasoning
+    assert prefilter.get_metrics()['recent_rejections'][-1] == {
+        'text': "Epstein flight logs thread, subscribe for part 2",
+        'reason': "Promotional or generic content ('subscribe')"}
+
+
+def test_engine_prefilter_is_opt_in():
+    from investigation_engine import InvestigationConfig
+
+    assert InvestigationConfig().local_prefilter is False
@@ -0,0 +1,56 @@
+# test_goal_relevance_scoring.py
+"""
+Test Suite for Batch Goal-Relevance Scoring
+
+Verifies that InvestigationContext scores whole batches through one compiled
+word-boundary pattern, agrees with single-item scoring, follows keyword
+reassignment, and down-weights ubiquitous keywords when IDF weighting is on.
+"""
+
+from investigation_context import InvestigationContext
+
+
+def _context():
+    return InvestigationContext(analytic_question="Epstein flight logs", investigation_scope="twitter_investigation")
+
+
+def test_word_boundaries_replace_substring_matching():
+    """EVIDENCE: keywords no longer match inside unrelated words"""
+    context = InvestigationContext("Art auction fraud", "twitter_investigation")
+    assert context.goal_keywords == ["art", "auction", "fraud"]
+
+    assert context.calculate_goal_relevance_score("Start the party, smart people!") == 0.0
+    assert not context.is_relevant_to_goal("Start the party")
+    # Plural and possessive forms still count
+    assert context.calculate_goal_relevance_score("Two auctions and the art's provenance") == 2 / 3
+
+
+def test_batch_matches_single_scoring_and_follows_keyword_changes():
+    context = _context()
+    contents = ["Epstein flight logs unsealed", "Flight delayed", "", "Weather today"]
+
+    assert context.calculate_goal_relevance_scores(contents) == \
+        [context.calculate_goal_relevance_score(c) for c in contents] == [1.0, 1 / 3, 0.0, 0.0]
+
+    context.goal_keywords = ["weather"]
+    assert context.calculate_goal_relevance_scores(contents) == [0.0, 0.0, 0.0, 1.0]
+    context.goal_keywords = []
+    assert context.calculate_goal_relevance_scores(["anything"]) == [0.5]
+
+
+def test_idf_weighting_favours_rarer_goal_keywords():
+    context = _context()
+    batch = ["Epstein news", "Epstein again", "Epstein flight logs", "Epstein documents", "Flight tracker"]
+
+    plain = context.calculate_goal_relevance_scores(batch)
+    weighted = context.calculate_goal_relevance_scores(batch, use_idf=True)
+
+    # "epstein" appears in nearly every result so it is worth less than "flight"
+    weights = context.keyword_weights()
+    assert weights["epstein"] < weights["flight"] < weights["logs"]
+    assert plain[0] == plain[4] and weighted[0] < weighted[4]
+    assert weighted[2] == 1.0
+
+    # The corpus accumulates across rounds
+    context.calculate_goal_relevance_scores(["Logs logs logs"], use_idf=True)
+    assert context.keyword_weights()["logs"] < weights["logs"]
@@ -0,0 +1,110 @@
+# test_graph_serialization.py
+"""
+Test Suite for Streaming Graph Serialization
+
+Verifies the JSON Lines graph format round-trips with to_json(), streams
+section by section, and that the engine exports the session graph once.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+import twitter_config
+from graph_serialization import GraphRecordReader, iter_graph_lines, read_graph, write_graph
+from investigation_graph import InvestigationGraph
+
+
+def _sample_graph(compact=False):
+    graph = InvestigationGraph(compact=compact)
+    question = graph.create_analytic_question_node("What links the filings?")
+    search = graph.create_search_query_node("search.php", {"query": "filings", "search_type": "Latest"})
+    graph.create_edge(question, search, "MOTIVATES")
+    for i in range(5):
+        dp = graph.create_data_point_node(f"tweet {i}", {"source": "search.php"})
+        graph.create_edge(search, dp, "GENERATES", {"rank": i})
+    return graph
+
+
+def _document(graph):
+    data = json.loads(graph.to_json())
+    data.pop("created_at")
+    for edge in data["edges"]:
+        edge.pop("id")
+    return data
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("suffix", [".jsonl", ".jsonl.gz"])
+def test_round_trip_matches_to_json(tmp_path, compact, suffix):
+    """EVIDENCE: write_graph/read_graph reproduce the to_json() document"""
+    graph = _sample_graph(compact)
+    path = str(tmp_path / f"graph{suffix}")
+
+    assert write_graph(graph, path) == 1 + 2 + len(graph.nodes) + len(graph.edges)
+    restored = read_graph(path, compact=compact)
+
+    assert _document(restored) == _document(graph)
+    assert restored.analytic_question.properties["text"] == "What links the filings?"
+
+
+def test_zstd_round_trip(tmp_path):
+    pytest.importorskip("zstandard")
+    graph = _sample_graph()
+    path = str(tmp_path / "graph.jsonl.zst")
+    write_graph(graph, path)
+    assert _document(read_graph(path)) == _document(graph)
+
+
+def test_from_json_accepts_both_formats(tmp_path):
+    graph = _sample_graph()
+    from_lines = InvestigationGraph()
+    from_lines.from_json("\n".join(iter_graph_lines(graph)))
+    assert _document(from_lines) == _document(graph)
+
+    # read_graph also loads legacy to_json() files
+    legacy = tmp_path / "graph.json"
+    legacy.write_text(graph.to_json())
+    assert _document(read_graph(str(legacy))) == _document(graph)
+
+
+def test_reader_is_lazy_and_detects_truncation():
+    """EVIDENCE: records are pulled only as consumed; a short edge section raises"""
+    lines = list(iter_graph_lines(_sample_graph()))
+    consumed = []
+
+    def tracking(source):
+        for line in source:
+            consumed.append(line)
+            yield line
+
+    reader = GraphRecordReader(tracking(lines))
+    first_node = next(reader.nodes())
+    assert first_node["node_type"] == "AnalyticQuestion"
+    assert len(consumed) == 3  # header, section marker, one node
+
+    truncated = InvestigationGraph()
+    with pytest.raises(ValueError, match="ended unexpectedly"):
+        truncated.from_json("\n".join(lines[:-2]))
+
+
+def test_engine_exports_json_and_configured_stream(tmp_path, monkeypatch):
+    """EVIDENCE: current_investigation_graph.json is always written; JSON Lines is an extra file"""
+    from investigation_engine import InvestigationEngine
+
+    monkeypatch.chdir(tmp_path)
+    engine = object.__new__(InvestigationEngine)
+    engine.graph_mode = True
+    engine.llm_coordinator = SimpleNamespace(graph=_sample_graph())
+
+    with patch.object(twitter_config, 'GRAPH_EXPORT_FORMAT', 'jsonl.gz'):
+        engine._export_investigation_graph(SimpleNamespace(session_id="abc"))
+
+    streamed = read_graph(str(tmp_path / "investigation_graph_abc.jsonl.gz"))
+    exported = read_graph(str(tmp_path / "investigation_graph_abc.json"))
+    with open(tmp_path / "current_investigation_graph.json", encoding='utf-8') as f:
+        current = json.load(f)
+    assert len(streamed.nodes) == len(exported.nodes) == len(current["nodes"]) == 7
+    assert not (tmp_path / "current_investigation_graph.jsonl.gz").exists()
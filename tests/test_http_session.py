@@ -0,0 +1,131 @@
+# test_http_session.py
+"""
+Test Suite for Pooled HTTP Client
+
+Verifies that api_client page fetches go through a shared keep-alive pool
+and that repeated requests reuse connections instead of reconnecting.
+Uses a local HTTP/1.1 server so no network access is required.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+import api_client
+import http_session
+from http_session import PooledHTTPClient
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.startswith("/maintenance.php"):
+            body, content_type = b"<html>Down for maintenance</html>", "text/html"
+        else:
+            body, content_type = json.dumps({"timeline": [{"tweet_id": "1", "text": "hello"}]}).encode(), "application/json"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pooled_client_reuses_connections(local_server):
+    """EVIDENCE: 10 sequential GETs to one host should open a single connection"""
+    client = PooledHTTPClient(http2=False)
+    try:
+        for _ in range(10):
+            response = client.get(f"{local_server}/timeline.php", params={"screenname": "x"}, timeout=5)
+            assert response.status_code == 200
+
+        stats = client.get_stats()
+        print(f"Connection stats: {stats}")
+        assert stats['backend'] == 'requests'
+        assert stats['requests'] == 10
+        assert stats['new_connections'] == 1
+        assert stats['reused_connections'] == 9
+        assert stats['reuse_rate'] == pytest.approx(0.9)
+    finally:
+        client.close()
+
+
+def test_httpx_backend_counts_connections_from_pool_events(local_server):
+    """EVIDENCE: new connections come from httpcore connect events, not from tracking stream objects"""
+    httpx = pytest.importorskip("httpx")
+    # HTTP/1.1 httpx client stands in for the HTTP/2 one when the h2 extra is not installed
+    with patch.object(PooledHTTPClient, '_create_httpx_client', lambda self: httpx.Client()):
+        client = PooledHTTPClient(http2=True)
+    try:
+        for _ in range(10):
+            assert client.get(f"{local_server}/timeline.php", params={"screenname": "x"}, timeout=5).json()
+        client._httpx_client.close()  # Drops the pool; the next request must reconnect
+        client._httpx_client = httpx.Client()
+        client.get(f"{local_server}/timeline.php", timeout=5)
+
+        stats = client.get_stats()
+        assert stats['backend'] == 'httpx-http2'
+        assert (stats['requests'], stats['new_connections'], stats['reused_connections']) == (11, 2, 9)
+    finally:
+        client.close()
+
+
+def test_execute_api_step_uses_shared_client(local_server):
+    """EVIDENCE: execute_api_step fetches through the global pooled client"""
+    http_session.reset_http_client()
+    client = PooledHTTPClient(http2=False)
+    try:
+        with patch.object(api_client.config, 'RAPIDAPI_BASE_URL', local_server), \
+             patch.object(api_client.config, 'API_CACHE_ENABLED', False), \
+             patch.object(http_session, '_global_client', client):
+            for _ in range(3):
+                result = api_client.execute_api_step(
+                    {"endpoint": "timeline.php", "params": {"screenname": "x"}, "max_pages": 1},
+                    [], "test-key"
+                )
+                assert 'error' not in result
+                assert len(result['data']['timeline']) == 1
+
+            stats = http_session.get_connection_stats()
+            assert stats['requests'] == 3
+            assert stats['new_connections'] == 1
+    finally:
+        client.close()
+        http_session.reset_http_client()
+
+
+def test_non_json_page_reports_body_text(local_server):
+    """EVIDENCE: a 200 with an HTML body fails once with the body in the error, without network retries"""
+    client = PooledHTTPClient(http2=False)
+    try:
+        with patch.object(api_client.config, 'RAPIDAPI_BASE_URL', local_server), \
+             patch.object(api_client.config, 'API_CACHE_ENABLED', False), \
+             patch.object(api_client.config, 'RATE_LIMITER_ENABLED', False), \
+             patch.object(api_client.time, 'sleep') as sleep, \
+             patch.object(http_session, '_global_client', client):
+            result = api_client.execute_api_step(
+                {"endpoint": "maintenance.php", "params": {"screenname": "x"}, "max_pages": 1}, [], "test-key"
+            )
+
+        assert result['error'].startswith("Invalid JSON response from API")
+        assert "Down for maintenance" in result['error']
+        sleep.assert_not_called()
+        assert client.get_stats()['requests'] == 1
+    finally:
+        client.close()
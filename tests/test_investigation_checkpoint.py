@@ -0,0 +1,184 @@
+# test_investigation_checkpoint.py
+"""
+Test Suite for Per-Round Investigation Checkpoints
+
+Runs the engine's round loop with stubbed strategy and search execution to
+verify that a crashed investigation resumes after its last completed round
+with session, coordinator and graph state intact and no repeated searches.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import twitter_config
+from finding_evaluator_llm import FindingAssessment, LLMFindingEvaluator
+from investigation_checkpoint import has_checkpoint, load_checkpoint
+from investigation_engine import (InvestigationConfig, InvestigationEngine, InvestigationSession,
+                                  SearchAttempt, Finding)
+from investigation_graph import InvestigationGraph
+from rejection_feedback import RejectionFeedback
+
+
+class _Coordinator:
+    """Holds the state GraphAwareLLMCoordinator checkpoints"""
+
+    def __init__(self):
+        self.graph = InvestigationGraph()
+        self.llm = MagicMock()
+        self.search_history = []
+        self.endpoint_usage = {}
+
+    def get_checkpoint_state(self):
+        return {'search_history': self.search_history, 'endpoint_usage': dict(self.endpoint_usage)}
+
+    def restore_checkpoint_state(self, state):
+        self.search_history = state['search_history']
+        self.endpoint_usage = state['endpoint_usage']
+
+
+class _StubbedEngine(InvestigationEngine):
+    """Engine whose strategy and searches are scripted; crashes when asked for round crash_at"""
+
+    def __init__(self, crash_at=None):
+        self.progress_container = None
+        self.graph_mode = True
+        self.llm_coordinator = _Coordinator()
+        self.model_manager = MagicMock()
+        self.logger = MagicMock()
+        self.crash_at = crash_at
+        self.executed = []
+
+    def _generate_strategy(self, session):
+        round_number = session.round_count + 1
+        if round_number == self.crash_at:
+            raise RuntimeError("process killed")
+        return {'description': f"round {round_number}",
+                'searches': [{'endpoint': 'search.php', 'params': {'query': f"r{round_number} q{i}"}}
+                             for i in range(2)]}
+
+    def _execute_search(self, search_plan, search_id, round_number):
+        query = search_plan['params']['query']
+        self.executed.append(query)
+        graph = self.llm_coordinator.graph
+        node = graph.create_search_query_node('search.php', {'query': query})
+        graph.create_edge(graph.analytic_question, node, "MOTIVATES")
+        self.llm_coordinator.search_history.append({'endpoint': 'search.php', 'query': query})
+        self.llm_coordinator.endpoint_usage['search.php'] = self.llm_coordinator.endpoint_usage.get('search.php', 0) + 1
+        return SearchAttempt(search_id, round_number, 'search.php', search_plan['params'], query, 3, 6.0, 0.1)
+
+    def _analyze_round_results_with_llm(self, session, current_round, results):
+        session.accumulated_findings.append(
+            Finding(f"finding {current_round.round_number}", "search.php", 0.8, "general", results[0].search_id, "high"))
+
+
+@pytest.fixture
+def checkpoint_env(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(twitter_config, 'CHECKPOINT_ENABLED', True)
+    monkeypatch.setattr(twitter_config, 'CHECKPOINT_DIR', str(tmp_path / "checkpoints"))
+    monkeypatch.setattr(twitter_config, 'GRAPH_WAL_ENABLED', False)
+    with patch('investigation_engine.investigation_logger') as logger, \
+            patch('investigation_engine.RealTimeInsightSynthesizer'), \
+            patch('investigation_engine.BRIDGE_AVAILABLE', False), \
+            patch.object(InvestigationEngine, '_export_investigation_graph'):
+        logger.start_session.return_value = "session-1"
+        logger.resume_session.side_effect = lambda session_id, query: session_id
+        yield logger
+
+
+def _config():
+    return InvestigationConfig(max_searches=6, satisfaction_enabled=False)
+
+
+def test_resume_continues_after_last_completed_round(checkpoint_env):
+    """EVIDENCE: resumed run picks up at round 3 and never re-executes rounds 1-2 searches"""
+    crashed = _StubbedEngine(crash_at=3).conduct_investigation("Who funds the campaign?", _config())
+    assert "failed" in crashed.completion_reason
+    assert has_checkpoint("session-1")
+
+    engine = _StubbedEngine()
+    session = engine.resume_investigation("session-1")
+
+    assert engine.executed == ["r3 q0", "r3 q1"]
+    assert session.search_count == 6 and session.round_count == 3
+    assert [len(r.searches) for r in session.rounds] == [2, 2, 2]
+    assert [f.content for f in session.accumulated_findings] == ["finding 1", "finding 2", "finding 3"]
+    assert "Reached maximum search limit" in session.completion_reason
+
+    # Coordinator and graph state carried over, then extended by round 3
+    assert len(engine.llm_coordinator.search_history) == 6
+    assert engine.llm_coordinator.endpoint_usage == {'search.php': 6}
+    graph = engine.llm_coordinator.graph
+    assert len(graph.get_nodes_by_type("SearchQuery")) == 6
+    assert len(graph.get_nodes_by_type("AnalyticQuestion")) == 1
+    assert session.root_node_id == graph.analytic_question.id
+    checkpoint_env.resume_session.assert_called_once()
+    assert not has_checkpoint("session-1")  # Completed investigations clean up after themselves
+
+
+class _FindingEngine(_StubbedEngine):
+    """Every round sees the same viral tweet; only the first sighting is evaluated and stored"""
+
+    TWEET = {'text': "The same viral tweet about the campaign's largest donors, reposted everywhere"}
+
+    def __init__(self, crash_at=None):
+        super().__init__(crash_at)
+        self.finding_evaluator = LLMFindingEvaluator(llm_client=MagicMock(), model_manager=MagicMock())
+        self.duplicates = []
+
+    def _analyze_round_results_with_llm(self, session, current_round, results):
+        key, duplicate = self.finding_dedup.key_for(dict(self.TWEET))
+        self.duplicates.append(duplicate)
+        if not duplicate:
+            self.finding_evaluator.verdicts[key] = FindingAssessment(True, 0.9, 0.8, {}, [], None, "donors")
+            self.finding_datapoints[key] = self.llm_coordinator.graph.create_data_point_node(self.TWEET['text'], {})
+
+
+def test_resume_restores_dedup_and_verdicts(checkpoint_env):
+    """EVIDENCE: a finding processed before the crash is recognised, not re-evaluated or re-created"""
+    _FindingEngine(crash_at=2).conduct_investigation("Who funds the campaign?", _config())
+
+    engine = _FindingEngine()
+    engine.resume_investigation("session-1")
+
+    assert engine.duplicates == [True, True]
+    graph = engine.llm_coordinator.graph
+    assert len(graph.get_nodes_by_type("DataPoint")) == 1
+    (key, datapoint), = engine.finding_datapoints.items()
+    assert datapoint is graph.get_nodes_by_type("DataPoint")[0]
+    assert engine.finding_evaluator.verdicts[key].reasoning == "donors"
+
+
+def test_session_checkpoint_round_trip():
+    session = InvestigationSession("query", InvestigationConfig(max_searches=9))
+    round_obj = session.start_new_round("first")
+    session.add_search_attempt(SearchAttempt(1, 1, 'search.php', {'query': 'a'}, 'a', 4, 5.0, 0.2,
+                                             key_findings=["k"]))
+    round_obj.key_insights = ["insight"]
+    session.rejection_feedback_history.append(RejectionFeedback(1, 10, 4, 6, 0.6, rejection_themes=["spam"]))
+    session.dead_ends.append("timeline.php for @nobody")
+
+    restored = InvestigationSession.from_checkpoint(session.to_checkpoint())
+
+    assert restored.config.max_searches == 9
+    assert restored.rounds[0].searches[0] is restored.search_history[0]
+    assert restored.rounds[0].key_insights == ["insight"]
+    assert restored.search_history[0].key_findings == ["k"]
+    assert restored.rejection_feedback_history[0].rejection_themes == ["spam"]
+    assert restored.dead_ends == session.dead_ends
+    assert restored.total_results_found == 4
+
+    # A new config (e.g. a higher search limit) replaces the saved one
+    assert InvestigationSession.from_checkpoint(session.to_checkpoint(),
+                                                InvestigationConfig(max_searches=50)).config.max_searches == 50
+
+
+def test_checkpoint_graph_loads_into_existing_graph(checkpoint_env):
+    engine = _StubbedEngine(crash_at=2)
+    engine.conduct_investigation("Who funds the campaign?", _config())
+
+    target = InvestigationGraph()
+    state, graph = load_checkpoint("session-1", graph=target)
+    assert graph is target and len(target.get_nodes_by_type("SearchQuery")) == 2
+    assert state['session']['round_count'] == 1
@@ -144,6 +144,147 @@ def test_failed_pattern_detection():
     assert len(failed_patterns) > 0
     assert any("find different 2024" in pattern for pattern in failed_patterns)
 
+def test_search_query_index_lookups():
+    """EVIDENCE: SearchQuery lookups use the index and survive JSON round-trips"""
+    graph = InvestigationGraph()
+    first = graph.create_search_query_node("search.php", {"query": "Trump  Epstein", "search_type": "Latest"})
+    graph.create_search_query_node("search.php", {"query": "trump epstein", "search_type": "Top"})
+    timeline = graph.create_search_query_node("timeline.php", {"screenname": "someone", "filters": {"b": 1, "a": [1, 2]}})
+
+    # Parameter order doesn't matter, values do
+    assert graph.find_search_query_node("search.php", {"search_type": "Latest", "query": "Trump  Epstein"}) is first
+    assert graph.find_search_query_node("timeline.php", {"filters": {"a": [1, 2], "b": 1}, "screenname": "someone"}) is timeline
+    assert graph.find_search_query_node("search.php", {"query": "Trump  Epstein"}) is None
+
+    assert len(graph.find_search_query_nodes_by_endpoint("search.php")) == 2
+    assert len(graph.find_search_query_nodes_by_query(" TRUMP epstein ")) == 2
+
+    restored = InvestigationGraph()
+    restored.from_json(graph.to_json())
+    found = restored.find_search_query_node("search.php", {"query": "Trump  Epstein", "search_type": "Latest"})
+    assert found is not None and found.id == first.id
+    assert [n.id for n in restored.find_search_query_nodes_by_endpoint("timeline.php")] == [timeline.id]
+
+def test_components_tracked_incrementally():
+    """EVIDENCE: deep chains don't hit the recursion limit; direct node removal triggers a rebuild"""
+    graph = InvestigationGraph()
+    chain = [graph.create_data_point_node(f"tweet {i}", {"source": "twitter"}) for i in range(5000)]
+    for previous, current in zip(chain, chain[1:]):
+        graph.create_edge(previous, current, "RELATES_TO")
+    other_q = graph.create_investigation_question_node("separate thread")
+    other_search = graph.create_search_query_node("search.php", {"query": "separate"})
+    graph.create_edge(other_q, other_search, "OPERATIONALIZES")
+
+    threads = graph.get_disconnected_threads()
+    assert sorted(len(t) for t in threads) == [2, 5000]
+    assert graph.are_connected(chain[0].id, chain[-1].id)
+    assert not graph.are_connected(chain[0].id, other_q.id)
+
+    # Cutting the chain in the middle splits the component
+    del graph.nodes[chain[2500].id]
+    assert sorted(len(t) for t in graph.get_disconnected_threads()) == [2, 2499, 2500]
+    assert not graph.are_connected(chain[0].id, chain[-1].id)
+
+def test_answered_questions_track_new_edges():
+    """EVIDENCE: answered-question cache follows edges added before and after a query"""
+    graph = InvestigationGraph()
+    questions = [graph.create_investigation_question_node(f"question {i}") for i in range(3)]
+    searches = [graph.create_search_query_node("search.php", {"query": f"q{i}"}) for i in range(3)]
+    for q, s in zip(questions, searches):
+        graph.create_edge(q, s, "OPERATIONALIZES")
+    dp = graph.create_data_point_node("shared evidence", {"source": "twitter"})
+    graph.create_edge(searches[0], dp, "GENERATES")
+    assert graph.get_answered_questions() == []
+
+    insight = graph.create_insight_node("finding", "pattern")
+    graph.create_edge(dp, insight, "SUPPORTS")
+    assert graph.get_answered_questions() == [questions[0]]
+
+    # Joining an already-answered subgraph answers the new question too
+    graph.create_edge(searches[2], dp, "GENERATES")
+    assert graph.get_answered_questions() == [questions[0], questions[2]]
+
+    restored = InvestigationGraph()
+    restored.from_json(graph.to_json())
+    assert [q.id for q in restored.get_answered_questions()] == [questions[0].id, questions[2].id]
+
+    # Removing the insight behind the graph's back forces a rebuild
+    del graph.nodes[insight.id]
+    assert graph.get_answered_questions() == []
+
+def test_compact_storage_matches_default_api():
+    """EVIDENCE: compact graphs answer the same queries and serialize to the same document shape"""
+    default_graph = populate_test_investigation_graph()
+    compact_graph = InvestigationGraph(compact=True)
+    compact_graph.from_json(default_graph.to_json())
+
+    assert len(compact_graph.nodes) == len(default_graph.nodes)
+    assert compact_graph.get_information_gaps() == default_graph.get_information_gaps()
+    assert len(compact_graph.get_disconnected_threads()) == len(default_graph.get_disconnected_threads())
+    assert compact_graph.get_failed_patterns() == default_graph.get_failed_patterns()
+
+    # UUIDs from the loaded document still resolve, and survive re-serialization
+    analytic_uuid = default_graph.analytic_question.id
+    assert compact_graph.nodes[analytic_uuid] is compact_graph.analytic_question
+    assert json.loads(compact_graph.to_json())["analytic_question"] == analytic_uuid
+
+    # New nodes keep string ids, so ids echoed back as strings (e.g. by an LLM) still resolve
+    search = compact_graph.create_search_query_node("search.php", {"query": "flight logs"})
+    data = compact_graph.create_data_point_node("tweet text", {"source": "twitter"})
+    edge = compact_graph.create_edge(search, data, "GENERATES", {"rank": 1})
+    assert isinstance(data.id, str) and isinstance(edge.id, str)
+    assert compact_graph.nodes.get(str(data.id)) is data
+    assert data.content == "tweet text" and search.parameters == {"query": "flight logs"}
+    assert compact_graph.get_outgoing_edges(str(search.id))[0].properties == {"rank": 1}
+    assert compact_graph.get_incoming_edges(compact_graph.serialized_node_id(data)) == [edge]
+
+    # Edge ids are assigned once: repeated exports and a reload agree
+    assert compact_graph.serialize_edge(edge)["id"] == compact_graph.serialize_edge(edge)["id"]
+    exported = json.loads(compact_graph.to_json())["edges"]
+    reloaded = InvestigationGraph(compact=True)
+    reloaded.from_json(compact_graph.to_json())
+    assert [e["id"] for e in json.loads(reloaded.to_json())["edges"]] == [e["id"] for e in exported]
+
+def test_compact_id_properties_resolve_after_reload(tmp_path):
+    """EVIDENCE: ids held in properties are exported as UUIDs and resolve again after a reload"""
+    graph = InvestigationGraph(compact=True)
+    analytic = graph.create_analytic_question_node("Who flew on Epstein's plane?")
+    question = graph.create_investigation_question_node("Which flight logs are public?")
+    dps = [graph.create_data_point_node(f"Flight log entry {i}", {"source": "twitter"}) for i in range(2)]
+    insight = graph.create_insight_node_enhanced("Logs agree on four flights", 0.8, [dp.id for dp in dps])
+
+    document = json.loads(graph.to_json())
+    exported = document["nodes"][graph.serialized_node_id(insight.node)]["properties"]
+    assert exported["supporting_datapoints"] == [graph.serialized_node_id(dp) for dp in dps]
+    assert (document["nodes"][graph.serialized_node_id(question)]["properties"]["parent_analytic_question"]
+            == graph.serialized_node_id(analytic))
+    assert insight.node.properties["supporting_datapoints"] == [dp.id for dp in dps]  # Stored ids untouched
+
+    for reloaded in (InvestigationGraph(compact=True), InvestigationGraph(compact=False)):
+        reloaded.from_json(graph.to_json())
+        reloaded_insight = reloaded.get_nodes_by_type("Insight")[0]
+        supporting = [reloaded.nodes[dp_id] for dp_id in reloaded_insight.properties["supporting_datapoints"]]
+        assert [dp.properties["content"] for dp in supporting] == ["Flight log entry 0", "Flight log entry 1"]
+        reloaded_question = reloaded.get_nodes_by_type("InvestigationQuestion")[0]
+        assert reloaded.nodes[reloaded_question.properties["parent_analytic_question"]] is reloaded.analytic_question
+
+def test_compact_storage_uses_less_memory():
+    """EVIDENCE: slotted nodes/edges with short index ids allocate less than dataclass nodes"""
+    import tracemalloc
+
+    def allocated(compact):
+        tracemalloc.start()
+        graph = InvestigationGraph(compact=compact)
+        search = graph.create_search_query_node("search.php", {"query": "q"})
+        for n in range(2000):
+            dp = graph.create_data_point_node(f"tweet {n}", {"source": "search.php"})
+            graph.create_edge(search, dp, "GENERATES")
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return current
+
+    assert allocated(compact=True) < 0.85 * allocated(compact=False)
+
 # Helper function for test data
 def populate_test_investigation_graph() -> InvestigationGraph:
     """Create a realistic test investigation graph"""
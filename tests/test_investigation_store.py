@@ -0,0 +1,93 @@
+# test_investigation_store.py
+"""
+Test Suite for the Cross-Investigation SQLite Store
+
+Exports small graphs in both formats, ingests them, and verifies full-text,
+indexed-column and property queries across investigations plus incremental
+re-ingestion.
+"""
+
+import os
+
+import pytest
+
+from graph_serialization import write_graph
+from investigation_graph import InvestigationGraph
+from investigation_store import InvestigationStore, investigation_id_for_path
+
+
+def _graph(question, tweets, query):
+    graph = InvestigationGraph()
+    root = graph.create_analytic_question_node(question)
+    search = graph.create_search_query_node("search.php", {"query": query, "search_type": "Latest"})
+    graph.create_edge(root, search, "MOTIVATES")
+    for text in tweets:
+        dp = graph.create_data_point_node(text, {"source": "search.php"})
+        graph.create_edge(search, dp, "GENERATES")
+    insight = graph.create_insight_node("Flight logs recur across filings", "pattern")
+    insight.properties["title"] = "Recurring flight logs"
+    return graph
+
+
+@pytest.fixture
+def exported(tmp_path):
+    first = tmp_path / "investigation_graph_aaa.json"
+    first.write_text(_graph("Who flew with whom?", ["Flight logs released today", "Unrelated sports news"],
+                            "Flight Logs").to_json())
+    second = tmp_path / "investigation_graph_bbb.jsonl.gz"
+    write_graph(_graph("What do the filings say?", ["Court filing cites flight logs"], "court filings"), str(second))
+    store = InvestigationStore(str(tmp_path / "store.sqlite"))
+    yield store, first, second
+    store.close()
+
+
+def test_ingest_and_full_text_search_across_investigations(exported):
+    """EVIDENCE: one FTS query finds matching DataPoints in both export formats"""
+    store, first, second = exported
+    assert store.ingest_paths([str(first), str(second)]) == {'ingested': 2, 'skipped': 0, 'failed': 0}
+
+    hits = store.search_content("flight logs", node_types=["DataPoint"])
+    assert sorted(h['investigation_id'] for h in hits) == ['aaa', 'bbb']
+    assert all(h['node_type'] == 'DataPoint' for h in hits)
+
+    # Insight titles are searchable; FTS syntax passes through with raw_query
+    assert store.search_content("recurring", node_types=["Insight"])[0]['properties']['title'] == "Recurring flight logs"
+    assert len(store.search_content("court OR sports", raw_query=True)) == 2
+
+    investigations = {i['investigation_id']: i for i in store.list_investigations()}
+    assert investigations['aaa']['analytic_question'] == "Who flew with whom?"
+    assert investigations['bbb']['node_count'] == 4
+
+
+def test_indexed_lookups(exported):
+    store, first, second = exported
+    store.ingest_paths([str(first), str(second)])
+
+    searches = store.find_nodes(node_type="SearchQuery", endpoint="search.php", query_text="  flight   LOGS")
+    assert [s['investigation_id'] for s in searches] == ['aaa']
+    assert searches[0]['properties']['parameters']['search_type'] == "Latest"
+    assert len(store.find_nodes(node_type="DataPoint", since="2000-01-01")) == 3
+    assert store.find_nodes(node_type="DataPoint", until="2000-01-01") == []
+    assert len(store.find_by_property("insight_type", "pattern", node_type="Insight")) == 2
+
+    root = store.find_nodes(node_type="AnalyticQuestion", investigation_id="aaa")[0]
+    assert [e['edge_type'] for e in store.get_edges("aaa", root['node_id'])] == ["MOTIVATES"]
+
+
+def test_reingest_skips_unchanged_and_replaces_changed(exported):
+    store, first, second = exported
+    store.ingest_paths([str(first), str(second)])
+    assert store.ingest_paths([str(first), str(second)])['skipped'] == 2
+
+    first.write_text(_graph("Who flew with whom?", ["Only one tweet now"], "flight logs").to_json())
+    os.utime(first, (1, 1))
+    assert store.ingest_file(str(first))
+    assert store.find_nodes(node_type="DataPoint", investigation_id="aaa")[0]['content'] == "Only one tweet now"
+    assert store.search_content("released") == []
+    assert store.get_stats()['nodes'] == 8
+
+
+def test_investigation_id_for_path():
+    assert investigation_id_for_path("/x/investigation_graph_1fcb.json") == "1fcb"
+    assert investigation_id_for_path("investigation_graph_1fcb.jsonl.zst") == "1fcb"
+    assert investigation_id_for_path("other.json") == "other"
@@ -0,0 +1,125 @@
+# test_llm_response_cache.py
+"""
+Test Suite for Exact-Match LLM Response Cache
+
+Stubs litellm and points the cache at a temporary SQLite file to verify
+hits, structured-output rehydration, per-call opt-out and tracer hit rate.
+"""
+
+import json
+import sqlite3
+from unittest.mock import patch
+
+import litellm
+import pytest
+
+import llm_client
+import response_cache
+from llm_client import LiteLLMClient, InvestigationEvaluation
+from response_cache import ResponseCache
+from utils.llm_call_tracer import get_tracer
+
+EVALUATION = json.dumps({"relevance_score": 6.5, "information_value": 4.0, "key_insights": ["x"],
+                         "remaining_gaps": [], "should_continue": True, "continuation_strategy": None})
+
+
+def _response(content):
+    return litellm.ModelResponse(choices=[{"message": {"role": "assistant", "content": content}}], model="stub")
+
+
+@pytest.fixture
+def llm_cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "llm.sqlite"), max_entries=10, default_ttl=60)
+    with patch.object(response_cache, '_llm_cache', cache), \
+            patch.object(llm_client.twitter_config, 'LLM_CACHE_ENABLED', True):
+        get_tracer().reset()
+        yield cache
+        get_tracer().reset()
+    cache.close()
+
+
+def test_repeat_prompt_served_from_cache_with_parsed_model(llm_cache):
+    """EVIDENCE: second identical structured call skips litellm and rehydrates parsed"""
+    client = LiteLLMClient()
+    messages = [{"role": "user", "content": "evaluate round 1"}]
+
+    with patch.object(llm_client, 'completion', return_value=_response(EVALUATION)) as live:
+        first = client.completion("gpt-4o-mini", messages, response_format=InvestigationEvaluation)
+        # Re-indented prompt text still matches
+        second = client.completion("gpt-4o-mini", [{"role": "user", "content": "\n   evaluate round 1  \n"}],
+                                   response_format=InvestigationEvaluation)
+
+    assert live.call_count == 1
+    assert isinstance(second.choices[0].message.parsed, InvestigationEvaluation)
+    assert second.choices[0].message.parsed == first.choices[0].message.parsed
+    assert get_tracer().get_cache_stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+    assert get_tracer().get_call_summary()["cache"]["hits"] == 1
+
+
+def test_key_includes_schema_and_temperature(llm_cache):
+    client = LiteLLMClient()
+    messages = [{"role": "user", "content": "same prompt"}]
+
+    with patch.object(llm_client, 'completion', return_value=_response(EVALUATION)) as live:
+        client.completion("gpt-4o-mini", messages, temperature=0.1)
+        client.completion("gpt-4o-mini", messages, temperature=0.9)
+        client.completion("gpt-4o-mini", messages, temperature=0.1, response_format=InvestigationEvaluation)
+        client.completion("gpt-4o-mini", messages, temperature=0.1)
+
+    assert live.call_count == 3
+
+
+def test_reindented_prompt_hits_cache(llm_cache):
+    client = LiteLLMClient()
+    prompt = "Evaluate these results:\n    1. flight logs\n    2. court filing"
+    reindented = "Evaluate these results:\n\t1. flight logs\n        2.  court filing\n"
+
+    with patch.object(llm_client, 'completion', return_value=_response(EVALUATION)) as live:
+        client.completion("gpt-4o-mini", [{"role": "user", "content": prompt}])
+        client.completion("gpt-4o-mini", [{"role": "user", "content": reindented}])
+        client.completion("gpt-4o-mini", [{"role": "user", "content": prompt.replace("1.", "3.")}])
+
+    assert live.call_count == 2
+
+
+def test_cache_opt_out_and_unparseable_responses_not_stored(llm_cache):
+    client = LiteLLMClient()
+    messages = [{"role": "user", "content": "fresh answer please"}]
+
+    with patch.object(llm_client, 'completion', return_value=_response("not json")) as live:
+        client.completion("gpt-4o-mini", messages, cache=False)
+        client.completion("gpt-4o-mini", messages, cache=False)
+        assert live.call_count == 2
+        assert llm_cache.get_stats()['entries'] == 0
+
+        # Failed structured parse is not pinned in the cache
+        client.completion("gpt-4o-mini", messages, response_format=InvestigationEvaluation)
+        client.completion("gpt-4o-mini", messages, response_format=InvestigationEvaluation)
+        assert live.call_count == 4
+
+
+def test_cache_hit_is_not_traced_as_llm_call(llm_cache):
+    """EVIDENCE: a hit shows up only in the cache stats, not in the LLM call count"""
+    client = LiteLLMClient()
+    messages = [{"role": "user", "content": "evaluate round 2"}]
+
+    with patch.object(llm_client, 'completion', return_value=_response(EVALUATION)):
+        client.completion("gpt-4o-mini", messages, purpose="evaluation")
+        client.completion("gpt-4o-mini", messages, purpose="evaluation")
+
+    assert get_tracer().get_call_summary()["purposes"] == {"evaluation": 1}
+    assert get_tracer().get_cache_stats()["hits"] == 1
+
+
+def test_cache_errors_count_as_misses(llm_cache):
+    client = LiteLLMClient()
+    messages = [{"role": "user", "content": "cache is broken"}]
+
+    with patch.object(llm_cache, 'get', side_effect=sqlite3.OperationalError("database is locked")), \
+            patch.object(llm_cache, 'set', side_effect=sqlite3.OperationalError("database is locked")), \
+            patch.object(llm_client, 'completion', return_value=_response(EVALUATION)) as live:
+        response = client.completion("gpt-4o-mini", messages)
+
+    assert live.call_count == 1
+    assert response.choices[0].message.content == EVALUATION
+    assert get_tracer().get_cache_stats()["misses"] == 1
@@ -0,0 +1,101 @@
+# test_local_embeddings.py
+"""
+Test Suite for Local Embedding Grouping in Insight Synthesis
+
+Verifies the hashed TF-IDF embedder, vectorized cosine clustering and the
+growing DataPoint index, and that RealTimeInsightSynthesizer decides when to
+synthesize and groups DataPoints locally - calling the LLM only to write the
+insight text.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+import realtime_insight_synthesizer
+
+from investigation_context import InvestigationContext
+from investigation_graph import InvestigationGraph
+from local_embeddings import HashedTfidfEmbedder, VectorIndex, cluster_by_similarity, cohesion
+from realtime_insight_synthesizer import InsightSynthesis, RealTimeInsightSynthesizer
+
+FLIGHT_TWEETS = [
+    "Unsealed flight logs list Clinton on four Epstein flights in 2002",
+    "Epstein flight logs show Clinton aboard the jet four times, court filing says",
+    "Court filing: Clinton appears on Epstein flight logs for 2002 trips",
+]
+OTHER_TWEETS = [
+    "Stock markets rally as inflation cools in September",
+    "New recipe for sourdough bread with a crisp crust",
+]
+
+
+def test_clusters_and_cohesion():
+    index = VectorIndex(HashedTfidfEmbedder(dim=1024))
+    ids = [f"dp_{i}" for i in range(5)]
+    index.add(ids, FLIGHT_TWEETS + OTHER_TWEETS)
+    vectors = index.vectors(ids)
+
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    clusters = cluster_by_similarity(vectors, 0.2)
+    assert clusters[0] == [0, 1, 2]
+    assert all(len(members) == 1 for members in clusters[1:])
+    assert cohesion(vectors[[0, 1, 2]]) > cohesion(vectors[[0, 3, 4]])
+    assert cohesion(vectors[:1]) == 0.0
+    assert cluster_by_similarity(vectors[:0], 0.2) == []
+
+
+def test_index_grows_and_skips_known_ids():
+    index = VectorIndex(HashedTfidfEmbedder(dim=256))
+    ids = [f"dp_{i}" for i in range(100)]
+    index.add(ids, [f"tweet number {i} about topic {i % 7}" for i in range(100)])
+    index.add(["dp_0"], ["different text"])
+
+    assert len(index) == 100 and "dp_99" in index
+    assert index.embedder.documents == 100  # Re-adding a known id does not count it again
+    assert index.vectors(["dp_99", "dp_0"]).shape == (2, 256)
+
+
+@pytest.fixture(autouse=True)
+def _synthesis_logs_in_tmp(monkeypatch, tmp_path):
+    monkeypatch.setattr(realtime_insight_synthesizer, 'SYNTHESIS_LOG_DIR', str(tmp_path))
+
+
+def _synthesizer(investigation_id):
+    context = InvestigationContext("Who flew on Epstein's plane?", "twitter")
+    context.investigation_id = investigation_id
+    llm = MagicMock()
+    synthesizer = RealTimeInsightSynthesizer(llm, InvestigationGraph(), context, model_manager=MagicMock())
+    assert synthesizer.embedding_index is not None
+    return synthesizer, llm
+
+
+def test_local_decision_and_grouping_leave_only_insight_text_to_llm():
+    """EVIDENCE: a cohesive batch is grouped locally and only the insight itself costs an LLM call"""
+    synthesizer, llm = _synthesizer("test_local_embeddings")
+    insight = InsightSynthesis(
+        title="Flight logs place Clinton on Epstein's jet", content="Three sources agree on four 2002 flights",
+        confidence_level=0.8, pattern_type="connection", key_evidence=["court filing"], investigation_relevance=0.9)
+    llm.completion.return_value = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(parsed=insight))])
+
+    ids = [synthesizer.graph.create_data_point_node(text, {}).id for text in OTHER_TWEETS + FLIGHT_TWEETS]
+    created = None
+    for dp_id in ids:
+        created = synthesizer.process_new_datapoint(dp_id) or created
+
+    assert created and len(created) == 1
+    assert llm.completion.call_count == 1
+    assert llm.completion.call_args.kwargs['response_format'] is InsightSynthesis
+    prompt = llm.completion.call_args.kwargs['messages'][-1]['content']
+    assert FLIGHT_TWEETS[0] in prompt and OTHER_TWEETS[0] not in prompt
+
+
+def test_incoherent_batch_waits_for_more_datapoints():
+    synthesizer, llm = _synthesizer("test_local_embeddings_wait")
+    ids = [synthesizer.graph.create_data_point_node(text, {}).id
+           for text in OTHER_TWEETS + ["Weather forecast: heavy rain expected tomorrow"]]
+
+    assert not synthesizer._should_synthesize_local(ids)
+    llm.completion.assert_not_called()
@@ -0,0 +1,138 @@
+# test_pagination_prefetch.py
+"""
+Test Suite for Speculative Cursor Prefetch
+
+Verifies that multi-page fetches keep page order with prefetch on, that the
+fixed inter-page sleep is replaced by limiter pacing, and that the
+stop_when predicate abandons pagination early.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+import api_client
+import response_cache
+from response_cache import ResponseCache
+
+PAGE_DELAY_SECONDS = 0.1
+
+
+class _PagedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requested_cursors = []
+
+    def do_GET(self):
+        cursor = parse_qs(urlparse(self.path).query).get("cursor", ["p1"])[0]
+        type(self).requested_cursors.append(cursor)
+        time.sleep(PAGE_DELAY_SECONDS)
+        page = int(cursor[1:])
+        body = json.dumps({
+            "timeline": [{"tweet_id": f"{page}-{i}", "text": f"page {page}"} for i in range(2)],
+            "next_cursor": f"p{page + 1}" if page < 5 else None
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def paged_api():
+    _PagedHandler.requested_cursors = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PagedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with patch.object(api_client.config, 'RAPIDAPI_BASE_URL', f"http://127.0.0.1:{server.server_address[1]}"), \
+         patch.object(api_client.config, 'API_CACHE_ENABLED', False):
+        yield _PagedHandler
+    server.shutdown()
+    server.server_close()
+
+
+PLAN = {"endpoint": "timeline.php", "params": {"screenname": "someone"}, "max_pages": 3}
+
+
+def _tweet_ids(result):
+    return [t['tweet_id'] for t in result['data']['timeline']]
+
+
+def test_prefetch_preserves_page_order(paged_api):
+    result = api_client.execute_api_step(PLAN, [], "key", prefetch=True)
+    assert _tweet_ids(result) == ["1-0", "1-1", "2-0", "2-1", "3-0", "3-1"]
+    assert paged_api.requested_cursors == ["p1", "p2", "p3"]
+
+
+def test_async_prefetch_matches_sync(paged_api):
+    sync_result = api_client.execute_api_step(PLAN, [], "key", prefetch=True)
+    async_result = asyncio.run(api_client.execute_api_step_async(PLAN, [], "key", prefetch=True))
+    assert async_result == sync_result
+
+
+def test_limiter_pacing_replaces_fixed_sleep(paged_api):
+    """EVIDENCE: 3 pages no longer pay 2 x 0.5s fixed sleeps"""
+    with patch.object(api_client.config, 'RATE_LIMITER_ENABLED', False):
+        start = time.time()
+        api_client.execute_api_step(PLAN, [], "key", prefetch=False)
+        fixed_sleep_time = time.time() - start
+
+    start = time.time()
+    api_client.execute_api_step(PLAN, [], "key", prefetch=True)
+    paced_time = time.time() - start
+
+    print(f"Fixed sleep: {fixed_sleep_time:.2f}s, limiter-paced with prefetch: {paced_time:.2f}s")
+    assert paced_time < fixed_sleep_time - 0.5
+
+
+def test_stop_when_abandons_pagination(paged_api):
+    """EVIDENCE: predicate stops after the first page with no relevant results"""
+    seen_pages = []
+
+    def stop_when(page_items, all_results):
+        seen_pages.append(len(page_items))
+        return True
+
+    result = api_client.execute_api_step({**PLAN, "max_pages": 5}, [], "key", stop_when=stop_when, prefetch=False)
+    assert _tweet_ids(result) == ["1-0", "1-1"]
+    assert seen_pages == [2]
+    assert paged_api.requested_cursors == ["p1"]
+
+
+def test_failing_stop_predicate_is_ignored(paged_api):
+    def broken(page_items, all_results):
+        raise ValueError("boom")
+
+    result = api_client.execute_api_step(PLAN, [], "key", stop_when=broken)
+    assert len(_tweet_ids(result)) == 6
+
+
+def test_in_flight_prefetch_is_cached_after_early_stop(paged_api, tmp_path):
+    """EVIDENCE: the billed page 2 prefetch abandoned by stop_when is served from cache next time"""
+    cache = ResponseCache(str(tmp_path / "api.sqlite"))
+
+    def stop_when(page_items, all_results):
+        time.sleep(PAGE_DELAY_SECONDS / 2)  # Page 2 request is on the wire by now
+        return True
+
+    with patch.object(api_client.config, 'API_CACHE_ENABLED', True), patch.object(response_cache, '_api_cache', cache):
+        api_client.execute_api_step({**PLAN, "max_pages": 5}, [], "key", stop_when=stop_when, prefetch=True)
+        page_two = api_client._page_cache_key(PLAN["endpoint"], {**PLAN["params"], "cursor": "p2"})
+        deadline = time.time() + 2
+        while not cache.contains(page_two) and time.time() < deadline:
+            time.sleep(0.02)
+        assert cache.contains(page_two)
+
+        result = api_client.execute_api_step({**PLAN, "max_pages": 2}, [], "key", prefetch=False)
+
+    assert _tweet_ids(result) == ["1-0", "1-1", "2-0", "2-1"]
+    assert paged_api.requested_cursors == ["p1", "p2"]
+    cache.close()
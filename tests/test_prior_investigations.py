@@ -0,0 +1,157 @@
+# test_prior_investigations.py
+"""
+Test Suite for Seeding Investigations from Prior Graphs
+
+Builds a past investigation in a temporary store and verifies that a new
+investigation of a similar question imports its knowledge, learns its
+failed searches, skips repeated searches and skips LLM evaluation of
+findings that were already accepted.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from finding_evaluator_llm import LLMFindingEvaluator
+from investigation_graph import InvestigationGraph
+from investigation_store import InvestigationStore
+
+PRIOR_TWEET = "Court filing names three passengers on the 2019 flight"
+
+
+def _prior_graph():
+    graph = InvestigationGraph()
+    root = graph.create_analytic_question_node("Who was on the Epstein flight logs?")
+    found = graph.create_search_query_node("search.php", {"query": "epstein flight logs", "search_type": "Latest"})
+    empty = graph.create_search_query_node("search.php", {"query": "lolita express manifest", "search_type": "Latest"})
+    graph.create_edge(root, found, "MOTIVATES")
+    graph.create_edge(root, empty, "MOTIVATES")
+    supporting = graph.create_data_point_node(PRIOR_TWEET, {"source": "search.php"})
+    loose = graph.create_data_point_node("Thread recapping the unsealed documents", {"source": "search.php"})
+    graph.create_edge(found, supporting, "GENERATES")
+    graph.create_edge(found, loose, "DISCOVERED")
+    insight = graph.create_insight_node("Filings corroborate the passenger list", "pattern")
+    graph.create_edge(supporting, insight, "SUPPORTS")
+    return graph
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = InvestigationStore(str(tmp_path / "store.sqlite"))
+    store.ingest_graph(_prior_graph(), "prior-1")
+    unrelated = InvestigationGraph()
+    unrelated.create_analytic_question_node("What is Elon Musk saying about Twitter?")
+    store.ingest_graph(unrelated, "other")
+    yield store
+    store.close()
+
+
+def test_similar_investigations_and_prior_knowledge(store):
+    similar = store.find_similar_investigations("Who appears in the Epstein flight logs?")
+    assert [s['investigation_id'] for s in similar] == ["prior-1"]
+    assert store.find_similar_investigations("Epstein flight logs", exclude_ids=["prior-1"]) == []
+
+    knowledge = store.get_prior_knowledge("prior-1", max_datapoints=1)
+    assert [dp['content'] for dp in knowledge['datapoints']] == [PRIOR_TWEET]  # Supporting DataPoints first
+    assert len(knowledge['supports']) == 1
+    counts = {s['properties']['parameters']['query']: s['datapoint_count'] for s in knowledge['searches']}
+    assert counts == {"epstein flight logs": 2, "lolita express manifest": 0}
+
+
+def test_import_marks_links_and_feeds_failed_patterns(store):
+    graph = InvestigationGraph()
+    graph.create_analytic_question_node("Who appears in the Epstein flight logs?")
+    imported = graph.import_prior_knowledge(store.get_prior_knowledge("prior-1"))
+
+    assert imported == {"insights": 1, "datapoints": 2, "searches": 2}
+    prior_nodes = [n for n in graph.nodes.values() if n.properties.get("prior")]
+    assert len(prior_nodes) == 5
+    assert all(n.properties["prior_investigation"] == "prior-1" for n in prior_nodes)
+    assert len(graph.get_disconnected_threads()) == 1  # Everything hangs off the new analytic question
+    assert any("lolita express manifest" in p and "prior investigation" in p for p in graph.get_failed_patterns())
+    assert graph.is_prior_search("search.php", {"search_type": "Latest", "query": "epstein flight logs"})
+    assert not graph.is_prior_search("search.php", {"query": "new angle"})
+
+    # Importing the same investigation again does not duplicate DataPoints or searches
+    again = graph.import_prior_knowledge(store.get_prior_knowledge("prior-1"))
+    assert again["datapoints"] == 0 and again["searches"] == 0
+
+
+def test_prior_searches_stay_out_of_current_run_indexes(store):
+    """EVIDENCE: repeating a prior search creates a fresh node for this run's DataPoints"""
+    graph = InvestigationGraph()
+    graph.create_analytic_question_node("Who appears in the Epstein flight logs?")
+    graph.import_prior_knowledge(store.get_prior_knowledge("prior-1"))
+    graph.import_prior_knowledge(store.get_prior_knowledge("prior-1"))
+    params = {"query": "epstein flight logs", "search_type": "Latest"}
+
+    assert graph.find_search_query_node("search.php", params) is None
+    assert graph.find_search_query_nodes_by_endpoint("search.php") == []
+    assert graph.get_search_query_nodes() == []
+    assert len(graph.get_search_query_nodes(include_prior=True)) == 2
+    assert sum("lolita express manifest" in p for p in graph.get_failed_patterns()) == 1
+
+    current = graph.create_search_query_node("search.php", params)
+    assert graph.find_search_query_node("search.php", params) is current
+    assert not current.properties.get("prior")
+    assert graph.find_search_query_nodes_by_query("Epstein Flight Logs") == [current]
+    assert graph.is_prior_search("search.php", params)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_prior_failures_survive_reload(store, compact):
+    """EVIDENCE: a reloaded (resumed) graph still reports prior failures and recognises prior searches"""
+    graph = InvestigationGraph(compact=compact)
+    graph.create_analytic_question_node("Who appears in the Epstein flight logs?")
+    graph.import_prior_knowledge(store.get_prior_knowledge("prior-1"))
+    prior_failures = [p for p in graph.get_failed_patterns() if "prior investigation" in p]
+    assert prior_failures
+
+    reloaded = InvestigationGraph(compact=compact)
+    reloaded.from_json(graph.to_json())
+
+    assert [p for p in reloaded.get_failed_patterns() if "prior investigation" in p] == prior_failures
+    assert reloaded.is_prior_search("search.php", {"query": "epstein flight logs", "search_type": "Latest"})
+    assert reloaded.import_prior_knowledge(store.get_prior_knowledge("prior-1"))["datapoints"] == 0
+
+
+def test_known_findings_skip_llm_evaluation():
+    """EVIDENCE: previously accepted tweets are not sent to the LLM again"""
+    llm = MagicMock()
+    llm.completion.return_value = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(
+        content='[{"is_significant": false, "relevance_score": 0.1, "reasoning": "noise"}]'))])
+    evaluator = LLMFindingEvaluator(llm_client=llm, model_manager=MagicMock())
+    evaluator.add_known_findings([(PRIOR_TWEET, 0.9)])
+
+    assert evaluator.evaluate_batch([{"text": "  court filing NAMES three passengers on the 2019 flight "}], "goal")[0].is_significant
+    llm.completion.assert_not_called()
+
+    assessments = evaluator.evaluate_batch([{"text": "new tweet"}, {"text": PRIOR_TWEET}], "goal")
+    assert [a.is_significant for a in assessments] == [False, True]
+    prompt = llm.completion.call_args.kwargs['messages'][-1]['content']
+    assert "new tweet" in prompt and PRIOR_TWEET not in prompt
+
+
+def test_engine_seeds_graph_and_skips_prior_searches(store):
+    from investigation_engine import InvestigationEngine, InvestigationSession, InvestigationConfig
+
+    engine = object.__new__(InvestigationEngine)
+    engine.graph_mode = True
+    engine.progress_container = None
+    engine.llm_coordinator = SimpleNamespace(graph=InvestigationGraph())
+    engine.llm_coordinator.graph.create_analytic_question_node("Who appears in the Epstein flight logs?")
+    engine.finding_evaluator = LLMFindingEvaluator(llm_client=MagicMock(), model_manager=MagicMock())
+    session = InvestigationSession("Who appears in the Epstein flight logs?",
+                                   InvestigationConfig(reuse_prior_investigations=True))
+
+    with patch.object(store, 'ingest_paths'), patch('investigation_engine.get_investigation_store', return_value=store):
+        engine._seed_from_prior_investigations(session)
+
+    assert session.prior_investigations == ["prior-1"]
+    assert len(engine.finding_evaluator.known_findings) == 2
+
+    planned = [{'endpoint': 'search.php', 'params': {'query': 'epstein flight logs', 'search_type': 'Latest'}},
+               {'endpoint': 'search.php', 'params': {'query': 'flight log passengers 2019'}}]
+    assert engine._skip_prior_searches(planned) == planned[1:]
+    assert engine._skip_prior_searches(planned[:1]) == planned[:1]  # Never drops a whole round
@@ -0,0 +1,148 @@
+# test_rate_limiter.py
+"""
+Test Suite for Client-Side Token Bucket Rate Limiter
+
+Uses a fake clock so pacing behaviour is checked exactly without sleeping.
+"""
+
+import asyncio
+
+import pytest
+
+from unittest.mock import patch
+
+import api_client
+from rate_limiter import QuotaExhaustedError, TokenBucketLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(clock, rate=2.0, burst=2, state_path=None):
+    return TokenBucketLimiter(rate, burst=burst, state_path=state_path, clock=clock, sleep=clock.sleep)
+
+
+def test_burst_then_paced():
+    """EVIDENCE: after the burst is spent, callers queue at 1/rate intervals"""
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+
+    waits = [limiter.reserve() for _ in range(5)]
+    assert waits == pytest.approx([0.0, 0.0, 0.5, 1.0, 1.5])
+
+
+def test_bucket_refills_over_time():
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+    limiter.acquire()
+    limiter.acquire()
+    clock.now += 1.0  # refills 2 tokens at 2/s
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == pytest.approx(0.5)
+    assert clock.slept == [pytest.approx(0.5)]
+
+
+def test_exhausted_quota_header_blocks_until_reset():
+    """EVIDENCE: X-RateLimit-Requests-Remaining=0 pauses callers until reset"""
+    clock = FakeClock()
+    limiter = make_limiter(clock, rate=10, burst=10)
+    limiter.update_from_headers({'X-RateLimit-Requests-Remaining': '0', 'X-RateLimit-Requests-Reset': '30'})
+
+    assert limiter.reserve() == pytest.approx(30.0)
+    assert limiter.get_stats()['server_blocks'] == 1
+
+
+def test_remaining_header_caps_local_tokens():
+    clock = FakeClock()
+    limiter = make_limiter(clock, rate=1, burst=10)
+    limiter.update_from_headers({'x-ratelimit-requests-remaining': '1', 'x-ratelimit-requests-reset': '60'})
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == pytest.approx(1.0)
+
+
+def test_penalize_after_429():
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+    limiter.penalize(4)
+    assert limiter.reserve() == pytest.approx(4.0)
+
+
+def test_wait_histogram():
+    clock = FakeClock()
+    limiter = make_limiter(clock, rate=1, burst=1)
+    for _ in range(3):
+        limiter.reserve()  # waits 0, 1, 2
+
+    stats = limiter.get_stats()
+    assert stats['acquired'] == 3
+    assert stats['max_wait_seconds'] == pytest.approx(2.0)
+    assert stats['wait_histogram']['<=0s'] == 1
+    assert stats['wait_histogram']['<=1s'] == 1
+    assert stats['wait_histogram']['<=2s'] == 1
+
+
+def test_shared_state_across_limiters(tmp_path):
+    """EVIDENCE: two limiters on one SQLite file share a single quota (cross-process mode)"""
+    clock = FakeClock()
+    path = str(tmp_path / "bucket.sqlite")
+    first = make_limiter(clock, state_path=path)
+    second = make_limiter(clock, state_path=path)
+
+    assert first.reserve() == 0.0
+    assert second.reserve() == 0.0
+    assert first.reserve() == pytest.approx(0.5)
+    assert second.reserve() == pytest.approx(1.0)
+
+
+def test_billing_period_reset_fails_fast_instead_of_sleeping(tmp_path):
+    """EVIDENCE: a days-long reset is not slept through, by this or any worker sharing the state"""
+    clock = FakeClock()
+    path = str(tmp_path / "bucket.sqlite")
+    limiter = TokenBucketLimiter(10, burst=10, state_path=path, clock=clock, sleep=clock.sleep, max_block_seconds=60)
+    limiter.update_from_headers({'X-RateLimit-Requests-Remaining': '0', 'X-RateLimit-Requests-Reset': str(3 * 86400)})
+
+    with pytest.raises(QuotaExhaustedError) as excinfo:
+        limiter.acquire()
+    assert excinfo.value.retry_after == pytest.approx(3 * 86400)
+    other_worker = TokenBucketLimiter(10, burst=10, state_path=path, clock=clock, sleep=clock.sleep, max_block_seconds=60)
+    with pytest.raises(QuotaExhaustedError):
+        other_worker.acquire()
+    assert clock.slept == []
+    assert limiter.get_stats()['quota_rejections'] == 1
+
+    clock.now += 3 * 86400 - 30  # Within the cap again: wait out the rest
+    assert limiter.acquire() == pytest.approx(30.0)
+
+
+def test_quota_exhausted_step_returns_error():
+    limiter = TokenBucketLimiter(10, burst=10, max_block_seconds=60)
+    limiter.penalize(3600)
+    with patch.object(api_client, 'get_rate_limiter', return_value=limiter), \
+            patch.object(api_client.config, 'RATE_LIMITER_ENABLED', True), \
+            patch.object(api_client.config, 'API_CACHE_ENABLED', False), \
+            patch.object(api_client, '_fetch_page', side_effect=AssertionError("request sent")):
+        result = api_client.execute_api_step({"endpoint": "search.php", "params": {"query": "x"}, "max_pages": 1}, [], "key")
+
+    assert result['status_code'] == 429
+    assert "quota exhausted" in result['error']
+
+
+def test_async_acquire():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(1000, burst=1, clock=clock)
+
+    async def run():
+        return [await limiter.acquire_async() for _ in range(2)]
+
+    assert asyncio.run(run()) == pytest.approx([0.0, 0.001])
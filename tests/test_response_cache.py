@@ -0,0 +1,104 @@
+# test_response_cache.py
+"""
+Test Suite for Persistent Response Cache
+
+Verifies TTL expiry, LRU eviction and hit/miss stats of ResponseCache, and
+that execute_api_step serves repeated queries from the cache instead of
+re-calling RapidAPI.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+import api_client
+import response_cache
+from response_cache import ResponseCache, make_cache_key
+
+
+def test_cache_key_ignores_param_order():
+    assert make_cache_key('search.php', {'query': 'a', 'search_type': 'Top'}) == \
+        make_cache_key('search.php', {'search_type': 'Top', 'query': 'a'})
+    assert make_cache_key('search.php', {'query': 'a'}) != make_cache_key('search.php', {'query': 'b'})
+
+
+def test_ttl_expiry(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    cache.set("k", {"timeline": [1, 2]}, ttl=0.05)
+    assert cache.get("k") == {"timeline": [1, 2]}
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    stats = cache.get_stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1
+
+
+def test_lru_eviction(tmp_path):
+    """EVIDENCE: least recently used entry is evicted first"""
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    cache.set("a", 1)
+    time.sleep(0.01)
+    cache.set("b", 2)
+    time.sleep(0.01)
+    assert cache.get("a") == 1  # a is now more recent than b
+    time.sleep(0.01)
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_endpoint_ttls():
+    assert api_client._page_cache_ttl('search.php', {'search_type': 'Latest'}) < \
+        api_client._page_cache_ttl('search.php', {'search_type': 'Top'})
+    assert api_client._page_cache_ttl('trends.php', {}) < api_client._page_cache_ttl('screenname.php', {})
+    assert api_client._page_cache_ttl('tweet.php', {}) >= api_client._page_cache_ttl('screenname.php', {})
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    calls = 0
+
+    def do_GET(self):
+        type(self).calls += 1
+        body = json.dumps({"timeline": [{"tweet_id": "1", "text": "cached"}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_repeat_query_served_from_cache(tmp_path):
+    """EVIDENCE: second identical search makes zero billed API calls"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CountingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cache = ResponseCache(str(tmp_path / "api.sqlite"))
+    plan = {"endpoint": "search.php", "params": {"query": "epstein", "search_type": "Top"}, "max_pages": 1}
+    try:
+        with patch.object(api_client.config, 'RAPIDAPI_BASE_URL', f"http://127.0.0.1:{server.server_address[1]}"), \
+             patch.object(api_client.config, 'API_CACHE_ENABLED', True), \
+             patch.object(response_cache, '_api_cache', cache):
+            first = api_client.execute_api_step(plan, [], "key")
+            second = api_client.execute_api_step(plan, [], "key")
+            other = api_client.execute_api_step(
+                {**plan, "params": {"query": "maxwell", "search_type": "Top"}}, [], "key"
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert first == second
+    assert 'error' not in other
+    assert _CountingHandler.calls == 2
+    stats = cache.get_stats()
+    print(f"Cache stats: {stats}")
+    assert stats['hits'] == 1 and stats['misses'] == 2
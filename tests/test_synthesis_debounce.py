@@ -0,0 +1,94 @@
+# test_synthesis_debounce.py
+"""
+Test Suite for Debounced Insight Synthesis Triggering
+
+Verifies that RealTimeInsightSynthesizer buffers new DataPoints and makes at
+most one synthesis decision per flush - by count, by elapsed time or at round
+end - and that the saved decision calls show up in LLMCallTracer.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import litellm
+import pytest
+
+import llm_client
+import realtime_insight_synthesizer
+from investigation_context import InvestigationContext
+from investigation_graph import InvestigationGraph
+from llm_client import LiteLLMClient
+from realtime_insight_synthesizer import RealTimeInsightSynthesizer
+from utils.llm_call_tracer import get_tracer
+
+
+def _decision_response(**params):
+    content = '{"should_synthesize": false, "reasoning": "not yet", "synthesis_potential": 0.2}'
+    return litellm.ModelResponse(choices=[{"message": {"role": "assistant", "content": content}}], model="stub")
+
+
+@pytest.fixture
+def synthesizer(monkeypatch, tmp_path):
+    monkeypatch.setattr(realtime_insight_synthesizer, 'SYNTHESIS_LOG_DIR', str(tmp_path))
+    monkeypatch.setattr(realtime_insight_synthesizer.twitter_config, 'LOCAL_SYNTHESIS_GROUPING', False)
+    monkeypatch.setattr(llm_client.twitter_config, 'LLM_CACHE_ENABLED', False)
+    monkeypatch.setattr(realtime_insight_synthesizer.twitter_config, 'SYNTHESIS_FLUSH_COUNT', 5)
+    monkeypatch.setattr(realtime_insight_synthesizer.twitter_config, 'SYNTHESIS_FLUSH_SECONDS', 30.0)
+    context = InvestigationContext("Who flew on Epstein's plane?", "twitter")
+    context.investigation_id = "test_synthesis_debounce"
+    model_manager = MagicMock()
+    model_manager.get_model_for_operation.return_value = "stub"
+    synthesizer = RealTimeInsightSynthesizer(LiteLLMClient(), InvestigationGraph(), context, model_manager=model_manager)
+    get_tracer().reset()
+    yield synthesizer
+    get_tracer().reset()
+
+
+def _datapoints(synthesizer, count):
+    return [synthesizer.graph.create_data_point_node(f"Flight log entry {i} lists a passenger", {}).id
+            for i in range(count)]
+
+
+def _decision_calls():
+    return get_tracer().get_call_summary()["purposes"].get("synthesis_decision", 0)
+
+
+def test_batch_makes_one_decision_instead_of_one_per_datapoint(synthesizer):
+    """EVIDENCE: 20 DataPoints cost 18 decision calls one at a time, 1 as a batch"""
+    ids = _datapoints(synthesizer, 40)
+    with patch.object(llm_client, 'completion', side_effect=_decision_response):
+        for dp_id in ids[:20]:
+            synthesizer.process_new_datapoint(dp_id)
+        per_datapoint = _decision_calls()
+        synthesizer.pending_datapoints.clear()
+
+        synthesizer.process_new_datapoints(ids[20:], flush=True)
+
+    assert per_datapoint == 18
+    assert _decision_calls() - per_datapoint == 1
+
+
+def test_debounce_by_count_and_round_end_flush(synthesizer):
+    ids = _datapoints(synthesizer, 12)
+    with patch.object(llm_client, 'completion', side_effect=_decision_response):
+        for dp_id in ids:
+            synthesizer.process_new_datapoints([dp_id])
+        assert _decision_calls() == 2  # After the 5th and 10th DataPoint
+        synthesizer.flush_datapoints()
+        synthesizer.flush_datapoints()  # Nothing new since the last decision
+
+    assert _decision_calls() == 3
+    assert synthesizer.trigger_stats == {"datapoints": 12, "decisions": 3}
+    assert get_tracer().trigger_map["datapoint_batch"] == ["realtime_insight_synthesizer"] * 3
+
+
+def test_debounce_by_elapsed_time(synthesizer, monkeypatch):
+    ids = _datapoints(synthesizer, 4)
+    now = [1000.0]
+    monkeypatch.setattr(realtime_insight_synthesizer.time, 'monotonic', lambda: now[0])
+    with patch.object(llm_client, 'completion', side_effect=_decision_response):
+        synthesizer.process_new_datapoints(ids[:3])
+        assert _decision_calls() == 0
+        now[0] += 31.0
+        synthesizer.process_new_datapoints(ids[3:])
+
+    assert _decision_calls() == 1
@@ -0,0 +1,252 @@
+# traffic_cassette.py
+"""
+Offline Record/Replay Harness for RapidAPI and LLM Traffic
+
+Record mode passes real traffic through and appends every RapidAPI page and
+LLM completion to a cassette file. Replay mode serves the recorded responses
+without touching the network, so InvestigationEngine and WaveOrchestrator can
+run end to end offline as a reproducible benchmark.
+
+Cassettes are JSON Lines (optionally gzip-compressed when the path ends in
+.gz), one interaction per line:
+
+    {"kind": "rapidapi", "key": "<sha256>", "request": {...}, "response": {...}}
+
+Replay can add latency and inject 429/5xx faults. Faults are seeded per
+request key and attempt number, so a run is reproducible even when searches
+execute concurrently.
+
+Usage:
+    with use_cassette("bench.jsonl.gz", mode="record"):
+        engine.conduct_investigation(query)
+
+    with use_cassette("bench.jsonl.gz", mode="replay", api_latency=0.3, fault_rate=0.1):
+        engine.conduct_investigation(query)
+
+Or set TWITTER_CASSETTE=<path> and TWITTER_CASSETTE_MODE=record|replay.
+"""
+
+import gzip
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from response_cache import make_cache_key
+
+logger = logging.getLogger(__name__)
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+
+class CassetteMiss(LookupError):
+    """Replay requested an interaction that was never recorded"""
+
+
+class _ReplayResponse:
+    """Minimal requests.Response stand-in for injected or missing responses"""
+
+    def __init__(self, status_code: int, text: str, url: str = 'cassette://', headers: Dict[str, str] = None):
+        self.status_code = status_code
+        self.text = text
+        self.url = url
+        self.headers = headers or {}
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class TrafficCassette:
+    """Records or replays RapidAPI pages and LLM completions"""
+
+    def __init__(self, path: str, mode: str = REPLAY, api_latency: float = 0.0, llm_latency: float = 0.0,
+                 latency_jitter: float = 0.0, fault_rate: float = 0.0,
+                 fault_status_codes: Tuple[int, ...] = (429, 503), seed: int = 0):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.api_latency = api_latency
+        self.llm_latency = llm_latency
+        self.latency_jitter = latency_jitter
+        self.fault_rate = fault_rate
+        self.fault_status_codes = tuple(fault_status_codes)
+        self.seed = seed
+
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._attempts: Dict[str, int] = defaultdict(int)
+        self._served: Dict[str, int] = defaultdict(int)
+        self.stats = defaultdict(int)
+        self._file = None
+
+        if mode == REPLAY:
+            self._load()
+        else:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._file = gzip.open(path, 'at', encoding='utf-8') if path.endswith('.gz') else open(path, 'a', encoding='utf-8')
+
+    # --- Keys ---
+
+    @staticmethod
+    def rapidapi_key(endpoint: str, params: Dict[str, Any]) -> str:
+        normalized_params = {str(k): v if isinstance(v, list) else str(v) for k, v in params.items()}
+        return make_cache_key('rapidapi', endpoint.strip('/'), normalized_params)
+
+    @staticmethod
+    def llm_key(completion_params: Dict[str, Any]) -> str:
+        return make_cache_key('llm', completion_params)
+
+    # --- Record ---
+
+    def _write(self, kind: str, key: str, request: Dict[str, Any], response: Any):
+        record = {'kind': kind, 'key': key, 'request': request, 'response': response}
+        line = json.dumps(record, separators=(',', ':'), default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            self._interactions[key].append(record)
+            self.stats[f'{kind}_recorded'] += 1
+
+    # --- Replay ---
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+        opener = gzip.open if self.path.endswith('.gz') else open
+        with opener(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    record = json.loads(line)
+                    self._interactions[record['key']].append(record)
+        logger.info(f"Loaded cassette {self.path} ({sum(len(v) for v in self._interactions.values())} interactions)")
+
+    def _next_recorded(self, key: str, kind: str) -> Dict[str, Any]:
+        """Serve recorded responses for a key in order, repeating the last one once exhausted"""
+        with self._lock:
+            records = self._interactions.get(key)
+            if not records:
+                self.stats[f'{kind}_misses'] += 1
+                raise CassetteMiss(f"No recorded {kind} interaction for key {key[:12]}")
+            index = min(self._served[key], len(records) - 1)
+            self._served[key] += 1
+            self.stats[f'{kind}_replayed'] += 1
+            return records[index]
+
+    def _injected_fault(self, key: str) -> Optional[int]:
+        """Deterministically decide whether this attempt fails, and with which status code"""
+        with self._lock:
+            attempt = self._attempts[key]
+            self._attempts[key] += 1
+        if self.fault_rate <= 0 or not self.fault_status_codes:
+            return None
+        rng = random.Random(f"{self.seed}:{key}:{attempt}")
+        if rng.random() < self.fault_rate:
+            return rng.choice(self.fault_status_codes)
+        return None
+
+    def _sleep_latency(self, base: float, key: str):
+        if base <= 0 and self.latency_jitter <= 0:
+            return
+        jitter = random.Random(f"{self.seed}:latency:{key}").uniform(0, self.latency_jitter) if self.latency_jitter else 0.0
+        time.sleep(base + jitter)
+
+    # --- RapidAPI hook ---
+
+    def fetch_rapidapi_page(self, endpoint: str, params: Dict[str, Any], live_fetch: Callable[[], Any]) -> Any:
+        """Return page JSON for (endpoint, params), recording or replaying as configured"""
+        key = self.rapidapi_key(endpoint, params)
+        if self.mode == RECORD:
+            page_data = live_fetch()
+            self._write('rapidapi', key, {'endpoint': endpoint, 'params': params}, page_data)
+            return page_data
+
+        self._sleep_latency(self.api_latency, key)
+        status = self._injected_fault(key)
+        if status is not None:
+            with self._lock:
+                self.stats['rapidapi_faults'] += 1
+            fake = _ReplayResponse(status, f'{{"message": "injected fault {status}"}}', headers={'Retry-After': '1'})
+            raise requests.exceptions.HTTPError(f"{status} Injected fault for {endpoint}", response=fake)
+        try:
+            return self._next_recorded(key, 'rapidapi')['response']
+        except CassetteMiss as e:
+            fake = _ReplayResponse(404, json.dumps({'message': str(e)}))
+            raise requests.exceptions.HTTPError(f"404 {e}", response=fake) from e
+
+    # --- LLM hook ---
+
+    def llm_completion(self, completion_params: Dict[str, Any], live_completion: Callable[[], Any]) -> Any:
+        """Return a litellm response for completion_params, recording or replaying as configured"""
+        key = self.llm_key(completion_params)
+        if self.mode == RECORD:
+            response = live_completion()
+            payload = response.model_dump() if hasattr(response, 'model_dump') else dict(response)
+            self._write('llm', key, {'model': completion_params.get('model')}, payload)
+            return response
+
+        self._sleep_latency(self.llm_latency, key)
+        status = self._injected_fault(key)
+        if status is not None:
+            with self._lock:
+                self.stats['llm_faults'] += 1
+            message = 'rate limit exceeded' if status == 429 else 'service unavailable'
+            raise RuntimeError(f"{status} {message} (injected fault)")
+
+        import litellm
+        return litellm.ModelResponse(**self._next_recorded(key, 'llm')['response'])
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'mode': self.mode, 'path': self.path, **self.stats}
+
+    def close(self):
+        if self._file is not None:
+            with self._lock:
+                self._file.close()
+                self._file = None
+
+
+# Active cassette (None = live traffic)
+_active_cassette: Optional[TrafficCassette] = None
+_env_checked = False
+
+
+def get_active_cassette() -> Optional[TrafficCassette]:
+    """Get the cassette in effect, activating one from TWITTER_CASSETTE on first use"""
+    global _active_cassette, _env_checked
+    if _active_cassette is None and not _env_checked:
+        _env_checked = True
+        path = os.environ.get('TWITTER_CASSETTE')
+        if path:
+            _active_cassette = TrafficCassette(path, mode=os.environ.get('TWITTER_CASSETTE_MODE', REPLAY))
+    return _active_cassette
+
+
+def set_active_cassette(cassette: Optional[TrafficCassette]):
+    global _active_cassette, _env_checked
+    _env_checked = True
+    _active_cassette = cassette
+
+
+@contextmanager
+def use_cassette(path: str, mode: str = REPLAY, **options):
+    """Route RapidAPI and LLM traffic through a cassette for the duration of the block"""
+    previous = _active_cassette
+    cassette = TrafficCassette(path, mode=mode, **options)
+    set_active_cassette(cassette)
+    try:
+        yield cassette
+    finally:
+        cassette.close()
+        set_active_cassette(previous)
@@ -15,4 +15,124 @@ DEFAULT_MAX_PAGES_FALLBACK = 3
 API_TIMEOUT_SECONDS = 30  # Increased from 7s - logs show requests take 10-13s regularly
 
 # REMOVED: All prompt loading functions and business logic imports
-# Prompts are now handled by prompt_manager.py
\ No newline at end of file
+# Prompts are now handled by prompt_manager.py
+
+# --- HTTP Connection Pooling ---
+HTTP_POOL_CONNECTIONS = 4   # Number of per-host pools kept alive
+HTTP_POOL_MAXSIZE = 16      # Max keep-alive connections per host (>= concurrent searches)
+HTTP_ENABLE_HTTP2 = True    # Use HTTP/2 when httpx[http2] is installed
+
+# --- API Response Cache ---
+API_CACHE_ENABLED = os.environ.get('TWITTER_API_CACHE', '1').lower() not in ('0', 'false', 'no')
+API_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'api_responses.sqlite')
+API_CACHE_MAX_ENTRIES = 5000
+API_CACHE_DEFAULT_TTL_SECONDS = 3600
+API_CACHE_TTL_SECONDS = {
+    'trends.php': 300,             # Trends change minute to minute
+    'search.php:Latest': 300,      # Latest search results go stale fast
+    'search.php': 3600,            # Top/People/Media results are stable for a while
+    'timeline.php': 900,
+    'screenname.php': 86400,       # Profiles rarely change
+    'tweet.php': 7 * 86400,        # Tweets are immutable apart from counts
+    'tweet_thread.php': 86400,
+}
+
+# --- RapidAPI Rate Limiting ---
+RATE_LIMITER_ENABLED = True
+RAPIDAPI_RATE_LIMIT_PER_SECOND = 5   # Sustained request rate across all callers in this process
+RAPIDAPI_RATE_LIMIT_BURST = 10       # Requests allowed back-to-back before pacing kicks in
+# Longest pause for a server-advertised reset; a later reset (e.g. the end of the billing
+# period) fails requests with QuotaExhaustedError instead of sleeping until then
+RATE_LIMITER_MAX_BLOCK_SECONDS = 120
+# Set to a file path to share one quota between processes on this machine
+RAPIDAPI_RATE_LIMIT_STATE_PATH = os.environ.get('TWITTER_RATE_LIMIT_STATE') or None
+
+# --- Pagination ---
+API_PREFETCH_NEXT_PAGE = True   # Request page N+1 as soon as page N's cursor is parsed
+
+# --- LLM Concurrency ---
+LLM_DEFAULT_MAX_CONCURRENCY = 4   # Calls in flight per completion_many() batch
+LLM_MAX_CONCURRENCY_PER_PROVIDER = {  # Process-wide caps on in-flight calls
+    'openai': 8,
+    'gemini': 8,
+    'anthropic': 4,
+    'default': 4,
+}
+
+# --- Finding Evaluation ---
+# evaluate_batch splits results into chunks sized by estimated prompt tokens
+FINDING_EVAL_PREVIEW_CHARS = 200        # Characters of each result shown to the evaluator
+FINDING_EVAL_CHARS_PER_TOKEN = 4        # Rough estimate used for chunk sizing
+FINDING_EVAL_CHUNK_TOKENS = 2000        # Result tokens per call in per-search evaluation
+FINDING_EVAL_MAX_CHUNK_RESULTS = 25     # Results per call in per-search evaluation
+# Cross-attempt (whole-round) evaluation sizes chunks from the model's context window
+FINDING_EVAL_CONTEXT_FRACTION = 0.5     # Share of max_input_tokens given to result text
+FINDING_EVAL_OUTPUT_TOKENS_PER_RESULT = 40  # Answer tokens per evaluation, bounds results per call
+FINDING_EVAL_MAX_ROUND_CHUNK_RESULTS = 200
+
+# --- Finding Pre-filter ---
+# Local heuristic tier ahead of LLM evaluation (see finding_prefilter.py)
+FINDING_PREFILTER_REJECT_BELOW = 0.15    # Combined local score under this is rejected without the LLM
+FINDING_PREFILTER_ACCEPT_ABOVE = 0.8     # ...and at or above this accepted without it
+FINDING_PREFILTER_RELEVANCE_WEIGHT = 0.6  # Goal relevance vs. specificity in the combined score
+FINDING_PREFILTER_AUDIT_RATE = 0.1       # Share of local verdicts also sent to the LLM to measure agreement
+FINDING_PREFILTER_LANGUAGES = ['en']     # Tweet 'lang' values kept; others are rejected
+FINDING_PREFILTER_REJECTION_LOG_SIZE = 200  # Recent local rejections kept for audit (metrics 'recent_rejections')
+
+# --- Finding Deduplication ---
+# Repeated tweets share one evaluation verdict and one DataPoint (see finding_dedup.py)
+FINDING_DEDUP_ENABLED = True
+FINDING_DEDUP_SIMHASH_DISTANCE = 6   # Max differing SimHash bits for a near-duplicate
+FINDING_DEDUP_MIN_TOKENS = 6         # Shorter texts only dedupe on tweet id or exact text
+
+# --- Local Embeddings (insight synthesis) ---
+# DataPoint grouping and the synthesize-now decision run on local vectors; the LLM only writes insights
+LOCAL_SYNTHESIS_GROUPING = os.environ.get('TWITTER_LOCAL_SYNTHESIS', '1').lower() not in ('0', 'false', 'no')
+LOCAL_EMBEDDING_BACKEND = 'hashed'   # 'hashed', 'sentence-transformers', or 'auto' (sentence-transformers if installed)
+LOCAL_EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+LOCAL_EMBEDDING_DIM = 2048           # Hashed TF-IDF buckets
+SYNTHESIS_GROUP_SIMILARITY = None    # Cosine that links two DataPoints into a group (None = backend default)
+SYNTHESIS_MIN_COHESION = None        # Mean pairwise cosine a group needs to be synthesized (None = backend default)
+SYNTHESIS_MAX_PENDING = 8            # Synthesize regardless of cohesion once this many DataPoints wait
+
+# --- Synthesis Triggering ---
+# New DataPoints are buffered and the synthesize-now decision runs once per flush, not per DataPoint
+SYNTHESIS_FLUSH_COUNT = 5            # Decide once this many DataPoints arrived since the last decision
+SYNTHESIS_FLUSH_SECONDS = 30.0       # ...or once the oldest undecided DataPoint has waited this long
+
+# --- LLM Response Cache ---
+LLM_CACHE_ENABLED = os.environ.get('TWITTER_LLM_CACHE', '1').lower() not in ('0', 'false', 'no')
+LLM_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'llm_responses.sqlite')
+LLM_CACHE_MAX_ENTRIES = 2000
+LLM_CACHE_TTL_SECONDS = 86400   # Same prompt + schema + model returns the stored answer for a day
+
+# --- LLM Call Logging ---
+# Per-call lines log at INFO, retries and failures at WARNING
+LLM_CALL_LOG_LEVEL = os.environ.get('TWITTER_LLM_LOG_LEVEL', 'WARNING').upper()
+
+# --- Investigation Graph Storage ---
+# Slotted nodes/edges with short index ids; cuts per-node memory for large graphs
+GRAPH_COMPACT_STORAGE = os.environ.get('TWITTER_GRAPH_COMPACT', '0').lower() in ('1', 'true', 'yes')
+# Session graph export: the JSON document is always written; 'jsonl', 'jsonl.gz' or 'jsonl.zst' add a streamed copy
+GRAPH_EXPORT_FORMAT = os.environ.get('TWITTER_GRAPH_EXPORT_FORMAT', 'json')
+# Append-only write-ahead log of graph mutations per session, for crash recovery (see graph_wal.py)
+GRAPH_WAL_ENABLED = os.environ.get('TWITTER_GRAPH_WAL', '0').lower() in ('1', 'true', 'yes')
+GRAPH_WAL_DIR = os.environ.get('TWITTER_GRAPH_WAL_DIR',
+                               os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'graph_wal'))
+GRAPH_WAL_FLUSH_EVERY = 50       # Records buffered before a write
+GRAPH_WAL_COMPACT_EVERY = 5000   # Records between full snapshots
+
+# --- Investigation Checkpoints ---
+# Session, coordinator and graph state saved after every round (see investigation_checkpoint.py)
+CHECKPOINT_ENABLED = os.environ.get('TWITTER_CHECKPOINTS', '1').lower() not in ('0', 'false', 'no')
+CHECKPOINT_DIR = os.environ.get('TWITTER_CHECKPOINT_DIR',
+                                os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'checkpoints'))
+
+# --- Cross-Investigation Store ---
+# SQLite index over exported investigation graphs (see investigation_store.py)
+INVESTIGATION_STORE_PATH = os.environ.get('TWITTER_INVESTIGATION_STORE',
+                                          os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'investigations.sqlite'))
+# Seeding new investigations from similar past ones (InvestigationConfig.reuse_prior_investigations)
+PRIOR_INVESTIGATION_MIN_SIMILARITY = 0.5   # Jaccard overlap of analytic question terms
+PRIOR_INVESTIGATION_MAX_MATCHES = 3
+PRIOR_INVESTIGATION_MAX_DATAPOINTS = 200   # Per prior investigation
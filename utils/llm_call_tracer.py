@@ -77,6 +77,8 @@ class LLMCallTracer:
         self.lock = threading.Lock()  # Thread-safe operations
         self.session_start: datetime = datetime.now()
         self.trigger_map: Dict[str, List[str]] = defaultdict(list)  # event -> components triggered
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
         
     def start_call(self, component: str, purpose: str, data_size: int = 0, model: str = "unknown") -> int:
         """Start tracking an LLM call - returns call_id"""
@@ -143,6 +145,24 @@ class LLMCallTracer:
             self.purpose_counts[purpose] += 1
             self.sequence_counter += 1
     
+    def record_cache_lookup(self, hit: bool):
+        """Count an LLM response cache lookup"""
+        with self.lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """LLM response cache hit rate for this session"""
+        with self.lock:
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "hit_rate": self.cache_hits / lookups if lookups else 0.0
+            }
+    
     def log_trigger(self, trigger_event: str, component: str, purpose: str):
         """Log what triggers each LLM call"""
         trigger_key = f"{trigger_event}->{component}:{purpose}"
@@ -151,7 +171,7 @@ class LLMCallTracer:
     def get_call_summary(self) -> Dict[str, Any]:
         """Get summary of all calls"""
         if not self.calls:
-            return {"total_calls": 0, "components": {}, "purposes": {}}
+            return {"total_calls": 0, "components": {}, "purposes": {}, "cache": self.get_cache_stats()}
         
         total_duration = sum(call.duration_ms for call in self.calls)
         successful_calls = sum(1 for call in self.calls if call.success)
@@ -163,7 +183,8 @@ class LLMCallTracer:
             "components": dict(self.component_counts),
             "purposes": dict(self.purpose_counts),
             "session_duration_s": (datetime.now() - self.session_start).total_seconds(),
-            "calls_per_minute": len(self.calls) / max(1, (datetime.now() - self.session_start).total_seconds() / 60)
+            "calls_per_minute": len(self.calls) / max(1, (datetime.now() - self.session_start).total_seconds() / 60),
+            "cache": self.get_cache_stats()
         }
     
     def analyze_patterns(self) -> Dict[str, Any]:
@@ -344,6 +365,8 @@ class LLMCallTracer:
             self.call_stack.clear()
             self.session_start = datetime.now()
             self.trigger_map.clear()
+            self.cache_hits = 0
+            self.cache_misses = 0
 
 
 # Global tracer instance
@@ -0,0 +1,79 @@
+# stage_timer.py - Wall-clock timing of investigation pipeline stages
+from contextlib import contextmanager
+from collections import defaultdict
+from typing import Dict, Any, Optional
+import threading
+import time
+
+
+class StageTimer:
+    """
+    Accumulates wall time per named pipeline stage and LLM calls per round.
+
+    Stages are inclusive: a stage timed inside another is counted in both.
+    Safe to use from worker threads (concurrent searches, LLM fan-out).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._totals = defaultdict(float)
+            self._counts = defaultdict(int)
+            self._max = defaultdict(float)
+            self._llm_calls_per_round = defaultdict(int)
+            self._current_round = 0
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block under `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            self._totals[name] += seconds
+            self._counts[name] += 1
+            self._max[name] = max(self._max[name], seconds)
+
+    def start_round(self, round_number: int):
+        """LLM calls counted from now on are attributed to this round (0 = setup/wrap-up)"""
+        with self._lock:
+            self._current_round = round_number
+
+    def count_llm_call(self):
+        with self._lock:
+            self._llm_calls_per_round[self._current_round] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current totals as a JSON-serializable dict"""
+        with self._lock:
+            return {
+                'stages': {
+                    name: {
+                        'total_seconds': round(total, 4),
+                        'calls': self._counts[name],
+                        'max_seconds': round(self._max[name], 4)
+                    }
+                    for name, total in sorted(self._totals.items())
+                },
+                'llm_calls_per_round': {str(k): v for k, v in sorted(self._llm_calls_per_round.items())},
+                'llm_calls_total': sum(self._llm_calls_per_round.values())
+            }
+
+
+# Global timer instance
+_global_timer: Optional[StageTimer] = None
+
+
+def get_stage_timer() -> StageTimer:
+    """Get global stage timer instance"""
+    global _global_timer
+    if _global_timer is None:
+        _global_timer = StageTimer()
+    return _global_timer